@@ -4,13 +4,18 @@ Aqui o usuário encontra uma visão geral do dashboard e instruções de uso.
 """
 
 import logging
+import pandas as pd
 import os
 import streamlit as st
-from src import setup_logging
+from src.log_config import setup_logging
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Visões rasas do dataset compartilhado (EntradaDataset.visao) só são seguras
+# com copy-on-write (padrão a partir do pandas 3.0)
+pd.set_option('mode.copy_on_write', True)
+
 st.set_page_config(
     page_title="Home", 
     page_icon="🏠", 
@@ -49,6 +54,8 @@ st.markdown("""
         - Acompanhamento dos indicadores semanais de crescimento.
     - Visão Restaurantes:
         - Indicadores semanais de crescimento dos restaurantes.
+    - Diagnóstico:
+        - Tempo de resposta de cada função e seção, uso de memória e cache.
 
     ---
 
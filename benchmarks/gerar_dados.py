@@ -0,0 +1,189 @@
+"""
+Docstring para benchmarks.gerar_dados
+
+Gerador de pedidos sintéticos com o mesmo esquema e os mesmos formatos "sujos"
+do data/raw/train.csv: espaços no final dos textos, nulos como "NaN ", clima
+com prefixo "conditions " (e "conditions NaN") e tempo com prefixo "(min) ".
+
+O arquivo é escrito em blocos, então gerar 10 milhões de linhas não exige o
+dataset inteiro em memória. A mesma semente gera sempre o mesmo arquivo.
+
+Exemplo de uso:
+    python -m benchmarks.gerar_dados --linhas 1000000 --saida benchmarks/dados/pedidos_1000000.csv
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Valores das dimensões (como aparecem no CSV original, antes da limpeza)
+CIDADES = ['Metropolitian', 'Urban', 'Semi-Urban']
+TRAFEGO = ['Low', 'Medium', 'High', 'Jam']
+CLIMA = ['Sunny', 'Stormy', 'Sandstorms', 'Cloudy', 'Fog', 'Windy']
+TIPOS_PEDIDO = ['Snack', 'Meal', 'Drinks', 'Buffet']
+VEICULOS = ['motorcycle', 'scooter', 'electric_scooter', 'bicycle']
+CODIGOS_CIDADE = ['INDO', 'BANG', 'COIMB', 'CHEN', 'HYD', 'RANCHI', 'MYS', 'DEH', 'KOC', 'PUNE',
+                  'LUDH', 'KNP', 'MUM', 'KOL', 'JAP', 'SUR', 'GOA', 'AURG', 'AGR', 'VAD', 'ALH', 'BHP']
+
+# Proporção de nulos por coluna (aproximada do dataset original)
+TAXAS_NULOS = {
+    'Delivery_person_Age': 0.04,
+    'Delivery_person_Ratings': 0.04,
+    'Time_Orderd': 0.04,
+    'Weatherconditions': 0.015,
+    'Road_traffic_density': 0.015,
+    'multiple_deliveries': 0.02,
+    'Festival': 0.005,
+    'City': 0.03
+}
+
+# Linhas geradas por bloco de escrita
+LINHAS_POR_BLOCO = 500_000
+
+def _com_nulos(valores: np.ndarray, taxa: float, rng: np.random.Generator, nulo: str = 'NaN ') -> np.ndarray:
+    valores = valores.astype(object)
+    valores[rng.random(len(valores)) < taxa] = nulo
+
+    return valores
+
+def _escolher(opcoes: list, n: int, rng: np.random.Generator, sufixo: str = ' ', prefixo: str = '') -> np.ndarray:
+    opcoes = np.array([f"{prefixo}{opcao}{sufixo}" for opcao in opcoes], dtype=object)
+
+    return opcoes[rng.integers(0, len(opcoes), n)]
+
+def gerar_bloco(inicio: int, n: int, rng: np.random.Generator, datas: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Função para gerar um bloco de pedidos sintéticos no formato bruto do train.csv.
+
+    Args:
+        inicio (int): Número sequencial do primeiro pedido do bloco (usado no ID)
+        n (int): Quantidade de linhas do bloco
+        rng (np.random.Generator): Gerador de números aleatórios
+        datas (pd.DatetimeIndex): Datas possíveis dos pedidos
+
+    Returns:
+        pd.DataFrame: Bloco de pedidos com todas as colunas como no CSV original
+    """
+
+    # Entregadores: ~35 pedidos por entregador, como no dataset original
+    n_entregadores = max(1000, (inicio + n) // 35)
+    entregador = rng.integers(0, n_entregadores, n)
+    codigo_cidade = np.array(CODIGOS_CIDADE, dtype=object)[entregador % len(CODIGOS_CIDADE)]
+    id_entregador = [
+        f"{codigo}RES{(e // 7) % 20 + 1:02d}DEL{e % 3 + 1:02d} "
+        for codigo, e in zip(codigo_cidade, entregador)
+    ]
+
+    # Restaurantes perto do centro da cidade do entregador e entrega a poucos km
+    centros_lat = rng.uniform(10, 31, len(CODIGOS_CIDADE))
+    centros_lon = rng.uniform(72, 89, len(CODIGOS_CIDADE))
+    lat_rest = np.round(centros_lat[entregador % len(CODIGOS_CIDADE)] + rng.normal(0, 0.05, n), 6)
+    lon_rest = np.round(centros_lon[entregador % len(CODIGOS_CIDADE)] + rng.normal(0, 0.05, n), 6)
+
+    # No original, ~1% das coordenadas de restaurante vêm com sinal trocado
+    sinal = np.where(rng.random(n) < 0.01, -1, 1)
+
+    trafego = rng.integers(0, len(TRAFEGO), n)
+    festival = rng.random(n) < 0.02
+
+    minutos = rng.integers(10, 40, n) + trafego * 3 + festival * 10
+    hora_pedido = rng.integers(8, 24, n)
+    minuto_pedido = rng.integers(0, 4, n) * 15
+    espera = rng.choice([5, 10, 15], n)
+
+    df = pd.DataFrame({
+        'ID': [f"0x{i:04x} " for i in range(inicio, inicio + n)],
+        'Delivery_person_ID': id_entregador,
+        'Delivery_person_Age': _com_nulos(rng.integers(18, 40, n), TAXAS_NULOS['Delivery_person_Age'], rng),
+        'Delivery_person_Ratings': _com_nulos(
+            np.round(rng.uniform(2.5, 5.0, n), 1), TAXAS_NULOS['Delivery_person_Ratings'], rng
+        ),
+        'Restaurant_latitude': lat_rest * sinal,
+        'Restaurant_longitude': lon_rest * sinal,
+        'Delivery_location_latitude': np.round(lat_rest + rng.uniform(-0.13, 0.13, n), 6),
+        'Delivery_location_longitude': np.round(lon_rest + rng.uniform(-0.13, 0.13, n), 6),
+        'Order_Date': datas[rng.integers(0, len(datas), n)].strftime('%d-%m-%Y'),
+        'Time_Orderd': _com_nulos(
+            np.char.add(
+                np.char.add(np.char.zfill(hora_pedido.astype(str), 2), ':'),
+                np.char.add(np.char.zfill(minuto_pedido.astype(str), 2), ':00')
+            ),
+            TAXAS_NULOS['Time_Orderd'],
+            rng
+        ),
+        'Time_Order_picked': np.char.add(
+            np.char.add(np.char.zfill(hora_pedido.astype(str), 2), ':'),
+            np.char.add(np.char.zfill((minuto_pedido + espera).astype(str), 2), ':00')
+        ),
+        'Weatherconditions': _com_nulos(
+            _escolher(CLIMA, n, rng, sufixo='', prefixo='conditions '),
+            TAXAS_NULOS['Weatherconditions'],
+            rng,
+            nulo='conditions NaN'
+        ),
+        'Road_traffic_density': _com_nulos(
+            np.array([f"{t} " for t in TRAFEGO], dtype=object)[trafego],
+            TAXAS_NULOS['Road_traffic_density'],
+            rng
+        ),
+        'Vehicle_condition': rng.choice([0, 1, 2, 3], n, p=[0.33, 0.33, 0.33, 0.01]),
+        'Type_of_order': _escolher(TIPOS_PEDIDO, n, rng),
+        'Type_of_vehicle': _escolher(VEICULOS, n, rng),
+        'multiple_deliveries': _com_nulos(
+            rng.choice([0, 1, 2, 3], n, p=[0.31, 0.62, 0.05, 0.02]), TAXAS_NULOS['multiple_deliveries'], rng
+        ),
+        'Festival': _com_nulos(np.where(festival, 'Yes ', 'No '), TAXAS_NULOS['Festival'], rng),
+        'City': _com_nulos(_escolher(CIDADES, n, rng), TAXAS_NULOS['City'], rng),
+        'Time_taken(min)': np.char.add('(min) ', np.minimum(minutos, 54).astype(str))
+    })
+
+    return df
+
+def gerar_csv(
+    n_linhas: int,
+    saida: str,
+    semente: int = 42,
+    inicio: str = '2022-02-11',
+    fim: str = '2022-04-06') -> str:
+    """
+    Função para gerar um CSV de pedidos sintéticos com n_linhas linhas.
+
+    Args:
+        n_linhas (int): Quantidade de linhas do arquivo
+        saida (str): Caminho do CSV de saída
+        semente (int): Semente do gerador aleatório (mesma semente, mesmo arquivo)
+        inicio (str): Primeira data possível dos pedidos (AAAA-MM-DD)
+        fim (str): Última data possível dos pedidos (AAAA-MM-DD)
+
+    Returns:
+        str: Caminho do CSV gerado
+
+    Example:
+        gerar_csv(50_000, 'benchmarks/dados/pedidos_50000.csv')
+    """
+
+    rng = np.random.default_rng(semente)
+    datas = pd.date_range(inicio, fim, freq='D')
+
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+
+    with open(saida, 'w', encoding='utf-8', newline='') as arquivo:
+        for inicio_bloco in range(0, n_linhas, LINHAS_POR_BLOCO):
+            n = min(LINHAS_POR_BLOCO, n_linhas - inicio_bloco)
+            bloco = gerar_bloco(inicio_bloco, n, rng, datas)
+            bloco.to_csv(arquivo, index=False, header=inicio_bloco == 0)
+
+    return saida
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera pedidos sintéticos no formato do train.csv.")
+    parser.add_argument('--linhas', type=int, default=50_000, help="Quantidade de linhas")
+    parser.add_argument('--saida', required=True, help="Caminho do CSV de saída")
+    parser.add_argument('--semente', type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument('--inicio', default='2022-02-11', help="Primeira data dos pedidos (AAAA-MM-DD)")
+    parser.add_argument('--fim', default='2022-04-06', help="Última data dos pedidos (AAAA-MM-DD)")
+    args = parser.parse_args()
+
+    gerar_csv(args.linhas, args.saida, args.semente, args.inicio, args.fim)
+    print(f"{args.linhas} linhas gravadas em {args.saida}")
@@ -0,0 +1,321 @@
+"""
+Docstring para benchmarks.run_benchmarks
+
+Mede tempo e memória da limpeza (etapa por etapa), dos filtros e de cada
+função de src.analysis_tools para datasets sintéticos de tamanhos diferentes.
+
+O tempo é o mínimo de algumas repetições (time.perf_counter) e a memória é o
+pico de alocação medido com tracemalloc em uma passada separada, para que o
+rastreamento não distorça os tempos. O resultado é gravado em JSON em
+benchmarks/resultados/, identificado pela data e pelo commit, e dois
+resultados podem ser comparados com --comparar.
+
+O mapa é medido pela geração do HTML (mapa_entregas_html); a exibição depende
+do runtime do Streamlit.
+
+Exemplo de uso:
+    python -m benchmarks.run_benchmarks --tamanhos 50000 1000000
+    python -m benchmarks.run_benchmarks --comparar resultados/antes.json resultados/depois.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona a raiz do projeto ao sys.path para garantir que o python encontre o 'src'
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from benchmarks.gerar_dados import gerar_csv
+from src import analysis_tools as at
+from src.backends import BACKENDS, definir_backend, obter_backend
+from src.cube import construir_cubo
+from src.data_cleaning import ETAPAS_LIMPEZA, NA_FORMATS, TIPOS_CSV, converter_categorias
+from src.filter_engine import IndiceFiltros
+from src.hyperloglog import construir_esbocos
+
+BENCH_DIR = ROOT_DIR / 'benchmarks'
+DADOS_DIR = BENCH_DIR / 'dados'
+RESULTADOS_DIR = BENCH_DIR / 'resultados'
+
+TAMANHOS_PADRAO = [50_000, 1_000_000, 10_000_000]
+
+# Funções de análise medidas: nome -> (função, argumentos além do df, aceita Cubo)
+FUNCOES_ANALISE = {
+    'pedidos_por_dia': (at.pedidos_por_dia, (), True),
+    'pedidos_por_trafego': (at.pedidos_por_trafego, (), True),
+    'pedidos_cidade_trafego': (at.pedidos_cidade_trafego, (), True),
+    'pedidos_por_semana': (at.pedidos_por_semana, (), True),
+    'pedidos_por_ent_semana': (at.pedidos_por_ent_semana, (), True),
+    'entregadores_distintos': (at.entregadores_distintos, (), True),
+    'mapa_entregas_html': (at.mapa_entregas_html, (), False),
+    'avaliacao_media_desvio_padrao': (at.avaliacao_media_desvio_padrao, ('Weatherconditions',), True),
+    'top_entregadores': (at.top_entregadores, (True,), False),
+    'top_entregadores_extremos': (at.top_entregadores_extremos, (), False),
+    'festival_mean_std': (at.festival_mean_std, (['Time_taken(min)', 'Festival'], 'Yes', 'Avg_time'), True),
+    'estatisticas_por_dimensao': (at.estatisticas_por_dimensao, ('Festival', 'Time_taken(min)'), True),
+    'mean_std_tempo_cidade': (at.mean_std_tempo_cidade, (), True),
+    'mean_std_dataframe': (
+        at.mean_std_dataframe,
+        (['Time_taken(min)', 'City', 'Type_of_order'], ['City', 'Type_of_order']),
+        True
+    ),
+    'tempo_medio_ent_cidade': (at.tempo_medio_ent_cidade, (), True),
+    'distancia_media': (at.distancia_media, (), True)
+}
+
+def medir(func, repeticoes: int = 3) -> dict:
+    """
+    Função para medir o tempo (mínimo das repetições) e o pico de memória de uma chamada.
+
+    Args:
+        func (callable): Função sem argumentos a ser medida
+        repeticoes (int): Quantidade de repetições cronometradas
+
+    Returns:
+        dict: {'tempo_s', 'pico_mb'}
+    """
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        func()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'tempo_s': min(tempos), 'pico_mb': pico / 1024 ** 2}
+
+def _ler_csv(caminho: Path) -> pd.DataFrame:
+    return pd.read_csv(caminho, na_values=NA_FORMATS, dtype=TIPOS_CSV)
+
+def medir_limpeza(caminho: Path) -> tuple[dict, pd.DataFrame]:
+    """
+    Função para medir a leitura do CSV e cada etapa de ETAPAS_LIMPEZA.
+
+    As etapas alteram o DataFrame, então não podem ser repetidas sobre o mesmo
+    objeto: uma passada mede os tempos e outra, com tracemalloc ativo, o pico
+    de memória de cada etapa.
+
+    Args:
+        caminho (Path): CSV bruto
+
+    Returns:
+        tuple[dict, pd.DataFrame]: Medições por etapa e o dataset limpo
+    """
+
+    resultados = {}
+
+    inicio = time.perf_counter()
+    df = _ler_csv(caminho)
+    resultados['leitura_csv'] = {'tempo_s': time.perf_counter() - inicio}
+
+    for nome, etapa in ETAPAS_LIMPEZA:
+        inicio = time.perf_counter()
+        df = etapa(df)
+        resultados[nome] = {'tempo_s': time.perf_counter() - inicio}
+
+    tracemalloc.start()
+    try:
+        df_mem = _ler_csv(caminho)
+        resultados['leitura_csv']['pico_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+
+        for nome, etapa in ETAPAS_LIMPEZA:
+            tracemalloc.reset_peak()
+            atual = tracemalloc.get_traced_memory()[0]
+            df_mem = etapa(df_mem)
+            resultados[nome]['pico_mb'] = (tracemalloc.get_traced_memory()[1] - atual) / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+    del df_mem
+
+    return resultados, df
+
+def medir_tamanho(n_linhas: int, repeticoes: int) -> dict:
+    """
+    Função para rodar todas as medições sobre um dataset sintético de n_linhas linhas.
+
+    Args:
+        n_linhas (int): Quantidade de linhas do CSV sintético
+        repeticoes (int): Repetições cronometradas por medição
+
+    Returns:
+        dict: Medições agrupadas em 'limpeza', 'snapshot', 'estruturas', 'filtros' e 'analise'
+    """
+
+    caminho = DADOS_DIR / f"pedidos_{n_linhas}.csv"
+    if not caminho.exists():
+        print(f"Gerando {caminho}...")
+        gerar_csv(n_linhas, str(caminho))
+
+    limpeza, df = medir_limpeza(caminho)
+    resultado = {'linhas_limpas': len(df), 'limpeza': limpeza}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = os.path.join(tmp, 'snapshot.parquet')
+        resultado['snapshot'] = {
+            'escrita': medir(lambda: df.to_parquet(destino, index=False), repeticoes),
+            'leitura': medir(lambda: converter_categorias(pd.read_parquet(destino)), repeticoes),
+            # Cubo agregado pelo motor configurado direto do Parquet (o pandas usa o Dataframe)
+            'cubo_parquet': medir(lambda: construir_cubo(df, esbocos=False, parquet=destino), repeticoes)
+        }
+
+    indice = IndiceFiltros(df)
+    # Cubo com os esboços HyperLogLog: as contagens de distintos também são medidas no cubo
+    cubo = construir_cubo(df, esbocos=True)
+    resultado['estruturas'] = {
+        'indice_filtros': medir(lambda: IndiceFiltros(df), repeticoes),
+        'cubo': medir(lambda: construir_cubo(df, esbocos=False), repeticoes),
+        'esbocos_hll': medir(lambda: construir_esbocos(df), repeticoes),
+        'celulas_cubo': len(cubo.dados)
+    }
+
+    datas = (df['Order_Date'].min(), df['Order_Date'].max())
+    todos = (
+        datas,
+        list(df['Road_traffic_density'].cat.categories),
+        list(df['Weatherconditions'].cat.categories),
+        list(df['City'].cat.categories)
+    )
+    restrito = (
+        (datas[0], datas[0] + (datas[1] - datas[0]) / 2),
+        ['Low', 'Medium'],
+        ['Sunny', 'Cloudy'],
+        ['Metropolitian']
+    )
+    resultado['filtros'] = {
+        'padrao_mascara': medir(lambda: at.filtros(df, *todos), repeticoes),
+        'padrao_indice': medir(lambda: at.filtros(df, *todos, indice=indice), repeticoes),
+        'restrito_mascara': medir(lambda: at.filtros(df, *restrito), repeticoes),
+        'restrito_indice': medir(lambda: at.filtros(df, *restrito, indice=indice), repeticoes),
+        'restrito_cubo': medir(lambda: at.filtros(cubo, *restrito), repeticoes),
+        # Filtro e agregação em uma única consulta no motor configurado
+        'restrito_agregado_df': medir(
+            lambda: at.estatisticas_filtradas(df, *restrito, ['City', 'Road_traffic_density'], ['Time_taken(min)']),
+            repeticoes
+        ),
+        'restrito_agregado_cubo': medir(
+            lambda: at.estatisticas_filtradas(cubo, *restrito, ['City', 'Road_traffic_density'], ['Time_taken(min)']),
+            repeticoes
+        )
+    }
+
+    resultado['analise'] = {}
+    for nome, (func, args, aceita_cubo) in FUNCOES_ANALISE.items():
+        resultado['analise'][f"{nome}_df"] = medir(lambda: func(df, *args), repeticoes)
+        if aceita_cubo:
+            resultado['analise'][f"{nome}_cubo"] = medir(lambda: func(cubo, *args), repeticoes)
+
+    return resultado
+
+def metadados() -> dict:
+    """
+    Função para coletar commit, data e versões das bibliotecas do ambiente medido.
+
+    Returns:
+        dict: Metadados da execução
+    """
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'backend': obter_backend().nome
+    }
+
+def _achatar(resultado: dict, prefixo: str = '') -> dict:
+    achatado = {}
+    for chave, valor in resultado.items():
+        if isinstance(valor, dict) and 'tempo_s' not in valor:
+            achatado.update(_achatar(valor, f"{prefixo}{chave}/"))
+        elif isinstance(valor, dict):
+            achatado[f"{prefixo}{chave}"] = valor
+    return achatado
+
+def comparar(caminho_base: str, caminho_novo: str, limite: float = 1.2) -> bool:
+    """
+    Função para comparar dois resultados e listar as medições que ficaram mais lentas.
+
+    Args:
+        caminho_base (str): JSON de referência
+        caminho_novo (str): JSON a ser comparado
+        limite (float): Razão novo/base de tempo a partir da qual a medição é uma regressão
+
+    Returns:
+        bool: True se nenhuma medição passou do limite
+    """
+
+    with open(caminho_base, encoding='utf-8') as f:
+        base = _achatar(json.load(f)['tamanhos'])
+    with open(caminho_novo, encoding='utf-8') as f:
+        novo = _achatar(json.load(f)['tamanhos'])
+
+    regressoes = 0
+    print(f"{'medição':<60} {'base (s)':>10} {'novo (s)':>10} {'razão':>7}")
+    for chave in sorted(base.keys() & novo.keys()):
+        t_base, t_novo = base[chave]['tempo_s'], novo[chave]['tempo_s']
+        razao = t_novo / t_base if t_base > 0 else float('inf')
+        marca = ' <-- regressão' if razao > limite else ''
+        regressoes += bool(marca)
+        print(f"{chave:<60} {t_base:>10.4f} {t_novo:>10.4f} {razao:>7.2f}{marca}")
+
+    print(f"\n{regressoes} regressões acima de {limite:.2f}x.")
+
+    return regressoes == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks da limpeza e das análises do dashboard.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO, help="Linhas dos datasets sintéticos")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições cronometradas por medição")
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'NOVO'), help="Compara dois resultados JSON")
+    parser.add_argument('--limite', type=float, default=1.2, help="Razão de tempo considerada regressão")
+    parser.add_argument('--backend', choices=list(BACKENDS), help="Motor das agregações (padrão: CURRY_BACKEND ou pandas)")
+    args = parser.parse_args()
+
+    if args.comparar:
+        sys.exit(0 if comparar(*args.comparar, limite=args.limite) else 1)
+
+    if args.backend:
+        definir_backend(args.backend)
+
+    resultado = {'metadados': metadados(), 'tamanhos': {}}
+    for n_linhas in args.tamanhos:
+        print(f"Medindo {n_linhas} linhas...")
+        resultado['tamanhos'][str(n_linhas)] = medir_tamanho(n_linhas, args.repeticoes)
+
+    RESULTADOS_DIR.mkdir(parents=True, exist_ok=True)
+    carimbo = datetime.now().strftime('%Y%m%d-%H%M%S')
+    saida = RESULTADOS_DIR / f"{carimbo}-{resultado['metadados']['commit'] or 'sem-commit'}.json"
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, default=str)
+
+    print(f"Resultados gravados em {saida}")
@@ -0,0 +1,108 @@
+"""
+Docstring para benchmarks.tempo_importacao
+
+Mede o tempo de importação de cada página do dashboard, isto é, o custo que
+um processo novo do Streamlit paga antes de desenhar a primeira página.
+
+Para cada página (Home.py e pages/*.py), as importações de nível de módulo
+são extraídas do próprio arquivo (ast) e executadas em um interpretador
+novo, várias vezes. O tempo medido é o do processo inteiro (subida do
+Python + importações) e o resultado é a mediana. A linha 'interpretador'
+mede apenas a subida do Python, como referência.
+
+Exemplo de uso:
+    python -m benchmarks.tempo_importacao --repeticoes 7
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from benchmarks.run_benchmarks import RESULTADOS_DIR, metadados
+
+PAGINAS = [ROOT_DIR / 'Home.py', *sorted((ROOT_DIR / 'pages').glob('[!_]*.py'))]
+
+def importacoes_da_pagina(path: Path) -> str:
+    """
+    Função para extrair as importações de nível de módulo de uma página.
+
+    Args:
+        path (Path): Arquivo da página
+
+    Returns:
+        str: Comandos import/from ... import, um por linha
+    """
+
+    arvore = ast.parse(path.read_text(encoding='utf-8'))
+
+    return '\n'.join(
+        ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))
+    )
+
+def medir_importacao(importacoes: str, repeticoes: int = 5) -> dict:
+    """
+    Função para medir o tempo de um processo Python novo que executa um bloco de importações.
+
+    Args:
+        importacoes (str): Código com as importações
+        repeticoes (int): Quantidade de processos medidos
+
+    Returns:
+        dict: Mediana, mínimo e máximo em ms
+    """
+
+    ambiente = {**os.environ, 'PYTHONPATH': str(ROOT_DIR)}
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, '-c', importacoes], cwd=ROOT_DIR, env=ambiente, capture_output=True, check=True)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return {'mediana_ms': statistics.median(tempos), 'min_ms': min(tempos), 'max_ms': max(tempos)}
+
+def medir_paginas(repeticoes: int = 5) -> dict:
+    """
+    Função para medir o tempo de importação de todas as páginas.
+
+    Args:
+        repeticoes (int): Processos medidos por página
+
+    Returns:
+        dict: {página: {'mediana_ms', 'min_ms', 'max_ms'}}, incluindo a referência 'interpretador'
+    """
+
+    resultados = {'interpretador': medir_importacao('pass', repeticoes)}
+
+    for pagina in PAGINAS:
+        resultados[pagina.name] = medir_importacao(importacoes_da_pagina(pagina), repeticoes)
+
+    return resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo de importação das páginas do dashboard.")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Processos medidos por página")
+    args = parser.parse_args()
+
+    resultado = {'metadados': metadados(), 'importacao': medir_paginas(args.repeticoes)}
+
+    for pagina, tempos in resultado['importacao'].items():
+        print(f"{pagina:28s} {tempos['mediana_ms']:8.0f} ms  (min {tempos['min_ms']:.0f}, max {tempos['max_ms']:.0f})")
+
+    RESULTADOS_DIR.mkdir(parents=True, exist_ok=True)
+    carimbo = datetime.now().strftime('%Y%m%d-%H%M%S')
+    saida = RESULTADOS_DIR / f"importacao-{carimbo}-{resultado['metadados']['commit'] or 'sem-commit'}.json"
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, default=str)
+
+    print(f"Resultados gravados em {saida}")
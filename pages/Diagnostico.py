@@ -0,0 +1,86 @@
+"""
+Página de diagnóstico do dashboard.
+
+Descrição: Exibe a telemetria de latência (p50/p95/p99 por função e por seção
+de página), a memória ocupada pelos datasets compartilhados, o estado do cache
+de visões e o custo de serialização dos gráficos, todos acumulados desde o
+início do processo do Streamlit.
+"""
+
+# Importando Bibliotecas
+import logging
+import pandas as pd
+import streamlit as st
+import os
+import sys
+
+# Adiciona a raiz do projeto ao sys.path
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(project_root)
+
+# --- IMPORTS DO SEU PROJETO ---
+from src import telemetria
+from src.dataset_store import relatorio_armazenamento
+from src.figuras import relatorio_figuras
+from src.memo import CACHE_VISOES
+from src.log_config import setup_logging
+
+# Inicializa o logger
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Visões rasas do dataset compartilhado (EntradaDataset.visao) só são seguras
+# com copy-on-write (padrão a partir do pandas 3.0)
+pd.set_option('mode.copy_on_write', True)
+
+def main():
+    st.set_page_config(page_title="Diagnóstico - Curry Company", page_icon='🩺', layout="wide")
+    st.title("Diagnóstico")
+
+    logger.info("Usuário acessou a pagina Diagnóstico.")
+
+    st.markdown("""---""")
+
+    with st.container():
+        st.markdown("## Latência por função e seção")
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.caption(
+                f"Amostragem: {telemetria.TAXA_AMOSTRAGEM:.0%} das chamadas "
+                f"(pico de memória em {telemetria.TAXA_MEMORIA:.0%} delas). "
+                "Registros das chamadas medidas em logs/telemetria.jsonl (rotativo, 10 MB por arquivo)."
+            )
+        with col2:
+            if st.button("Zerar telemetria", width='stretch'):
+                telemetria.limpar_telemetria()
+
+        st.dataframe(telemetria.relatorio_telemetria(), width='stretch', hide_index=True)
+
+    st.markdown("""---""")
+
+    with st.container():
+        st.markdown("## Cache de visões")
+
+        estatisticas = CACHE_VISOES.estatisticas()
+        col1, col2, col3, col4 = st.columns(4, border=True)
+        col1.metric("Entradas", estatisticas['entradas'])
+        col2.metric("Memória (MB)", f"{estatisticas['mb']:.1f} / {estatisticas['limite_mb']:.0f}")
+        col3.metric("Taxa de acerto", f"{estatisticas['taxa_acerto']:.0%}")
+        col4.metric("Remoções", estatisticas['remocoes'])
+
+    st.markdown("""---""")
+
+    with st.container():
+        col1, col2 = st.columns(2, border=True)
+
+        with col1:
+            st.markdown("### Datasets em memória")
+            st.dataframe(relatorio_armazenamento(), width='stretch', hide_index=True)
+
+        with col2:
+            st.markdown("### Gráficos serializados")
+            st.dataframe(relatorio_figuras(), width='stretch', hide_index=True)
+
+if __name__ == "__main__":
+    main()
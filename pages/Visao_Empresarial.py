@@ -9,6 +9,7 @@ Descrição: Este script inicializa o aplicativo Streamlit e exibe uma mensagem
 
 # Importando Bibliotecas
 import logging
+import pandas as pd
 import streamlit as st
 import os
 import sys
@@ -20,8 +21,11 @@ sys.path.append(project_root)
 
 # --- IMPORTS DO SEU PROJETO ---
 from src.analysis_tools import filtros, pedidos_por_trafego, pedidos_por_dia, pedidos_cidade_trafego
-from src.analysis_tools import pedidos_por_semana, pedidos_por_ent_semana, mapa_entregas
-from src.data_cleaning import df_cleaning
+from src.analysis_tools import pedidos_por_semana, pedidos_por_ent_semana, mapa_entregas_html, exibir_mapa
+from src.dataset_store import caminho_dados, obter_dataset
+from src.figuras import exibir_figura
+from src.memo import MemoVisao
+from src.secoes import SecoesPreguicosas
 from src.sider import sidebar
 from src.log_config import setup_logging
 
@@ -29,10 +33,9 @@ from src.log_config import setup_logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# O decorador @st.cache_data faz o Streamlit guardar o resultado na memória.
-@st.cache_data
-def load_data(path):
-    return df_cleaning(path, df_clean=True)
+# Visões rasas do dataset compartilhado (EntradaDataset.visao) só são seguras
+# com copy-on-write (padrão a partir do pandas 3.0)
+pd.set_option('mode.copy_on_write', True)
 
 def main():
 
@@ -49,10 +52,11 @@ def main():
     ROOT_DIR = Path(__file__).parent.parent
     DATA_PATH = ROOT_DIR / 'data' / 'raw' / 'train.csv'
 
-    # Carregando dados (Agora usando a função com Cache)
-    df = load_data(str(DATA_PATH))
+    # Dataset compartilhado entre as sessões (cada sessão recebe uma visão, sem cópia);
+    # se a ingestão incremental já rodou, vem das partições ingeridas em vez do CSV
+    dados = obter_dataset(caminho_dados(str(DATA_PATH)))
 
-    if df is None:
+    if dados is None:
         st.error("Erro ao carregar os dados. Verifique os logs para mais detalhes.")
         return
 
@@ -69,53 +73,62 @@ def main():
 
     # Aplicando os filtros no dataframe
     # Nota: Filtros são rápidos, geralmente não precisam de cache, mas o resultado muda sempre.
-    df = filtros(df, date_slider, traffic_options, weather_cond, cities)
+    # Resultados memoizados por combinação de filtros, compartilhados entre as sessões
+    memo = MemoVisao(dados.versao, date_slider, traffic_options, weather_cond, cities)
+    df = memo(filtros, dados.visao(), date_slider, traffic_options, weather_cond, cities, indice=dados.indice)
 
-    # Criando abas
-    tab1, tab2, tab3 = st.tabs(['Visão Gerencial', 'Visão Tática', 'Visão Geográfica'])
+    # Métricas agregadas (contagens, médias e desvios) vêm do cubo pré-agregado
+    cubo = memo(filtros, dados.cubo, date_slider, traffic_options, weather_cond, cities)
 
-    # Conteúdo da aba Visão Gerencial
-    with tab1:
+    # Entregadores distintos: exatos no dataframe ou estimados pelos esboços do cubo (modo aproximado)
+    distintos = cubo if cubo.esbocos is not None else df
+
+    # Criando as seções: apenas a seção selecionada é calculada e enviada ao navegador
+    secoes = SecoesPreguicosas('secao_empresarial')
+
+    # Conteúdo da seção Visão Gerencial
+    @secoes.secao('Visão Gerencial')
+    def visao_gerencial():
         st.subheader("Visão Gerencial")
 
         with st.container(border=True):
             st.markdown("### Total de Pedidos por Dia")
-            fig = pedidos_por_dia(df)
-            st.plotly_chart(fig, width='stretch')
+            exibir_figura(memo.figura(pedidos_por_dia, cubo))
 
         with st.container(border=True):
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("### Pedidos por Tipo de Tráfego")
-                fig = pedidos_por_trafego(df)
-                st.plotly_chart(fig, width='stretch')
+                exibir_figura(memo.figura(pedidos_por_trafego, cubo))
 
             with col2:
                 st.markdown("### Pedidos por Cidade e Tipo de Tráfego")
-                fig = pedidos_cidade_trafego(df)
-                st.plotly_chart(fig, width='stretch')
+                exibir_figura(memo.figura(pedidos_cidade_trafego, cubo))
 
-    # Conteúdo da aba Visão Tática
-    with tab2:
+    # Conteúdo da seção Visão Tática
+    @secoes.secao('Visão Tática')
+    def visao_tatica():
         st.subheader("Visão Tática")
 
         with st.container(border=True):
             st.markdown("### Pedidos por Semana")
-            fig = pedidos_por_semana(df)
-            st.plotly_chart(fig, width='stretch')
+            exibir_figura(memo.figura(pedidos_por_semana, cubo))
 
         with st.container(border=True):
             st.markdown("### Pedidos por Entregador por Semana")
-            fig = pedidos_por_ent_semana(df)
-            st.plotly_chart(fig, width='stretch')
+            exibir_figura(memo.figura(pedidos_por_ent_semana, distintos))
 
-    # Conteúdo da aba Visão Geográfica
-    with tab3:
+    # Conteúdo da seção Visão Geográfica (a mais cara: só é calculada quando aberta)
+    @secoes.secao('Visão Geográfica')
+    def visao_geografica():
         st.subheader("Visão Geográfica")
 
         with st.container(border=True):
             st.markdown("### Mapa de Entregas")
-            mapa_entregas(df)
+            # HTML do mapa memoizado por combinação de filtros
+            exibir_mapa(memo(mapa_entregas_html, df))
+
+    secoes.renderizar()
 
 if __name__ == "__main__":
     main()
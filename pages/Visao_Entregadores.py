@@ -9,6 +9,7 @@ Descrição: Este script inicializa o aplicativo Streamlit e exibe uma mensagem
 
 # Importando Bibliotecas
 import logging
+import pandas as pd
 import streamlit as st
 import os
 import sys
@@ -19,24 +20,31 @@ project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.append(project_root)
 
 # --- IMPORTS DO SEU PROJETO ---
-from src.analysis_tools import filtros, avaliacao_media_desvio_padrao, top_entregadores
-from src.data_cleaning import df_cleaning
+from src.analysis_tools import filtros, avaliacao_media_desvio_padrao, top_entregadores_extremos
+from src.dataset_store import caminho_dados, obter_dataset
+from src.memo import MemoVisao
 from src.sider import sidebar
+from src.telemetria import medir
 from src.log_config import setup_logging
 
 # Inicializa o logger
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Visões rasas do dataset compartilhado (EntradaDataset.visao) só são seguras
+# com copy-on-write (padrão a partir do pandas 3.0)
+pd.set_option('mode.copy_on_write', True)
+
 def main():
     # Define a raiz do projeto dinamicamente
     ROOT_DIR = Path(__file__).parent.parent
     DATA_PATH = ROOT_DIR / 'data' / 'raw' / 'train.csv'
 
-    # Carregando e limpando os dados
-    df = df_cleaning(str(DATA_PATH), df_clean=True)
+    # Dataset compartilhado entre as sessões (cada sessão recebe uma visão, sem cópia);
+    # se a ingestão incremental já rodou, vem das partições ingeridas em vez do CSV
+    dados = obter_dataset(caminho_dados(str(DATA_PATH)))
 
-    if df is None:
+    if dados is None:
         st.error("Erro ao carregar os dados. Verifique os logs para mais detalhes.")
         return
 
@@ -51,11 +59,16 @@ def main():
     date_slider, traffic_options, weather_cond, cities = sidebar(image_path)
 
     # Aplicando os filtros no dataframe
-    df = filtros(df, date_slider, traffic_options, weather_cond, cities)
+    # Resultados memoizados por combinação de filtros, compartilhados entre as sessões
+    memo = MemoVisao(dados.versao, date_slider, traffic_options, weather_cond, cities)
+    df = memo(filtros, dados.visao(), date_slider, traffic_options, weather_cond, cities, indice=dados.indice)
+
+    # Métricas agregadas (contagens, médias e desvios) vêm do cubo pré-agregado
+    cubo = memo(filtros, dados.cubo, date_slider, traffic_options, weather_cond, cities)
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.entregadores.metricas_gerais'):
         st.title("Métricas Gerais", text_alignment='center')
 
         col1, col2, col3, col4 = st.columns(4, gap='large', border=True, width='stretch')
@@ -79,7 +92,7 @@ def main():
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.entregadores.avaliacoes'):
         st.title("Avaliações", text_alignment='center')
 
         col1, col2 = st.columns(2, gap='medium', border=True)
@@ -100,32 +113,31 @@ def main():
             st.markdown("### Avaliação Média por Transito", text_alignment='center')
 
             # Agrupamento por transito
-            df_avg_std_rating_by_traf = avaliacao_media_desvio_padrao(df, 'Road_traffic_density')
+            df_avg_std_rating_by_traf = memo(avaliacao_media_desvio_padrao, cubo, 'Road_traffic_density')
             st.dataframe(df_avg_std_rating_by_traf)
 
             st.markdown("### Avaliação Média por Clima", text_alignment='center')
 
             # Agrupamento por clima
-            df_avg_std_rating_by_wet = avaliacao_media_desvio_padrao(df, 'Weatherconditions')
+            df_avg_std_rating_by_wet = memo(avaliacao_media_desvio_padrao, cubo, 'Weatherconditions')
             st.dataframe(df_avg_std_rating_by_wet)
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.entregadores.velocidade_entrega'):
         st.title("Velocidade de Entrega", text_alignment='center')
         
         col1, col2 = st.columns(2, gap='medium', border=True)
 
+        # Mais rápidos e mais lentos de cada cidade em uma única passada
+        df_fastest, df_slowest = memo(top_entregadores_extremos, df)
+
         with col1:
             st.markdown("#### Top Entregadores mais Rápidos")
-            # ascending=True -> Menor tempo (Mais rápido)
-            df_fastest = top_entregadores(df, ascending_order=True)
             st.dataframe(df_fastest)
 
         with col2:
             st.markdown("#### Top Entregadores mais Lentos")
-            # ascending=False -> Maior tempo (Mais lento)
-            df_slowest = top_entregadores(df, ascending_order=False)
             st.dataframe(df_slowest)
 
     st.markdown("""---""")
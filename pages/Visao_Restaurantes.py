@@ -9,11 +9,11 @@ Descrição: Este script inicializa o aplicativo Streamlit e exibe uma mensagem
 
 # Importando Bibliotecas
 import logging
+import pandas as pd
 import streamlit as st
 import os
 import sys
 import numpy as np
-from haversine import haversine as hs
 from pathlib import Path
 from plotly import express as px
 
@@ -22,25 +22,34 @@ project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.append(project_root)
 
 # Importando módulos do projeto
-from src.analysis_tools import filtros, festival_mean_std, mean_std_tempo_cidade
-from src.analysis_tools import mean_std_dataframe, tempo_medio_ent_cidade
-from src.data_cleaning import df_cleaning
+from src.analysis_tools import filtros, estatisticas_por_dimensao, mean_std_tempo_cidade
+from src.analysis_tools import mean_std_dataframe, tempo_medio_ent_cidade, distancia_media
+from src.analysis_tools import entregadores_distintos
+from src.dataset_store import caminho_dados, obter_dataset
+from src.figuras import exibir_figura
+from src.memo import MemoVisao
 from src.sider import sidebar
+from src.telemetria import medir
 from src.log_config import setup_logging
 
 # Inicializa o logger
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Visões rasas do dataset compartilhado (EntradaDataset.visao) só são seguras
+# com copy-on-write (padrão a partir do pandas 3.0)
+pd.set_option('mode.copy_on_write', True)
+
 def main():
     # Define a raiz do projeto dinamicamente
     ROOT_DIR = Path(__file__).parent.parent
     DATA_PATH = ROOT_DIR / 'data' / 'raw' / 'train.csv'
 
-    # Carregando e limpando os dados
-    df = df_cleaning(str(DATA_PATH), df_clean=True)
+    # Dataset compartilhado entre as sessões (cada sessão recebe uma visão, sem cópia);
+    # se a ingestão incremental já rodou, vem das partições ingeridas em vez do CSV
+    dados = obter_dataset(caminho_dados(str(DATA_PATH)))
 
-    if df is None:
+    if dados is None:
         st.error("Erro ao carregar os dados. Verifique os logs para mais detalhes.")
         return
 
@@ -55,60 +64,50 @@ def main():
     date_slider, traffic_options, weather_cond, cities = sidebar(image_path)
 
     # Aplicando os filtros no dataframe
-    df = filtros(df, date_slider, traffic_options, weather_cond, cities)
+    # Resultados memoizados por combinação de filtros, compartilhados entre as sessões
+    memo = MemoVisao(dados.versao, date_slider, traffic_options, weather_cond, cities)
+    df = memo(filtros, dados.visao(), date_slider, traffic_options, weather_cond, cities, indice=dados.indice)
+
+    # Métricas agregadas (contagens, médias e desvios) vêm do cubo pré-agregado
+    cubo = memo(filtros, dados.cubo, date_slider, traffic_options, weather_cond, cities)
+
+    # Entregadores distintos: exatos no dataframe ou estimados pelos esboços do cubo (modo aproximado)
+    distintos = cubo if cubo.esbocos is not None else df
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.restaurantes.metricas_gerais'):
         st.markdown("## Métricas Gerais", text_alignment='center')
 
         col1, col2, col3, col4, col5, col6 = st.columns(6, border=True)
 
         with col1:
-            ent_unicos = df.loc[:, 'Delivery_person_ID'].nunique()
+            ent_unicos = memo(entregadores_distintos, distintos)
             col1.metric("#### Entregadores \nÚnicos", ent_unicos)
 
         with col2:
-            cols = [
-                'Delivery_location_latitude', 
-                'Delivery_location_longitude',
-                'Restaurant_latitude', 
-                'Restaurant_longitude'
-            ]
-
-            # Realizando o cálculo da distância entre restaurante e local de entrega com apply
-            df['Distance'] = df.loc[:, cols].apply(
-                lambda x: hs((x[cols[0]], x[cols[1]]), 
-                (x[cols[2]], x[cols[3]])), 
-                axis=1
-            )
-            media_dist = df.loc[:, 'Distance'].mean()
+            # A coluna 'Distance' já vem calculada de df_cleaning
+            media_dist = memo(distancia_media, cubo)
             col2.metric("#### Distância \nMédia (km)", f"{media_dist:.2f}")
 
-        with col3:
+        # Todas as estatísticas do festival em uma única agregação
+        festival = memo(estatisticas_por_dimensao, cubo, 'Festival', 'Time_taken(min)').reindex(['Yes', 'No'])
 
-            cols = ['Time_taken(min)', 'Festival']
-            avg_festival = festival_mean_std(df, cols, 'Yes', 'Avg_time')
-            st.metric("#### Tempo Médio \nFestival (min)", f"{avg_festival.values[0]:.1f}")
+        with col3:
+            st.metric("#### Tempo Médio \nFestival (min)", f"{festival.loc['Yes', 'Media']:.1f}")
 
         with col4:
-
-            std_festival = festival_mean_std(df, cols, 'Yes', 'Std_time')
-            st.metric("#### Desvio Padrão \nFestival (min)", f"{std_festival.values[0]:.1f}")
+            st.metric("#### Desvio Padrão \nFestival (min)", f"{festival.loc['Yes', 'Desvio']:.1f}")
 
         with col5:
-
-            avg_no_festival = festival_mean_std(df, cols, 'No', 'Avg_time')
-            st.metric("#### Tempo Médio \nFestival (min)", f"{avg_no_festival.values[0]:.1f}")
+            st.metric("#### Tempo Médio \nFestival (min)", f"{festival.loc['No', 'Media']:.1f}")
 
         with col6:
-
-            std_no_festival = festival_mean_std(df, cols, 'No', 'Std_time')
-            st.metric("#### Desvio Padrão \nFestival (min)", f"{std_no_festival.values[0]:.1f}")
+            st.metric("#### Desvio Padrão \nFestival (min)", f"{festival.loc['No', 'Desvio']:.1f}")
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.restaurantes.entregas_no_tempo'):
         st.markdown("## Entregas no tempo", text_alignment='center')
 
         col1, col2 = st.columns(2, border=True)
@@ -117,14 +116,14 @@ def main():
 
             st.markdown("### Média e desvio padrão do tempo por cidade", text_alignment='center')
 
-            fig = mean_std_tempo_cidade(df)
-            col1.plotly_chart(fig, width='stretch')
+            exibir_figura(memo.figura(mean_std_tempo_cidade, cubo))
 
         with col2:
             st.markdown("### Distribuição de distância", text_alignment='center')
 
-            df_aux = mean_std_dataframe(
-                df, 
+            df_aux = memo(
+                mean_std_dataframe,
+                cubo, 
                 cols=['Time_taken(min)', 'City', 'Type_of_order'], 
                 cols_groupby=['City', 'Type_of_order']
             )
@@ -132,7 +131,7 @@ def main():
 
     st.markdown("""---""")
 
-    with st.container():
+    with st.container(), medir('secao.restaurantes.distribuicao_no_tempo'):
         st.markdown("## Distribuição no tempo", text_alignment='center')
 
         col1, col2 = st.columns(2, border=True)
@@ -140,8 +139,7 @@ def main():
         with col1:
             st.markdown("### Tempo médio de entrega por cidade", text_alignment='center')
 
-            fig = tempo_medio_ent_cidade(df)
-            st.plotly_chart(fig, width='stretch')
+            exibir_figura(memo.figura(tempo_medio_ent_cidade, cubo))
 
         with col2:
             st.markdown(
@@ -149,8 +147,9 @@ def main():
                 text_alignment='center'
             )
 
-            df_aux = mean_std_dataframe(
-                df, 
+            df_aux = memo(
+                mean_std_dataframe,
+                cubo, 
                 cols=['Time_taken(min)', 'City', 'Road_traffic_density'], 
                 cols_groupby=['City', 'Road_traffic_density']
             )
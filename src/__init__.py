@@ -1,39 +1,99 @@
 """
 Docstring para src
+
+As funções e classes do pacote são carregadas sob demanda: `from src import
+filtros` importa apenas src.analysis_tools (e suas dependências) no primeiro
+acesso. Assim, quem usa só setup_logging não paga a importação do pandas,
+do plotly e do folium.
 """
 
-from src.analysis_tools import filtros
-from src.analysis_tools import pedidos_por_trafego
-from src.analysis_tools import pedidos_por_dia
-from src.analysis_tools import pedidos_cidade_trafego
-from src.analysis_tools import pedidos_por_semana
-from src.analysis_tools import pedidos_por_ent_semana
-from src.analysis_tools import mapa_entregas
-from src.analysis_tools import avaliacao_media_desvio_padrao
-from src.analysis_tools import top_entregadores
-from src.analysis_tools import festival_mean_std
-from src.analysis_tools import mean_std_tempo_cidade
-from src.analysis_tools import mean_std_dataframe
-from src.analysis_tools import tempo_medio_ent_cidade
-from src.data_cleaning import df_cleaning
-from src.log_config import setup_logging
-from src.sider import sidebar
-
-__all__ = [
-    "df_cleaning",
-    "filtros",
-    "setup_logging",
-    "sidebar",
-    "pedidos_por_trafego",
-    "pedidos_por_dia",
-    "pedidos_cidade_trafego",
-    "pedidos_por_semana",
-    "pedidos_por_ent_semana",
-    "mapa_entregas",
-    "avaliacao_media_desvio_padrao",
-    "top_entregadores",
-    "festival_mean_std",
-    "mean_std_tempo_cidade",
-    "mean_std_dataframe", 
-    "tempo_medio_ent_cidade"
-]
+import importlib
+
+# Nome exportado -> módulo que o define
+_EXPORTACOES = {
+    'avaliacao_media_desvio_padrao': 'src.analysis_tools',
+    'distancia_media': 'src.analysis_tools',
+    'entregadores_distintos': 'src.analysis_tools',
+    'estatisticas_filtradas': 'src.analysis_tools',
+    'estatisticas_por_dimensao': 'src.analysis_tools',
+    'exibir_mapa': 'src.analysis_tools',
+    'festival_mean_std': 'src.analysis_tools',
+    'filtros': 'src.analysis_tools',
+    'mapa_entregas': 'src.analysis_tools',
+    'mapa_entregas_html': 'src.analysis_tools',
+    'mean_std_dataframe': 'src.analysis_tools',
+    'mean_std_tempo_cidade': 'src.analysis_tools',
+    'pedidos_cidade_trafego': 'src.analysis_tools',
+    'pedidos_por_dia': 'src.analysis_tools',
+    'pedidos_por_ent_semana': 'src.analysis_tools',
+    'pedidos_por_semana': 'src.analysis_tools',
+    'pedidos_por_trafego': 'src.analysis_tools',
+    'tempo_medio_ent_cidade': 'src.analysis_tools',
+    'top_entregadores': 'src.analysis_tools',
+    'top_entregadores_extremos': 'src.analysis_tools',
+    'top_n_por_grupo': 'src.analysis_tools',
+    'definir_backend': 'src.backends',
+    'obter_backend': 'src.backends',
+    'construir_cubo': 'src.cube',
+    'Cubo': 'src.cube',
+    'obter_cubo': 'src.cube',
+    'df_cleaning': 'src.data_cleaning',
+    'limpar_dataframe': 'src.data_cleaning',
+    'reduzir_tipos': 'src.data_cleaning',
+    'relatorio_memoria': 'src.data_cleaning',
+    'EntradaDataset': 'src.dataset_store',
+    'invalidar': 'src.dataset_store',
+    'obter_dataset': 'src.dataset_store',
+    'relatorio_armazenamento': 'src.dataset_store',
+    'exibir_figura': 'src.figuras',
+    'figura_serializada': 'src.figuras',
+    'relatorio_figuras': 'src.figuras',
+    'IndiceFiltros': 'src.filter_engine',
+    'obter_indice': 'src.filter_engine',
+    'agregar_grade': 'src.geo',
+    'distancia_entrega': 'src.geo',
+    'haversine_vetorizado': 'src.geo',
+    'EsbocosHLL': 'src.hyperloglog',
+    'construir_esbocos': 'src.hyperloglog',
+    'distintos_por': 'src.hyperloglog',
+    'carregar_cubo_incremental': 'src.ingestao',
+    'carregar_dataset_incremental': 'src.ingestao',
+    'ingerir_em_blocos': 'src.ingestao',
+    'ingerir_incremental': 'src.ingestao',
+    'ingerir_paralelo': 'src.ingestao',
+    'ler_parquet_limpo': 'src.ingestao',
+    'setup_logging': 'src.log_config',
+    'CacheLRU': 'src.memo',
+    'chave_filtros': 'src.memo',
+    'MemoVisao': 'src.memo',
+    'registrar_quadro': 'src.memo',
+    'Preset': 'src.relatorios',
+    'gerar_relatorios': 'src.relatorios',
+    'presets_padrao': 'src.relatorios',
+    'SecoesPreguicosas': 'src.secoes',
+    'escolher_resolucao': 'src.series_temporais',
+    'lttb': 'src.series_temporais',
+    'sidebar': 'src.sider',
+    'IndiceEspacial': 'src.spatial_index',
+    'instrumentar': 'src.telemetria',
+    'medir': 'src.telemetria',
+    'relatorio_telemetria': 'src.telemetria',
+}
+
+__all__ = list(_EXPORTACOES)
+
+def __getattr__(nome: str):
+    modulo = _EXPORTACOES.get(nome)
+
+    if modulo is None:
+        raise AttributeError(f"module 'src' has no attribute '{nome}'")
+
+    valor = getattr(importlib.import_module(modulo), nome)
+
+    # Guarda no namespace do pacote: os próximos acessos não passam por aqui
+    globals()[nome] = valor
+
+    return valor
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -1,58 +1,194 @@
 """
 Docstring para src.analysis_tools
+
+O folium (~0,5 s) e o plotly.express (~0,15 s) são importados dentro das
+funções que os usam: páginas que não desenham mapas nem gráficos do
+plotly.express não pagam esse custo na inicialização.
 """
 
-import folium
 import pandas as pd
-from haversine import haversine as hs
-from plotly import express as px
 import plotly.graph_objects as go
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
+
+from src.backends import obter_backend
+from src.cube import Cubo, agregar_cubo, filtrar_cubo
+from src.filter_engine import IndiceFiltros
+from src.geo import agregar_grade, coordenadas_validas
+from src.hyperloglog import EsbocosHLL, distintos_por
+from src.series_temporais import PONTOS_MAXIMOS, RESOLUCOES, escolher_resolucao, inicio_periodo, lttb, reamostrar
+from src.telemetria import instrumentar
+
+# Nomes de colunas usados nas tabelas de média e desvio padrão do tempo de entrega
+TEMPO_MEDIO_DESVIO = {'Time_taken(min)_media': 'Avg_time', 'Time_taken(min)_desvio': 'Std_time'}
+
+# Mapa de entregas: resolução inicial da grade (graus) e limites de células por camada
+RESOLUCAO_MAPA = 0.01
+LIMITE_CELULAS_MAPA = 5000
+LIMITE_POLIGONOS_MAPA = 500
+
+# Ordem das cidades nas tabelas de entregadores mais rápidos e mais lentos
+ORDEM_CIDADES = ['Metropolitian', 'Urban', 'Semi-Urban']
+
+def _estatisticas(df: pd.DataFrame | Cubo, por: list, medidas: list) -> pd.DataFrame:
+    """
+    Função auxiliar para agregar contagem de pedidos, média e desvio padrão por grupo.
+
+    Aceita tanto o Dataframe de pedidos quanto o cubo pré-agregado (src.cube),
+    devolvendo o mesmo formato nos dois casos. No Dataframe, a agregação roda
+    no motor configurado (pandas, DuckDB ou Polars; ver src.backends).
+
+    Args:
+        df (pd.DataFrame | Cubo): Dataframe de pedidos ou cubo de métricas
+        por (list): Colunas de agrupamento
+        medidas (list): Colunas numéricas para média e desvio padrão
+
+    Returns:
+        pd.DataFrame: Colunas de `por`, 'Pedidos', '<medida>_media' e '<medida>_desvio'
+    """
+
+    if isinstance(df, Cubo):
+        return agregar_cubo(df, por, medidas)
+
+    return obter_backend().estatisticas(df, por, medidas)
+
+@instrumentar
+def estatisticas_filtradas(
+    df: pd.DataFrame | Cubo,
+    date_slider: tuple,
+    traffic_options: list,
+    weather_cond: list,
+    cities: list,
+    por: list,
+    medidas: list,
+    parquet: str | None = None) -> pd.DataFrame:
+    """
+    Função para aplicar os filtros da barra lateral e agregar por grupo em uma única consulta.
+
+    No Dataframe, filtro e agregação são compilados juntos no motor configurado
+    (máscara e groupby no pandas, WHERE + GROUP BY no DuckDB, filter + group_by
+    no Polars; ver src.backends), sem materializar o Dataframe filtrado. Com
+    `parquet`, DuckDB e Polars leem o snapshot direto. No cubo, equivale a
+    filtros seguido de agregar_cubo.
+
+    Args:
+        df (pd.DataFrame | Cubo): Dataframe de pedidos ou cubo de métricas
+        date_slider (tuple): Tupla com as datas
+        traffic_options (list): Lista com condições de transito
+        weather_cond (list): Lista com condições climáticas
+        cities (list): Lista com as cidades
+        por (list): Colunas de agrupamento
+        medidas (list): Colunas numéricas para média e desvio padrão
+        parquet (str | None): Snapshot Parquet com as mesmas linhas de df (ver src.snapshot.snapshot_atual)
+
+    Returns:
+        pd.DataFrame: Colunas de `por`, 'Pedidos', '<medida>_media' e '<medida>_desvio'
 
+    Example:
+        df_aux = estatisticas_filtradas(df, date_slider, traffic, weather, cities, ['City'], ['Time_taken(min)'])
+    """
+
+    selecao = (date_slider, traffic_options, weather_cond, cities)
+
+    if isinstance(df, Cubo):
+        return agregar_cubo(filtrar_cubo(df, *selecao), por, medidas)
+
+    return obter_backend().estatisticas(df, por, medidas, selecao, parquet)
+
+def _resolucao(datas: pd.Series, resolucao: str | None, pontos_maximos: int | None, minima: str = 'D') -> str:
+    # Resolução fixada pelo chamador ou a mais fina (a partir de `minima`) que cabe em pontos_maximos
+    if resolucao is not None:
+        return resolucao
+    if pontos_maximos is None or datas.empty:
+        return minima
+
+    return escolher_resolucao(datas.min(), datas.max(), pontos_maximos, minima)
+
+def _reduzir_linha(df_aux: pd.DataFrame, x: str, y: str, pontos_maximos: int | None) -> pd.DataFrame:
+    # Reduz a série a pontos_maximos pontos com LTTB, preservando picos e vales. Com a resolução
+    # automática a série já cabe no limite; só uma resolução fixada passa dele
+    if pontos_maximos is None or len(df_aux) <= pontos_maximos:
+        return df_aux
+
+    df_aux = df_aux.sort_values(x)
+
+    return df_aux.iloc[lttb(df_aux[x].to_numpy(), df_aux[y].to_numpy(), pontos_maximos)]
+
+@instrumentar
 def filtros(
-    df: pd.Series | pd.DataFrame, 
+    df: pd.Series | pd.DataFrame | Cubo, 
     date_slider: tuple , 
     traffic_options: list, 
     weather_cond: list, 
-    cities: list) -> pd.Series | pd.DataFrame:
+    cities: list,
+    indice: IndiceFiltros | None = None) -> pd.Series | pd.DataFrame | Cubo:
     """
     Função para criação dos filtros que serão usados na barra lateral.
 
+    Os filtros são combinados em uma única máscara e o Dataframe é materializado
+    no máximo uma vez. Dimensões com todas as opções selecionadas são ignoradas;
+    se nenhum filtro restringir as linhas, o próprio Dataframe é retornado.
+    Se for recebido um Cubo (src.cube), o filtro é aplicado sobre as células do cubo.
+
     Args:
-        df (pd.Series | pd.DataFrame): Dataframe de entrada
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe de entrada ou cubo de métricas
         date_slider (tuple): Tupla com as datas
         traffic_options (list): Lista com condições de transito
         weather_cond (list): Lista com condições climáticas
         cities (list): Lista com as cidades
+        indice (IndiceFiltros | None): Índice de bitmaps pré-computado para o df
+            (ver src.filter_engine). Se None, ou se o índice não foi construído sobre este df
+            (IndiceFiltros.pertence), as máscaras são calculadas direto nas colunas.
 
     Returns:
-        pd.Series | pd.DataFrame: Dataframe com os filtros aplicados
+        pd.Series | pd.DataFrame | Cubo: Dataframe (ou cubo) com os filtros aplicados
     """
 
-# Filtro de datas
-    datas_selecionadas = (df['Order_Date'] >= date_slider[0]) & (df['Order_Date'] <= date_slider[1])
-    df = df.loc[datas_selecionadas, :]    
+    if isinstance(df, Cubo):
+        return filtrar_cubo(df, date_slider, traffic_options, weather_cond, cities)
 
-    # Filtro de transito
-    transito_selecionado = df['Road_traffic_density'].isin(traffic_options)
-    df = df.loc[transito_selecionado, :]
+    if indice is not None and indice.pertence(df):
+        posicoes = indice.posicoes(date_slider, traffic_options, weather_cond, cities)
+        return df if posicoes is None else df.take(posicoes)
 
-    # Filtro de clima
-    clima_selecionado = df['Weatherconditions'].isin(weather_cond)
-    df = df.loc[clima_selecionado, :]
+    selecoes = {
+        'Road_traffic_density': traffic_options,
+        'Weatherconditions': weather_cond,
+        'City': cities
+    }
 
-    # Filtro de cidades
-    cidades_selecionadas = df['City'].isin(cities)
-    df = df.loc[cidades_selecionadas, :]
+    # Filtro de datas
+    mascara = (df['Order_Date'] >= date_slider[0]) & (df['Order_Date'] <= date_slider[1])
+    if mascara.all():
+        mascara = None
 
-    return df
+    # Filtros de transito, clima e cidades (pulando dimensões sem restrição)
+    for coluna, selecionados in selecoes.items():
+        if set(df[coluna].unique()).issubset(selecionados):
+            continue
 
-def pedidos_por_dia(df: pd.Series | pd.DataFrame):
+        selecionado = df[coluna].isin(selecionados)
+        mascara = selecionado if mascara is None else mascara & selecionado
+
+    return df if mascara is None else df.loc[mascara, :]
+
+@instrumentar
+def pedidos_por_dia(
+    df: pd.Series | pd.DataFrame | Cubo,
+    resolucao: str | None = None,
+    pontos_maximos: int | None = PONTOS_MAXIMOS):
     """
     Função para criar um gráfico de barras mostrando o total de pedidos por dia.
 
+    Se o intervalo de datas tiver mais de pontos_maximos dias, os pedidos são
+    somados por semana ou por mês (ver src.series_temporais.escolher_resolucao).
+    As barras nunca são reduzidas por LTTB, que descartaria períodos inteiros: uma
+    resolução fixada é a mais fina aceita e, se passar de pontos_maximos barras,
+    os pedidos são somados em períodos maiores.
+
     Args:
-        df (pd.Series | pd.DataFrame): DataFrame contendo os dados dos pedidos.
+        df (pd.Series | pd.DataFrame | Cubo): DataFrame contendo os dados dos pedidos ou cubo de métricas.
+        resolucao (str | None): 'D', 'W' ou 'M' (a mais fina aceita); None escolhe pelo intervalo de datas.
+        pontos_maximos (int | None): Máximo de barras; None envia todas.
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de barras.
@@ -61,20 +197,29 @@ def pedidos_por_dia(df: pd.Series | pd.DataFrame):
     fig = pedidos_por_dia(df)
     """
 
-    df_aux = df.loc[:, ['ID', 'Order_Date']].groupby('Order_Date').count().reset_index()
+    df_aux = _estatisticas(df, ['Order_Date'], []).rename(columns={'Pedidos': 'ID'})
+
+    resolucao = _resolucao(df_aux['Order_Date'], None, pontos_maximos, minima=resolucao or 'D')
+    df_aux = reamostrar(df_aux, 'Order_Date', 'ID', resolucao)
+
+    from plotly import express as px
 
     # Criando o gráfico de barras
     fig = px.bar(df_aux, x='Order_Date', y='ID')
+
+    if resolucao != 'D':
+        fig.update_xaxes(title_text=f"Order_Date ({RESOLUCOES[resolucao]})")
     
     return fig
 
-def pedidos_por_trafego(df: pd.Series | pd.DataFrame):
+@instrumentar
+def pedidos_por_trafego(df: pd.Series | pd.DataFrame | Cubo):
     """
     Função para criar um gráfico de pizza mostrando a porcentagem de pedidos por 
     tipo de tráfego.
                     
     Args:
-       df (pd.Series | pd.DataFrame): DataFrame contendo os dados dos pedidos.
+       df (pd.Series | pd.DataFrame | Cubo): DataFrame contendo os dados dos pedidos ou cubo de métricas.
                         
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de pizza.
@@ -83,26 +228,24 @@ def pedidos_por_trafego(df: pd.Series | pd.DataFrame):
         fig = pedidos_por_trafego(df)   
     """
 
-    df_aux = (
-        df.loc[:, ['ID', 'Road_traffic_density']]
-        .groupby('Road_traffic_density')
-        .count()
-        .reset_index()
-    )
+    df_aux = _estatisticas(df, ['Road_traffic_density'], []).rename(columns={'Pedidos': 'ID'})
     df_aux['Perc_entregas'] = df_aux['ID'] / df_aux['ID'].sum()
 
+    from plotly import express as px
+
     # Criando o gráfico de pizza
     fig = px.pie(df_aux, values='Perc_entregas', names='Road_traffic_density')
 
     return fig
 
-def pedidos_cidade_trafego(df: pd.Series | pd.DataFrame):
+@instrumentar
+def pedidos_cidade_trafego(df: pd.Series | pd.DataFrame | Cubo):
     """
     Função para criar um gráfico de dispersão mostrando a quantidade de pedidos
     por cidade e tipo de tráfego.
 
     Args:
-        df (pd.Series | pd.DataFrame): DataFrame contendo os dados dos pedidos.
+        df (pd.Series | pd.DataFrame | Cubo): DataFrame contendo os dados dos pedidos ou cubo de métricas.
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de dispersão.
@@ -111,24 +254,32 @@ def pedidos_cidade_trafego(df: pd.Series | pd.DataFrame):
         fig = pedidos_cidade_trafego(df)
     """
 
-    df_aux = (
-        df.loc[:, ['ID', 'City', 'Road_traffic_density']]
-        .groupby(['City', 'Road_traffic_density'])
-        .count()
-        .reset_index()
-    )
+    df_aux = _estatisticas(df, ['City', 'Road_traffic_density'], []).rename(columns={'Pedidos': 'ID'})
+
+    from plotly import express as px
 
     # Criando o gráfico de dispersão
     fig = px.scatter(df_aux, x='City', y='Road_traffic_density', size='ID', color='City')
 
     return fig
 
-def pedidos_por_semana(df: pd.Series | pd.DataFrame):
+@instrumentar
+def pedidos_por_semana(
+    df: pd.Series | pd.DataFrame | Cubo,
+    resolucao: str | None = None,
+    pontos_maximos: int | None = PONTOS_MAXIMOS):
     """
     Função para criar um gráfico de linha mostrando o total de pedidos por semana.
 
+    As semanas vão de segunda a domingo e são identificadas pela data de
+    início, então a mesma semana de anos diferentes não se mistura. Se o
+    intervalo tiver mais de pontos_maximos semanas, os pedidos são somados por
+    mês; com a resolução fixada, uma série maior que pontos_maximos é reduzida por LTTB.
+
     Args:
-        df (pd.Series | pd.DataFrame): DataFrame contendo os dados dos pedidos.
+        df (pd.Series | pd.DataFrame | Cubo): DataFrame contendo os dados dos pedidos ou cubo de métricas.
+        resolucao (str | None): 'D', 'W' ou 'M'; None escolhe semana ou mês pelo intervalo de datas.
+        pontos_maximos (int | None): Máximo de pontos da linha; None envia todos.
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de linha.
@@ -137,24 +288,106 @@ def pedidos_por_semana(df: pd.Series | pd.DataFrame):
         fig = pedidos_por_semana(df)
     """
 
-    df_aux1 = (
-        df.loc[:, ['ID', 'Week_of_Year']]
-        .groupby('Week_of_Year')
-        .count()
-        .reset_index()
-    )
+    df_aux1 = _estatisticas(df, ['Order_Date'], []).rename(columns={'Pedidos': 'ID'})
+
+    resolucao = _resolucao(df_aux1['Order_Date'], resolucao, pontos_maximos, minima='W')
+    df_aux1 = reamostrar(df_aux1, 'Order_Date', 'ID', resolucao)
+    df_aux1 = _reduzir_linha(df_aux1, 'Order_Date', 'ID', pontos_maximos)
+
+    from plotly import express as px
 
     # Criando o gráfico de linha
-    fig = px.line(df_aux1, x='Week_of_Year', y='ID')
+    fig = px.line(df_aux1, x='Order_Date', y='ID')
+    fig.update_xaxes(title_text=f"Order_Date ({RESOLUCOES[resolucao]})")
     
     return fig
 
-def pedidos_por_ent_semana(df: pd.Series | pd.DataFrame):
+def _por_periodo(df: pd.DataFrame | Cubo, resolucao: str) -> pd.DataFrame | Cubo:
+    # Substitui 'Order_Date' pelo início do período (nos pedidos ou nas células e esboços do cubo)
+    if isinstance(df, Cubo):
+        esbocos = df.esbocos
+        if esbocos is not None:
+            chaves = esbocos.chaves.assign(Order_Date=inicio_periodo(esbocos.chaves['Order_Date'], resolucao))
+            esbocos = EsbocosHLL(chaves, esbocos.registros, esbocos.precisao)
+        return Cubo(df.dados.assign(Order_Date=inicio_periodo(df.dados['Order_Date'], resolucao)), esbocos)
+
+    df_aux = df.loc[:, ['ID', 'Delivery_person_ID', 'Order_Date']]
+
+    return df_aux.assign(Order_Date=inicio_periodo(df_aux['Order_Date'], resolucao))
+
+def _pedidos_e_entregadores(df: pd.DataFrame | Cubo, por: list) -> pd.DataFrame:
+    """
+    Função auxiliar para contar pedidos ('ID') e entregadores distintos ('Delivery_person_ID') por grupo.
+
+    Com um Dataframe, as duas contagens saem de um único groupby (contagem
+    exata). Com um Cubo, os pedidos saem das células e os entregadores da
+    combinação dos esboços HyperLogLog (src.hyperloglog), sem reler os pedidos.
+
+    Args:
+        df (pd.DataFrame | Cubo): Dataframe de pedidos ou cubo de métricas com esboços
+        por (list): Colunas de agrupamento (lista vazia conta o total)
+
+    Returns:
+        pd.DataFrame: Colunas de `por`, 'ID' e 'Delivery_person_ID'
+
+    Raises:
+        ValueError: Se o cubo não tiver esboços (construir_cubo com esbocos=True)
+    """
+
+    if isinstance(df, Cubo):
+        if df.esbocos is None:
+            raise ValueError("O cubo não tem esboços de entregadores: use construir_cubo(df, esbocos=True).")
+
+        pedidos = agregar_cubo(df, por, []).rename(columns={'Pedidos': 'ID'})
+        distintos = distintos_por(df.esbocos, por).rename(columns={'Distintos': 'Delivery_person_ID'})
+
+        if not por:
+            return pd.concat([pedidos.reset_index(drop=True), distintos], axis=1)
+        return pd.merge(pedidos, distintos, on=por, how='inner')
+
+    if not por:
+        return pd.DataFrame({'ID': [df['ID'].count()], 'Delivery_person_ID': [df['Delivery_person_ID'].nunique()]})
+
+    return (
+        df.groupby(por, observed=True)
+        .agg(ID=('ID', 'count'), Delivery_person_ID=('Delivery_person_ID', 'nunique'))
+        .reset_index()
+    )
+
+@instrumentar
+def entregadores_distintos(df: pd.Series | pd.DataFrame | Cubo) -> int:
+    """
+    Função para contar os entregadores distintos dos pedidos selecionados.
+
+    Args:
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe de pedidos (contagem exata) ou cubo
+            de métricas com esboços (estimativa HyperLogLog)
+
+    Returns:
+        int: Quantidade de entregadores distintos
+
+    Example:
+        ent_unicos = entregadores_distintos(df)
+    """
+
+    return int(_pedidos_e_entregadores(df, [])['Delivery_person_ID'].iloc[0])
+
+@instrumentar
+def pedidos_por_ent_semana(
+    df: pd.Series | pd.DataFrame | Cubo,
+    resolucao: str | None = None,
+    pontos_maximos: int | None = PONTOS_MAXIMOS):
     """
     Função para criar um gráfico de linhas mostrando a média de pedidos por entregador por semana.
 
+    Semanas e resolução como em pedidos_por_semana; os entregadores distintos
+    são contados no período inteiro (não somados dia a dia).
+
     Args:
-        df (pd.Series | pd.DataFrame): DataFrame contendo os dados dos pedidos.
+        df (pd.Series | pd.DataFrame | Cubo): DataFrame contendo os dados dos pedidos (contagem
+            exata) ou cubo de métricas com esboços (entregadores estimados por HyperLogLog).
+        resolucao (str | None): 'D', 'W' ou 'M'; None escolhe semana ou mês pelo intervalo de datas.
+        pontos_maximos (int | None): Máximo de pontos da linha; None envia todos.
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de linhas.
@@ -163,49 +396,145 @@ def pedidos_por_ent_semana(df: pd.Series | pd.DataFrame):
         fig = pedidos_por_entregador_semana(df)
     """
 
-    df_aux1 = df.loc[:, ['ID', 'Week_of_Year']].groupby('Week_of_Year').count().reset_index()
-    df_aux2 = df.loc[:, ['Delivery_person_ID', 'Week_of_Year']].groupby('Week_of_Year').nunique().reset_index()
+    datas = df.dados['Order_Date'] if isinstance(df, Cubo) else df['Order_Date']
+    resolucao = _resolucao(datas, resolucao, pontos_maximos, minima='W')
 
-    df_aux = pd.merge(df_aux1, df_aux2, how='inner')
+    df_aux = _pedidos_e_entregadores(_por_periodo(df, resolucao), ['Order_Date'])
     df_aux['Order_by_Deliver'] = df_aux['ID'] / df_aux['Delivery_person_ID']
+    df_aux = _reduzir_linha(df_aux, 'Order_Date', 'Order_by_Deliver', pontos_maximos)
+
+    from plotly import express as px
 
     # Criando o gráfico de linhas
-    fig = px.line(df_aux, x='Week_of_Year', y='Order_by_Deliver')
+    fig = px.line(df_aux, x='Order_Date', y='Order_by_Deliver')
+    fig.update_xaxes(title_text=f"Order_Date ({RESOLUCOES[resolucao]})")
 
     return fig
 
-def mapa_entregas(df: pd.Series | pd.DataFrame) -> None:
+@instrumentar
+def mapa_entregas_html(
+    df: pd.Series | pd.DataFrame,
+    limite_celulas: int = LIMITE_CELULAS_MAPA,
+    limite_poligonos: int = LIMITE_POLIGONOS_MAPA) -> str:
+    """
+    Função para gerar o HTML do mapa de densidade das entregas.
 
-    cols6 = ['City', 'Road_traffic_density', 'Delivery_location_latitude', 'Delivery_location_longitude']
+    Os locais de entrega são agregados em células de grade no servidor (ver
+    src.geo.agregar_grade); a resolução começa em RESOLUCAO_MAPA e é dobrada
+    até caberem `limite_celulas` células, de modo que o tamanho do mapa não
+    cresce com a quantidade de pedidos. O mapa tem uma camada de calor com
+    todas as células e uma camada GeoJSON com as `limite_poligonos` células
+    mais movimentadas (pedidos e tempo médio no tooltip).
 
-    df_aux = df.loc[:, cols6].groupby(['City', 'Road_traffic_density']).median().reset_index()
+    Args:
+        df (pd.Series | pd.DataFrame): Dataframe contendo os dados de entrega
+        limite_celulas (int): Máximo de células na camada de calor
+        limite_poligonos (int): Máximo de células na camada GeoJSON
 
-    mapa = folium.Map()
+    Returns:
+        str: Documento HTML autocontido do mapa
 
-    for index, location_info in df_aux.iterrows():
-        # Criando o conteúdo do popup como uma string formatada
-        popup_content = f"""
-            <b>Cidade:</b> {location_info['City']}<br>
-            <b>Tráfego:</b> {location_info['Road_traffic_density']}
-        """
+    Example:
+        html = mapa_entregas_html(df)
+    """
+
+    lat, lon = 'Delivery_location_latitude', 'Delivery_location_longitude'
+    df_aux = df.loc[coordenadas_validas(df[lat], df[lon]), [lat, lon, 'Time_taken(min)']]
+
+    resolucao = RESOLUCAO_MAPA
+    grade = agregar_grade(df_aux, lat, lon, 'Time_taken(min)', resolucao)
+    while len(grade) > limite_celulas:
+        resolucao *= 2
+        grade = agregar_grade(df_aux, lat, lon, 'Time_taken(min)', resolucao)
+
+    import folium
+    from folium.plugins import HeatMap
+
+    mapa = folium.Map(tiles='OpenStreetMap')
+
+    if grade.empty:
+        return mapa.get_root().render()
+
+    mapa.fit_bounds([
+        [grade['Latitude'].min(), grade['Longitude'].min()],
+        [grade['Latitude'].max(), grade['Longitude'].max()]
+    ])
+
+    HeatMap(
+        grade[['Latitude', 'Longitude', 'Pedidos']].round(5).to_numpy().tolist(),
+        name='Densidade de entregas',
+        radius=12
+    ).add_to(mapa)
+
+    meia = resolucao / 2
+    celulas = [
+        {
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [[
+                    [round(c_lon - meia, 5), round(c_lat - meia, 5)],
+                    [round(c_lon + meia, 5), round(c_lat - meia, 5)],
+                    [round(c_lon + meia, 5), round(c_lat + meia, 5)],
+                    [round(c_lon - meia, 5), round(c_lat + meia, 5)],
+                    [round(c_lon - meia, 5), round(c_lat - meia, 5)]
+                ]]
+            },
+            'properties': {'pedidos': int(pedidos), 'tempo_medio': round(float(media), 1)}
+        }
+        for c_lat, c_lon, pedidos, media in grade.nlargest(limite_poligonos, 'Pedidos').itertuples(index=False)
+    ]
 
-        # Adicionando o marcador ao mapa
-        folium.Marker(
-            [location_info['Delivery_location_latitude'],
-            location_info['Delivery_location_longitude']],
-            popup=popup_content
-        ).add_to(mapa)
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': celulas},
+        name='Células mais movimentadas',
+        style_function=lambda _: {'color': '#d35400', 'weight': 1, 'fillOpacity': 0.15},
+        tooltip=folium.GeoJsonTooltip(fields=['pedidos', 'tempo_medio'], aliases=['Pedidos:', 'Tempo médio (min):'])
+    ).add_to(mapa)
 
-    st_folium(mapa, width=1024, height=600)
+    folium.LayerControl().add_to(mapa)
+
+    return mapa.get_root().render()
+
+@instrumentar
+def exibir_mapa(html: str, altura: int = 600) -> None:
+    """
+    Função para exibir na página um mapa já renderizado em HTML.
+
+    O HTML é enviado uma única vez como componente estático, sem a troca de
+    eventos entre navegador e servidor do st_folium.
+
+    Args:
+        html (str): HTML do mapa (ex.: saída de mapa_entregas_html)
+        altura (int): Altura do mapa em pixels
+    """
+
+    components.html(html, height=altura)
+
+    return None
+
+@instrumentar
+def mapa_entregas(df: pd.Series | pd.DataFrame) -> None:
+    """
+    Função para exibir o mapa de densidade das entregas.
+
+    Para reaproveitar o HTML entre reruns, memoize mapa_entregas_html e use exibir_mapa.
+
+    Args:
+        df (pd.Series | pd.DataFrame): Dataframe contendo os dados de entrega
+    """
+
+    exibir_mapa(mapa_entregas_html(df))
 
     return None
 
-def avaliacao_media_desvio_padrao(df: pd.Series | pd.DataFrame, coluna: str) -> pd.DataFrame:
+@instrumentar
+def avaliacao_media_desvio_padrao(df: pd.Series | pd.DataFrame | Cubo, coluna: str) -> pd.DataFrame:
     """
     Função para criar um Dataframe com média e desvio padrão dos entregadores
 
     Args:
-        df (pd.Series | pd.DataFrame): Dataframe contendo os dados dos entregadores
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe contendo os dados dos entregadores ou cubo de métricas
         coluna (str): String com nome da coluna a ser avaliada
 
     Returns:
@@ -217,21 +546,99 @@ def avaliacao_media_desvio_padrao(df: pd.Series | pd.DataFrame, coluna: str) ->
     """
 
     df_avg_std_rating = (
-        df.loc[:, ['Delivery_person_Ratings', coluna]]
-        .groupby(coluna)
-        .agg(
-            Delivery_mean=('Delivery_person_Ratings', 'mean'), 
-            Delivery_std=('Delivery_person_Ratings', 'std')
-        )
-        .reset_index()
+        _estatisticas(df, [coluna], ['Delivery_person_Ratings'])
+        .drop(columns='Pedidos')
+        .rename(columns={
+            'Delivery_person_Ratings_media': 'Delivery_mean',
+            'Delivery_person_Ratings_desvio': 'Delivery_std'
+        })
     )
 
     return df_avg_std_rating
 
+@instrumentar
+def top_n_por_grupo(
+    df: pd.DataFrame,
+    grupo: str,
+    chave: str,
+    medida: str,
+    n: int = 10,
+    ordem_grupos: list | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Função para calcular os n menores e os n maiores valores médios de `medida` por `grupo`.
+
+    A média por (grupo, chave) é calculada uma única vez e os dois extremos saem
+    dessa tabela (uma linha por par, bem menor que o dataset) por seleção parcial em
+    cada grupo, sem ordenar a tabela inteira; empates mantêm a ordem das chaves nos
+    dois extremos. Funciona para qualquer quantidade de grupos (cidades, regiões, ...).
+
+    Args:
+        df (pd.DataFrame): Dataframe com as colunas `grupo`, `chave` e `medida`
+        grupo (str): Coluna de agrupamento (ex.: 'City')
+        chave (str): Coluna identificadora dentro do grupo (ex.: 'Delivery_person_ID')
+        medida (str): Coluna numérica a ser ranqueada (ex.: 'Time_taken(min)')
+        n (int): Quantidade de linhas por grupo em cada extremo
+        ordem_grupos (list | None): Ordem dos grupos no resultado (grupos fora da lista vêm
+            por último); None mantém a ordem de `grupo`
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (menores, maiores), com as colunas grupo, chave e
+            medida, ordenados por grupo e, dentro do grupo, do extremo para o centro
+
+    Example:
+        df_fastest, df_slowest = top_n_por_grupo(df, 'City', 'Delivery_person_ID', 'Time_taken(min)')
+    """
+
+    medias = (
+        df.loc[:, [grupo, chave, medida]]
+        .groupby([grupo, chave], observed=True)
+        .mean()
+        .reset_index()
+    )
+
+    # Seleção parcial por grupo (nsmallest/nlargest): só os n extremos de cada grupo são
+    # ordenados, e empates ficam na ordem das chaves (keep='first')
+    medidas = medias.groupby(grupo, observed=True, sort=True)[medida]
+    posicao = {valor: i for i, valor in enumerate(ordem_grupos)} if ordem_grupos is not None else None
+
+    extremos = []
+    for selecao in (medidas.nsmallest(n, keep='first'), medidas.nlargest(n, keep='first')):
+        df_aux = medias.take(selecao.index.get_level_values(-1).astype('int64'))
+
+        if posicao is not None:
+            df_aux = df_aux.sort_values(
+                by=grupo, kind='stable', key=lambda serie: serie.map(posicao).astype(float)
+            )
+
+        extremos.append(df_aux.reset_index(drop=True))
+
+    return extremos[0], extremos[1]
+
+@instrumentar
+def top_entregadores_extremos(df: pd.Series | pd.DataFrame, n: int = 10) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Função para criar os Dataframes com os entregadores mais rápidos e mais lentos de cada cidade.
+
+    Args:
+        df (pd.Series | pd.DataFrame): Dataframe contendo os dados dos entregadores
+        n (int): Quantidade de entregadores por cidade
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (mais rápidos, mais lentos) por cidade
+
+    Example:
+        df_fastest, df_slowest = top_entregadores_extremos(df)
+    """
+
+    return top_n_por_grupo(df, 'City', 'Delivery_person_ID', 'Time_taken(min)', n, ORDEM_CIDADES)
+
+@instrumentar
 def top_entregadores(df: pd.Series | pd.DataFrame, ascending_order: bool) -> pd.DataFrame:
     """
     Função para criar Dataframe com os entregadores mais rápidos e mais lentos por cidade.
 
+    Para obter os dois extremos de uma vez, use top_entregadores_extremos.
+
     Args:
         df (pd.Series | pd.DataFrame): Dataframe contendo os dados dos entregadores
         ascending_order (bool): 
@@ -246,32 +653,69 @@ def top_entregadores(df: pd.Series | pd.DataFrame, ascending_order: bool) -> pd.
         df_slowest = top_entregadores(df, ascending_order=False)
     """
 
-    df_result = (
-                df.loc[:, ['Delivery_person_ID', 'City', 'Time_taken(min)']]
-                .groupby(['City', 'Delivery_person_ID'])
-                .mean()
-                .reset_index()
-                .sort_values(
-                    by=['City', 'Time_taken(min)'], 
-                    ascending=[True, ascending_order]
-                )
+    df_fastest, df_slowest = top_entregadores_extremos(df)
+
+    return df_fastest if ascending_order else df_slowest
+
+@instrumentar
+def estatisticas_por_dimensao(
+    df: pd.DataFrame | Cubo,
+    dimensao: str,
+    medida: str,
+    percentis: list | None = None) -> pd.DataFrame:
+    """
+    Função para calcular, em uma única agregação, as estatísticas de uma medida por valor de uma dimensão.
+
+    Substitui várias chamadas que recortam o mesmo agrupamento (ex.: média e
+    desvio padrão com e sem festival) por uma tabela consultada pelo valor da
+    dimensão.
+
+    Args:
+        df (pd.DataFrame | Cubo): Dataframe de pedidos ou cubo de métricas
+        dimensao (str): Coluna de agrupamento (ex.: 'Festival')
+        medida (str): Coluna numérica (ex.: 'Time_taken(min)')
+        percentis (list | None): Percentis opcionais entre 0 e 1 (ex.: [0.5, 0.95]);
+            exigem o Dataframe de pedidos, pois o cubo guarda apenas somas
+
+    Returns:
+        pd.DataFrame: Indexado pelos valores de `dimensao`, com as colunas 'Pedidos',
+            'Media', 'Desvio' e uma coluna 'p<percentil>' para cada percentil (ex.: 'p95')
+
+    Raises:
+        ValueError: Se percentis forem pedidos sobre o cubo
+
+    Example:
+        festival = estatisticas_por_dimensao(cubo, 'Festival', 'Time_taken(min)')
+        festival.loc['Yes', 'Media']
+    """
+
+    if percentis and isinstance(df, Cubo):
+        raise ValueError("Percentis não podem ser calculados a partir do cubo; use o Dataframe de pedidos.")
+
+    df_aux = (
+        _estatisticas(df, [dimensao], [medida])
+        .rename(columns={f"{medida}_media": 'Media', f"{medida}_desvio": 'Desvio'})
+        .set_index(dimensao)
     )
 
-    # Filtra os 10 primeiros de cada cidade
-    df_metro = df_result.loc[df_result['City'] == 'Metropolitian', :].head(10)
-    df_urban = df_result.loc[df_result['City'] == 'Urban', :].head(10)
-    df_semi = df_result.loc[df_result['City'] == 'Semi-Urban', :].head(10)
+    if percentis:
+        quantis = df.groupby(dimensao, observed=True)[medida].quantile(percentis).unstack()
+        quantis.columns = [f"p{p * 100:g}" for p in quantis.columns]
+        df_aux = df_aux.join(quantis)
 
-    return pd.concat([df_metro, df_urban, df_semi]).reset_index(drop=True)
+    return df_aux
 
-def festival_mean_std(df: pd.Series | pd.DataFrame, cols: list, festival: str, calc: str) -> pd.Series | pd.DataFrame:
+@instrumentar
+def festival_mean_std(df: pd.Series | pd.DataFrame | Cubo, cols: list, festival: str, calc: str) -> pd.Series | pd.DataFrame:
     """
     Função para calcular a média e desvio padrão de um Dataframe.
 
+    Para mais de uma estatística do festival, use estatisticas_por_dimensao.
+
     Args:
-        df (pd.Series | pd.DataFrame): Dataframe contendo os dados de entrega
-        cols (list): Colunas selecionadas nos cálculos
-            Obs: 'Time_taken(min)' deve estar na lista de colunas
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe contendo os dados de entrega ou cubo de métricas
+        cols (list): Colunas selecionadas nos cálculos (mantido por compatibilidade;
+            o cálculo usa sempre 'Time_taken(min)' agrupado por 'Festival')
         festival (str): String com as palavras 'Yes' ou 'No' para seleção do Festival
         calc (str): Tipo de cálculo a ser realizado ('Avg_time' ou 'Std_time')
 
@@ -282,40 +726,24 @@ def festival_mean_std(df: pd.Series | pd.DataFrame, cols: list, festival: str, c
         cols = ['Time_taken(min)', 'Festival']
         avg_festival = festival_mean_std(df, cols, 'Yes', 'Avg_time')
     """
-    df_aux = (
-        df.loc[:, cols]
-        .groupby('Festival')
-        .agg(
-            Avg_time=('Time_taken(min)', 'mean'), 
-            Std_time= ('Time_taken(min)', 'std')
-        )
-        .reset_index()
-    )
+    df_aux = _estatisticas(df, ['Festival'], ['Time_taken(min)']).rename(columns=TEMPO_MEDIO_DESVIO)
 
     df_aux = df_aux.loc[df_aux['Festival'] == festival, calc]
     return df_aux
 
-def mean_std_tempo_cidade(df: pd.Series | pd.DataFrame):
+@instrumentar
+def mean_std_tempo_cidade(df: pd.Series | pd.DataFrame | Cubo):
     """
     Função para criar um gráfico de barras com desvio padrão por tempo por cidade
 
     Args:
-        df (pd.Series | pd.DataFrame): Dataframe contendo os dados de entrada
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe contendo os dados de entrada ou cubo de métricas
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de barras
     """
 
-    df_aux = (
-                    df.loc[:, ['Time_taken(min)', 'City']]
-                    .groupby('City')
-                    .agg(
-                        Avg_time=('Time_taken(min)', 'mean'), 
-                        Std_time= ('Time_taken(min)', 'std')
-                    )
-                    .reset_index()
-    )
-
+    df_aux = _estatisticas(df, ['City'], ['Time_taken(min)']).rename(columns=TEMPO_MEDIO_DESVIO)
 
     fig = go.Figure()
     fig.add_trace(
@@ -332,26 +760,25 @@ def mean_std_tempo_cidade(df: pd.Series | pd.DataFrame):
     
     return fig
 
-def mean_std_dataframe(df: pd.Series | pd.DataFrame, cols: list, cols_groupby: list) -> pd.DataFrame:
+@instrumentar
+def mean_std_dataframe(df: pd.Series | pd.DataFrame | Cubo, cols: list, cols_groupby: list) -> pd.DataFrame:
+    # 'cols' é mantido por compatibilidade; com o cubo só as dimensões de cols_groupby importam
     # Novo DF com média e desvio padrão por cidade e tipo de pedido
     df1 = (
-        df.loc[:, cols]
-        .groupby(cols_groupby)
-        .agg(
-            Avg_time=('Time_taken(min)', 'mean'), 
-            Std_time= ('Time_taken(min)', 'std')
-        )
-        .reset_index()
+        _estatisticas(df, cols_groupby, ['Time_taken(min)'])
+        .drop(columns='Pedidos')
+        .rename(columns=TEMPO_MEDIO_DESVIO)
     )
 
     return df1
 
-def tempo_medio_ent_cidade(df: pd.Series | pd.DataFrame):
+@instrumentar
+def tempo_medio_ent_cidade(df: pd.Series | pd.DataFrame | Cubo):
     """
     Função para cálculo do tempo médio de entregas por cidade
 
     Args:
-        df (pd.DataFrame): Dataframe de entrada
+        df (pd.DataFrame | Cubo): Dataframe de entrada ou cubo de métricas
 
     Returns:
         fig (plotly.graph_objs._figure.Figure): Gráfico de pizza com segmento
@@ -360,22 +787,12 @@ def tempo_medio_ent_cidade(df: pd.Series | pd.DataFrame):
         fig = tempo_medio_ent_cidade(df)
     """
 
-    cols = [
-        'Delivery_location_latitude', 
-        'Delivery_location_longitude', 
-        'Restaurant_latitude', 
-        'Restaurant_longitude'
-    ]
-
-    #Realizando o cálculo da distância entre restaurante e local de entrega com apply
-    df['Distance'] = df.loc[:, cols].apply(
-                    lambda x: hs((x[cols[0]], x[cols[1]]), 
-                    (x[cols[2]], x[cols[3]])), 
-                    axis=1
+    # A coluna 'Distance' é calculada uma única vez em df_cleaning
+    media_dist = (
+        _estatisticas(df, ['City'], ['Distance'])
+        .rename(columns={'Distance_media': 'Distance'})
     )
 
-    media_dist = df.loc[:, ['City', 'Distance']].groupby('City').mean().reset_index()
-
     fig = go.Figure(
         data=[go.Pie(
             labels=media_dist['City'], 
@@ -386,4 +803,24 @@ def tempo_medio_ent_cidade(df: pd.Series | pd.DataFrame):
     )
 
     return fig
-                
\ No newline at end of file
+                
+
+@instrumentar
+def distancia_media(df: pd.Series | pd.DataFrame | Cubo) -> float:
+    """
+    Função para calcular a distância média (km) entre restaurante e local de entrega.
+
+    Args:
+        df (pd.Series | pd.DataFrame | Cubo): Dataframe de pedidos ou cubo de métricas
+
+    Returns:
+        float: Distância média em km (NaN se não houver pedidos)
+
+    Example:
+        media_dist = distancia_media(cubo)
+    """
+
+    if isinstance(df, Cubo):
+        return agregar_cubo(df, [], ['Distance'])['Distance_media'].iloc[0]
+
+    return df.loc[:, 'Distance'].mean()
@@ -0,0 +1,360 @@
+"""
+Docstring para src.backends
+
+Motores de execução das agregações de src.analysis_tools e src.cube.
+
+As funções de análise descrevem a consulta (seleção da barra lateral, colunas
+de agrupamento e medidas) e o motor configurado a compila e executa:
+
+- 'pandas' (padrão): máscara booleana e groupby do pandas;
+- 'duckdb': consulta SQL (WHERE + GROUP BY) no DuckDB em processo, usando
+  todos os núcleos;
+- 'polars': LazyFrame do Polars (filter + group_by), também paralelo.
+
+A origem é o Dataframe de pedidos em memória (lido sem cópia pelo DuckDB) ou,
+quando informado, o snapshot Parquet do dataset limpo (src.snapshot): DuckDB
+e Polars leem o arquivo direto, só com as colunas da consulta. O pandas usa
+sempre o Dataframe, que já está em memória.
+
+Duas operações são compiladas em cada motor:
+
+- estatisticas: contagem, média e desvio padrão por grupo (funções de análise);
+- somas: contagem, soma e soma dos quadrados por grupo (construção do cubo
+  de métricas, a agregação sobre todos os pedidos feita na carga do dashboard).
+
+O motor é escolhido pela variável de ambiente CURRY_BACKEND ou por
+definir_backend(). DuckDB e Polars são dependências opcionais: se o pacote
+não estiver instalado, o pandas é usado e um aviso é registrado no log.
+
+Todos os motores devolvem exatamente o mesmo formato do pandas: as colunas de
+agrupamento com os tipos do Dataframe (incluindo a ordem das categorias), as
+linhas ordenadas pelos grupos, 'Pedidos' em int64 e as medidas em float64.
+Sem colunas de agrupamento, o resultado é uma única linha com o total.
+"""
+
+import logging
+import os
+import pandas as pd
+
+from src.filter_engine import DIMENSOES_FILTRO
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+def _colunas_estatisticas(medidas: list) -> list:
+    return [f"{medida}_{sufixo}" for medida in medidas for sufixo in ('media', 'desvio')]
+
+def _colunas_somas(medidas: list) -> list:
+    return [f"{medida}_{sufixo}" for medida in medidas for sufixo in ('soma', 'soma_q')]
+
+def _selecoes(selecao: tuple) -> tuple:
+    # (date_slider, traffic_options, weather_cond, cities) -> datas e {dimensão: valores selecionados}
+    date_slider, *valores = selecao
+    datas = (pd.Timestamp(date_slider[0]), pd.Timestamp(date_slider[1]))
+
+    return datas, {dimensao: [str(valor) for valor in selecionados] for dimensao, selecionados in zip(DIMENSOES_FILTRO, valores)}
+
+def _normalizar(resultado: pd.DataFrame, df: pd.DataFrame, por: list, colunas: list) -> pd.DataFrame:
+    # Mesmos tipos e mesma ordem de linhas do groupby do pandas (observed=True)
+    for coluna in por:
+        resultado[coluna] = resultado[coluna].astype(df[coluna].dtype)
+
+    resultado['Pedidos'] = resultado['Pedidos'].astype('int64')
+    for coluna in colunas:
+        resultado[coluna] = resultado[coluna].astype('float64')
+
+    if por:
+        resultado = resultado.sort_values(por, kind='stable')
+
+    return resultado.reset_index(drop=True).loc[:, por + ['Pedidos'] + colunas]
+
+class BackendPandas:
+    """
+    Agregações com máscaras booleanas e o groupby do pandas (um único núcleo).
+    """
+
+    nome = 'pandas'
+
+    @staticmethod
+    def _selecionar(df: pd.DataFrame, selecao: tuple | None) -> pd.DataFrame:
+        if selecao is None:
+            return df
+
+        datas, valores = _selecoes(selecao)
+        mascara = df['Order_Date'].between(*datas)
+        for dimensao, selecionados in valores.items():
+            mascara &= df[dimensao].isin(selecionados)
+
+        return df.loc[mascara, :]
+
+    def estatisticas(
+        self,
+        df: pd.DataFrame,
+        por: list,
+        medidas: list,
+        selecao: tuple | None = None,
+        parquet: str | None = None) -> pd.DataFrame:
+        """
+        Função para calcular contagem, média e desvio padrão (ddof=1) por grupo.
+
+        Args:
+            df (pd.DataFrame): Dataframe de pedidos
+            por (list): Colunas de agrupamento (lista vazia agrega o Dataframe todo)
+            medidas (list): Colunas numéricas
+            selecao (tuple | None): Filtros da barra lateral (date_slider, traffic_options,
+                weather_cond, cities), aplicados na mesma consulta; None não filtra
+            parquet (str | None): Snapshot Parquet com as mesmas linhas de df (lido pelos
+                motores que consultam arquivos; o pandas usa df)
+
+        Returns:
+            pd.DataFrame: Colunas de `por`, 'Pedidos', '<medida>_media' e '<medida>_desvio'
+        """
+
+        df = self._selecionar(df, selecao)
+
+        if not por:
+            total = {'Pedidos': [len(df)]}
+            for medida in medidas:
+                total[f"{medida}_media"] = [df[medida].mean()]
+                total[f"{medida}_desvio"] = [df[medida].std()]
+            return pd.DataFrame(total)
+
+        agrupado = df.groupby(por, observed=True)
+
+        df_aux = agrupado.size().rename('Pedidos').to_frame()
+        for medida in medidas:
+            df_aux[f"{medida}_media"] = agrupado[medida].mean()
+            df_aux[f"{medida}_desvio"] = agrupado[medida].std()
+
+        return df_aux.reset_index()
+
+    def somas(self, df: pd.DataFrame, por: list, medidas: list, parquet: str | None = None) -> pd.DataFrame:
+        """
+        Função para calcular contagem, soma e soma dos quadrados (em float64) por grupo.
+
+        Args:
+            df (pd.DataFrame): Dataframe de pedidos
+            por (list): Colunas de agrupamento
+            medidas (list): Colunas numéricas
+            parquet (str | None): Snapshot Parquet com as mesmas linhas de df (ver estatisticas)
+
+        Returns:
+            pd.DataFrame: Colunas de `por`, 'Pedidos', '<medida>_soma' e '<medida>_soma_q'
+        """
+
+        df_aux = df.loc[:, por].copy()
+        for medida in medidas:
+            valores = df[medida].astype('float64')
+            df_aux[f"{medida}_soma"] = valores
+            df_aux[f"{medida}_soma_q"] = valores ** 2
+
+        agrupado = df_aux.groupby(por, observed=True)
+
+        dados = agrupado.sum()
+        dados.insert(0, 'Pedidos', agrupado.size())
+
+        return dados.reset_index()
+
+class BackendDuckDB:
+    """
+    Agregações em SQL no DuckDB (em processo, multi-núcleo), lendo o DataFrame sem cópia ou o snapshot Parquet.
+    """
+
+    nome = 'duckdb'
+
+    def __init__(self):
+        import duckdb
+
+        self._duckdb = duckdb
+
+    @staticmethod
+    def _onde(por: list, selecao: tuple | None) -> tuple[str, list]:
+        condicoes = [f'"{coluna}" IS NOT NULL' for coluna in por]
+        parametros = []
+
+        if selecao is not None:
+            datas, valores = _selecoes(selecao)
+            condicoes.append('"Order_Date" BETWEEN ? AND ?')
+            parametros += [data.to_pydatetime() for data in datas]
+
+            for dimensao, selecionados in valores.items():
+                if not selecionados:
+                    condicoes.append('FALSE')
+                    continue
+                condicoes.append(f'CAST("{dimensao}" AS VARCHAR) IN ({", ".join("?" * len(selecionados))})')
+                parametros += selecionados
+
+        return (f" WHERE {' AND '.join(condicoes)}" if condicoes else ''), parametros
+
+    def _executar(
+        self,
+        df: pd.DataFrame,
+        colunas: list,
+        agregados: list,
+        por: list,
+        selecao: tuple | None,
+        parquet: str | None) -> pd.DataFrame:
+        onde, parametros = self._onde(por, selecao)
+        selecionadas = [f'"{coluna}"' for coluna in por] + agregados
+
+        # O snapshot é lido direto pelo DuckDB (só as colunas da consulta); o Dataframe, sem cópia
+        fonte = 'pedidos'
+        if parquet is not None:
+            fonte, parametros = 'read_parquet(?)', [parquet] + parametros
+
+        consulta = f'SELECT {", ".join(selecionadas)} FROM {fonte}{onde}'
+        if por:
+            grupos = ', '.join(f'"{coluna}"' for coluna in por)
+            consulta += f' GROUP BY {grupos}'
+
+        with self._duckdb.connect() as conexao:
+            if parquet is None:
+                conexao.register('pedidos', df.loc[:, list(dict.fromkeys(colunas))])
+            return conexao.execute(consulta, parametros).df()
+
+    def estatisticas(
+        self,
+        df: pd.DataFrame,
+        por: list,
+        medidas: list,
+        selecao: tuple | None = None,
+        parquet: str | None = None) -> pd.DataFrame:
+        agregados = ['COUNT(*) AS "Pedidos"'] + [
+            f'AVG("{medida}") AS "{medida}_media", STDDEV_SAMP("{medida}") AS "{medida}_desvio"'
+            for medida in medidas
+        ]
+        colunas = por + medidas + (['Order_Date'] + DIMENSOES_FILTRO if selecao is not None else [])
+
+        resultado = self._executar(df, colunas, agregados, por, selecao, parquet)
+
+        return _normalizar(resultado, df, por, _colunas_estatisticas(medidas))
+
+    def somas(self, df: pd.DataFrame, por: list, medidas: list, parquet: str | None = None) -> pd.DataFrame:
+        agregados = ['COUNT(*) AS "Pedidos"'] + [
+            f'COALESCE(SUM(CAST("{medida}" AS DOUBLE)), 0) AS "{medida}_soma", '
+            f'COALESCE(SUM(CAST("{medida}" AS DOUBLE) * CAST("{medida}" AS DOUBLE)), 0) AS "{medida}_soma_q"'
+            for medida in medidas
+        ]
+
+        resultado = self._executar(df, por + medidas, agregados, por, None, parquet)
+
+        return _normalizar(resultado, df, por, _colunas_somas(medidas))
+
+class BackendPolars:
+    """
+    Agregações em um LazyFrame do Polars (multi-núcleo), sobre o DataFrame ou o snapshot Parquet.
+    """
+
+    nome = 'polars'
+
+    def __init__(self):
+        import polars
+
+        self._pl = polars
+
+    def _pedidos(self, df: pd.DataFrame, colunas: list, por: list, selecao: tuple | None, parquet: str | None):
+        pl = self._pl
+        colunas = list(dict.fromkeys(colunas))
+
+        if parquet is not None:
+            pedidos = pl.scan_parquet(parquet).select(colunas)
+        else:
+            pedidos = pl.from_pandas(df.loc[:, colunas]).lazy()
+
+        if por:
+            pedidos = pedidos.drop_nulls(subset=por)
+
+        if selecao is not None:
+            datas, valores = _selecoes(selecao)
+            condicao = pl.col('Order_Date').is_between(*[data.to_pydatetime() for data in datas])
+            for dimensao, selecionados in valores.items():
+                condicao &= pl.col(dimensao).cast(pl.String).is_in(pl.Series(selecionados, dtype=pl.String).implode())
+            pedidos = pedidos.filter(condicao)
+
+        return pedidos
+
+    def _agregar(self, pedidos, por: list, agregados: list) -> pd.DataFrame:
+        pedidos = pedidos.group_by(por).agg(agregados) if por else pedidos.select(agregados)
+
+        return pedidos.collect().to_pandas()
+
+    def estatisticas(
+        self,
+        df: pd.DataFrame,
+        por: list,
+        medidas: list,
+        selecao: tuple | None = None,
+        parquet: str | None = None) -> pd.DataFrame:
+        pl = self._pl
+
+        agregados = [pl.len().alias('Pedidos')]
+        for medida in medidas:
+            agregados.append(pl.col(medida).mean().alias(f"{medida}_media"))
+            agregados.append(pl.col(medida).std(ddof=1).alias(f"{medida}_desvio"))
+
+        colunas = por + medidas + (['Order_Date'] + DIMENSOES_FILTRO if selecao is not None else [])
+        resultado = self._agregar(self._pedidos(df, colunas, por, selecao, parquet), por, agregados)
+
+        return _normalizar(resultado, df, por, _colunas_estatisticas(medidas))
+
+    def somas(self, df: pd.DataFrame, por: list, medidas: list, parquet: str | None = None) -> pd.DataFrame:
+        pl = self._pl
+
+        agregados = [pl.len().alias('Pedidos')]
+        for medida in medidas:
+            valores = pl.col(medida).cast(pl.Float64)
+            agregados.append(valores.sum().alias(f"{medida}_soma"))
+            agregados.append((valores * valores).sum().alias(f"{medida}_soma_q"))
+
+        resultado = self._agregar(self._pedidos(df, por + medidas, por, None, parquet), por, agregados)
+
+        return _normalizar(resultado, df, por, _colunas_somas(medidas))
+
+BACKENDS = {'pandas': BackendPandas, 'duckdb': BackendDuckDB, 'polars': BackendPolars}
+
+_backend = None
+
+def definir_backend(nome: str) -> BackendPandas | BackendDuckDB | BackendPolars:
+    """
+    Função para escolher o motor das agregações.
+
+    Args:
+        nome (str): 'pandas', 'duckdb' ou 'polars'
+
+    Returns:
+        BackendPandas | BackendDuckDB | BackendPolars: Motor ativo (pandas se o pedido não estiver instalado)
+
+    Raises:
+        ValueError: Se o nome não for um dos motores conhecidos
+
+    Example:
+        definir_backend('duckdb')
+    """
+
+    global _backend
+
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {nome}. Opções: {', '.join(BACKENDS)}")
+
+    try:
+        _backend = BACKENDS[nome]()
+    except ImportError:
+        logger.warning(f"Backend '{nome}' não está instalado; usando pandas.")
+        _backend = BackendPandas()
+
+    logger.info(f"Backend de agregação: {_backend.nome}.")
+
+    return _backend
+
+def obter_backend() -> BackendPandas | BackendDuckDB | BackendPolars:
+    """
+    Função para obter o motor ativo (na primeira chamada, o de CURRY_BACKEND ou o pandas).
+
+    Returns:
+        BackendPandas | BackendDuckDB | BackendPolars: Motor ativo
+    """
+
+    if _backend is None:
+        return definir_backend(os.environ.get('CURRY_BACKEND', 'pandas').lower())
+
+    return _backend
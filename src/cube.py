@@ -0,0 +1,277 @@
+"""
+Docstring para src.cube
+
+Cubo de métricas pré-agregado para as páginas do dashboard.
+
+O dataset limpo é agrupado uma única vez pelas dimensões de DIMENSOES_CUBO,
+guardando por célula a quantidade de pedidos e, para cada medida de
+MEDIDAS_CUBO, a soma e a soma dos quadrados. Filtros da barra lateral viram
+recortes sobre as células do cubo e médias/desvios padrão são derivados
+dessas somas, de modo que o custo de cada rerun depende do número de células,
+e não do número de pedidos.
+
+No modo de contagem aproximada (src.hyperloglog), o cubo também guarda um
+esboço HyperLogLog dos entregadores por dia e filtros, recortado e combinado
+junto com as células.
+"""
+
+import logging
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from src.backends import obter_backend
+from src.data_cleaning import unificar_categorias
+from src.hyperloglog import (
+    DISTINTOS_APROXIMADOS,
+    EsbocosHLL,
+    combinar_esbocos,
+    construir_esbocos,
+    filtrar_esbocos,
+    ler_esbocos,
+    salvar_esbocos
+)
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Dimensões (granularidade) do cubo
+DIMENSOES_CUBO = [
+    'Order_Date',
+    'City',
+    'Road_traffic_density',
+    'Weatherconditions',
+    'Festival',
+    'Type_of_order'
+]
+
+# Medidas com soma e soma dos quadrados por célula
+MEDIDAS_CUBO = ['Time_taken(min)', 'Delivery_person_Ratings', 'Distance']
+
+@dataclass
+class Cubo:
+    """
+    Cubo de métricas pré-agregado.
+
+    Attributes:
+        dados (pd.DataFrame): Uma linha por célula com as colunas de DIMENSOES_CUBO,
+            'Week_of_Year' (derivada de 'Order_Date'), 'Pedidos' e, para cada medida,
+            '<medida>_soma' e '<medida>_soma_q'
+        esbocos (EsbocosHLL | None): Esboços dos entregadores por dia e filtros (modo aproximado)
+    """
+
+    dados: pd.DataFrame
+    esbocos: EsbocosHLL | None = None
+
+def colunas_somas(medidas: list) -> list:
+    """
+    Função para listar as colunas de soma e soma dos quadrados das medidas.
+
+    Args:
+        medidas (list): Medidas do cubo
+
+    Returns:
+        list: Nomes das colunas '<medida>_soma' e '<medida>_soma_q'
+    """
+
+    return [f"{medida}_{sufixo}" for medida in medidas for sufixo in ('soma', 'soma_q')]
+
+def construir_cubo(df: pd.DataFrame, esbocos: bool | None = None, parquet: str | None = None) -> Cubo:
+    """
+    Função para construir o cubo de métricas a partir do dataset limpo.
+
+    A agregação roda no motor configurado (pandas, DuckDB ou Polars; ver src.backends).
+
+    Args:
+        df (pd.DataFrame): Dataset limpo (saída de df_cleaning)
+        esbocos (bool | None): Se True, constrói também os esboços HyperLogLog dos entregadores
+            (padrão: DISTINTOS_APROXIMADOS, variável de ambiente CURRY_DISTINTOS_APROXIMADOS)
+        parquet (str | None): Snapshot Parquet com as mesmas linhas de df, lido direto por
+            DuckDB e Polars (ver src.snapshot.snapshot_atual)
+
+    Returns:
+        Cubo: Cubo com contagem, soma e soma dos quadrados por célula
+
+    Example:
+        cubo = construir_cubo(df)
+    """
+
+    dados = obter_backend().somas(df, DIMENSOES_CUBO, MEDIDAS_CUBO, parquet)
+    dados.insert(len(DIMENSOES_CUBO), 'Week_of_Year', dados['Order_Date'].dt.isocalendar().week)
+
+    esbocos = DISTINTOS_APROXIMADOS if esbocos is None else esbocos
+
+    return Cubo(dados, construir_esbocos(df) if esbocos else None)
+
+def combinar_cubos(cubos: list) -> Cubo:
+    """
+    Função para combinar cubos parciais (ex.: de partes diferentes do dataset) em um só.
+
+    Como o cubo guarda apenas contagens e somas, a combinação é uma soma célula a célula.
+    Os esboços são combinados apenas se todos os cubos os tiverem.
+
+    Args:
+        cubos (list): Lista de Cubo
+
+    Returns:
+        Cubo: Cubo combinado
+    """
+
+    dados = pd.concat(unificar_categorias([cubo.dados for cubo in cubos]), ignore_index=True)
+    dados = (
+        dados
+        .groupby(DIMENSOES_CUBO + ['Week_of_Year'], observed=True)
+        .sum()
+        .reset_index()
+    )
+
+    esbocos = None
+    if all(cubo.esbocos is not None for cubo in cubos):
+        esbocos = combinar_esbocos([cubo.esbocos for cubo in cubos])
+
+    return Cubo(dados, esbocos)
+
+def filtrar_cubo(
+    cubo: Cubo,
+    date_slider: tuple,
+    traffic_options: list,
+    weather_cond: list,
+    cities: list) -> Cubo:
+    """
+    Função para aplicar os filtros da barra lateral sobre as células do cubo.
+
+    Args:
+        cubo (Cubo): Cubo de métricas
+        date_slider (tuple): Tupla com as datas
+        traffic_options (list): Lista com condições de transito
+        weather_cond (list): Lista com condições climáticas
+        cities (list): Lista com as cidades
+
+    Returns:
+        Cubo: Cubo apenas com as células selecionadas
+    """
+
+    def selecao(dados: pd.DataFrame) -> pd.Series:
+        return (
+            (dados['Order_Date'] >= date_slider[0])
+            & (dados['Order_Date'] <= date_slider[1])
+            & dados['Road_traffic_density'].isin(traffic_options)
+            & dados['Weatherconditions'].isin(weather_cond)
+            & dados['City'].isin(cities)
+        )
+
+    mascara = selecao(cubo.dados)
+    if mascara.all():
+        return cubo
+
+    esbocos = None if cubo.esbocos is None else filtrar_esbocos(cubo.esbocos, selecao(cubo.esbocos.chaves))
+
+    return Cubo(cubo.dados.loc[mascara, :], esbocos)
+
+def agregar_cubo(cubo: Cubo, por: list, medidas: list) -> pd.DataFrame:
+    """
+    Função para agregar o cubo por um subconjunto das dimensões.
+
+    A média é soma / n e o desvio padrão amostral (ddof=1, como no pandas) é
+    derivado de sqrt((soma_q - soma * média) / (n - 1)); grupos com um único
+    pedido ficam com desvio NaN.
+
+    Args:
+        cubo (Cubo): Cubo de métricas
+        por (list): Dimensões de agrupamento (lista vazia agrega o cubo todo)
+        medidas (list): Medidas a serem derivadas (subconjunto de MEDIDAS_CUBO)
+
+    Returns:
+        pd.DataFrame: Colunas de `por`, 'Pedidos' e, para cada medida, '<medida>_media' e '<medida>_desvio'
+
+    Example:
+        df_aux = agregar_cubo(cubo, ['City'], ['Time_taken(min)'])
+    """
+
+    cols = ['Pedidos'] + colunas_somas(medidas)
+
+    if por:
+        df_aux = cubo.dados.groupby(por, observed=True)[cols].sum().reset_index()
+    else:
+        df_aux = cubo.dados[cols].sum().to_frame().T
+
+    n = df_aux['Pedidos'].astype('float64')
+
+    for medida in medidas:
+        soma = df_aux.pop(f"{medida}_soma")
+        soma_q = df_aux.pop(f"{medida}_soma_q")
+
+        media = soma / n
+        variancia = ((soma_q - soma * media) / (n - 1)).clip(lower=0)
+
+        df_aux[f"{medida}_media"] = media
+        df_aux[f"{medida}_desvio"] = np.sqrt(variancia).where(n > 1)
+
+    return df_aux
+
+def caminho_esbocos(path: str) -> str:
+    """
+    Função para obter o arquivo dos esboços gravado ao lado de um arquivo de cubo.
+
+    Args:
+        path (str): Arquivo Parquet do cubo (ex.: 'cubo-20220301.parquet')
+
+    Returns:
+        str: Arquivo dos esboços (ex.: 'cubo-20220301.hll.parquet')
+    """
+
+    return f"{os.path.splitext(path)[0]}.hll.parquet"
+
+def salvar_cubo(cubo: Cubo, path: str) -> None:
+    """
+    Função para gravar o cubo em Parquet (e os esboços, se houver, em caminho_esbocos(path)).
+
+    Args:
+        cubo (Cubo): Cubo de métricas
+        path (str): Arquivo de destino
+    """
+
+    cubo.dados.to_parquet(path, index=False)
+
+    if cubo.esbocos is not None:
+        salvar_esbocos(cubo.esbocos, caminho_esbocos(path))
+
+def ler_cubo(path: str) -> Cubo:
+    """
+    Função para ler um cubo gravado por salvar_cubo (com os esboços, se existirem).
+
+    Args:
+        path (str): Arquivo Parquet do cubo
+
+    Returns:
+        Cubo: Cubo de métricas
+    """
+
+    esbocos = caminho_esbocos(path)
+
+    return Cubo(pd.read_parquet(path), ler_esbocos(esbocos) if os.path.exists(esbocos) else None)
+
+def obter_cubo(path: str) -> Cubo | None:
+    """
+    Função para obter o cubo de métricas da versão atual do dataset.
+
+    O cubo é construído uma vez por versão dos dados e compartilhado entre
+    as sessões (ver src.dataset_store).
+
+    Args:
+        path (str): Caminho para o arquivo CSV de origem
+
+    Returns:
+        Cubo | None: Cubo de métricas, ou None se os dados não puderem ser carregados
+
+    Example:
+        cubo = obter_cubo(str(DATA_PATH))
+    """
+
+    # Import local: src.dataset_store depende deste módulo
+    from src.dataset_store import obter_dataset
+
+    dados = obter_dataset(path)
+
+    return None if dados is None else dados.cubo
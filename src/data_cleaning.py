@@ -6,24 +6,447 @@ Função para manipulação de DataFrames utilizando Pandas.
 
 # Importando Bibliotecas
 import os
+import sys
+import time
+import numpy as np
 import pandas as pd
-import streamlit as st
 import logging
 
+from src.geo import distancia_entrega
+from src.snapshot import chave_snapshot, ler_snapshot, salvar_snapshot
+from src.telemetria import instrumentar
+
 
 # Inicializa o logger
 logger = logging.getLogger(__name__)
 
-@st.cache_data
-def df_cleaning(path: str, df_clean: bool = True) -> pd.DataFrame | None:
+# Versão das regras de limpeza. Deve ser incrementada sempre que limpar_dataframe
+# mudar, para que os snapshots gravados com as regras antigas sejam reconstruídos.
+VERSAO_LIMPEZA = "2"
+
+# O Pandas vai ler "NaN " (com espaço) e "conditions NaN" automaticamente como dados nulos.
+NA_FORMATS = ["NaN ", "NaN", "conditions NaN"]
+
+# Colunas de texto lidas sempre como string. Fixar o tipo evita que a inferência
+# do read_csv mude conforme o trecho lido (ex.: leitura em blocos).
+TIPOS_CSV = {
+    coluna: str
+    for coluna in [
+        'ID', 'Delivery_person_ID', 'Order_Date', 'Time_Orderd', 'Time_Order_picked',
+        'Weatherconditions', 'Road_traffic_density', 'Type_of_order', 'Type_of_vehicle',
+        'Festival', 'City', 'Time_taken(min)'
+    ]
+}
+
+# Dimensões de baixa cardinalidade armazenadas como Categorical ordenado.
+# A ordem das categorias define a ordem dos agrupamentos e dos gráficos.
+CATEGORIAS = {
+    'City': ['Metropolitian', 'Semi-Urban', 'Urban'],
+    'Road_traffic_density': ['Low', 'Medium', 'High', 'Jam'],
+    'Weatherconditions': ['Cloudy', 'Fog', 'Sandstorms', 'Stormy', 'Sunny', 'Windy'],
+    'Festival': ['No', 'Yes'],
+    'Type_of_order': ['Buffet', 'Drinks', 'Meal', 'Snack'],
+    'Type_of_vehicle': ['bicycle', 'electric_scooter', 'motorcycle', 'scooter'],
+    'Vehicle_condition': [0, 1, 2, 3]
+}
+
+def relatorio_memoria(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Função para gerar um relatório de memória (bytes) por coluna de um DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser avaliado
+
+    Returns:
+        pd.DataFrame: Dataframe com tipo e memória (bytes e MB) de cada coluna
+
+    Exemplo de uso:
+        df_mem = relatorio_memoria(df)
+    """
+
+    memoria = df.memory_usage(index=False, deep=True)
+
+    df_mem = pd.DataFrame({
+        'Coluna': memoria.index,
+        'Tipo': df.dtypes.astype(str).values,
+        'Bytes': memoria.values
+    })
+    df_mem['MB'] = df_mem['Bytes'] / 2**20
+
+    return df_mem
+
+# Modo de orçamento de memória: reduz cada coluna numérica ao menor tipo que comporta
+# seus valores (ver reduzir_tipos). Desligado por padrão; CURRY_MEMORIA_REDUZIDA=1 liga.
+MEMORIA_REDUZIDA = os.environ.get('CURRY_MEMORIA_REDUZIDA', '0') == '1'
+
+# Erro relativo máximo aceito ao converter float64 -> float32 (float32 tem ~7 dígitos
+# significativos: ~1 cm nas coordenadas, bem abaixo da precisão dos dados)
+TOLERANCIA_FLOAT32 = 1e-6
+
+# Tipos inteiros candidatos, do menor para o maior (NumPy e anuláveis do pandas)
+_INTEIROS = ['int8', 'int16', 'int32']
+_INTEIROS_ANULAVEIS = ['UInt8', 'Int8', 'UInt16', 'Int16', 'UInt32', 'Int32']
+
+def _tipo_reduzido(serie: pd.Series) -> str | None:
+    # Menor tipo que comporta o intervalo de valores da coluna (None se não houver ganho)
+    tipo = serie.dtype
+
+    if pd.api.types.is_float_dtype(tipo) and not isinstance(tipo, pd.api.extensions.ExtensionDtype):
+        if tipo.itemsize <= 4:
+            return None
+        maximo = np.nanmax(np.abs(serie.to_numpy())) if serie.notna().any() else 0.0
+        return 'float32' if maximo <= np.finfo(np.float32).max else None
+
+    if not pd.api.types.is_integer_dtype(tipo) or serie.isna().all():
+        return None
+
+    minimo, maximo = serie.min(), serie.max()
+    candidatos = _INTEIROS_ANULAVEIS if isinstance(tipo, pd.api.extensions.ExtensionDtype) else _INTEIROS
+
+    for candidato in candidatos:
+        limites = np.iinfo(candidato.lower())
+        if limites.min <= minimo and maximo <= limites.max:
+            return candidato if pd.api.types.pandas_dtype(candidato).itemsize < tipo.itemsize else None
+
+    return None
+
+def _erro_conversao(original: pd.Series, convertida: pd.Series) -> float | None:
+    # Maior erro relativo da conversão (None se algum valor se perdeu: nulos, overflow ou inteiros alterados)
+    if not original.isna().equals(convertida.isna()):
+        return None
+
+    validos = original.notna().to_numpy()
+    antes = original.to_numpy(dtype=np.float64, na_value=np.nan)[validos]
+    depois = convertida.to_numpy(dtype=np.float64, na_value=np.nan)[validos]
+
+    if pd.api.types.is_integer_dtype(original.dtype):
+        return 0.0 if np.array_equal(antes, depois) else None
+
+    erro = np.abs(depois - antes) / np.maximum(np.abs(antes), np.finfo(np.float64).tiny)
+    erro_max = float(erro.max()) if len(erro) else 0.0
+
+    return erro_max if np.isfinite(depois).all() and erro_max <= TOLERANCIA_FLOAT32 else None
+
+def reduzir_tipos(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Função para reduzir cada coluna numérica ao menor tipo que comporta seus valores.
+
+    Ex.: int64 -> int8 na idade e nas entregas múltiplas, int64 -> int16 no tempo
+    de entrega, UInt32 -> UInt8 na semana e float64 -> float32 nas coordenadas,
+    avaliações e distância. Cada conversão é validada (nenhum nulo criado, nenhum
+    inteiro alterado e erro relativo dos floats <= TOLERANCIA_FLOAT32); se falhar,
+    a coluna mantém o tipo original e um aviso é registrado no log. Dimensões
+    categóricas, datas e textos não são alterados nem entram no relatório.
+
+    Args:
+        df (pd.DataFrame): DataFrame limpo
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: DataFrame reduzido e relatório por coluna numérica com
+            'Coluna', 'Tipo_antes', 'Tipo_depois', 'MB_antes', 'MB_depois' e 'Erro_relativo_max'
+
+    Exemplo de uso:
+        df, df_reducao = reduzir_tipos(df_cleaning(path))
+    """
+
+    linhas = []
+    novos_tipos = {}
+
+    for coluna in df.columns:
+        tipo = _tipo_reduzido(df[coluna])
+        if tipo is None:
+            continue
+
+        convertida = df[coluna].astype(tipo)
+        erro = _erro_conversao(df[coluna], convertida)
+
+        if erro is None:
+            logger.warning(f"Coluna '{coluna}' perderia valores em {tipo}; mantida como {df[coluna].dtype}.")
+            convertida = df[coluna]
+        else:
+            novos_tipos[coluna] = convertida
+
+        linhas.append({
+            'Coluna': coluna,
+            'Tipo_antes': str(df[coluna].dtype),
+            'Tipo_depois': str(convertida.dtype),
+            'MB_antes': df[coluna].memory_usage(index=False) / 2**20,
+            'MB_depois': convertida.memory_usage(index=False) / 2**20,
+            'Erro_relativo_max': erro
+        })
+
+    df = df.assign(**novos_tipos)
+    df_reducao = pd.DataFrame(
+        linhas, columns=['Coluna', 'Tipo_antes', 'Tipo_depois', 'MB_antes', 'MB_depois', 'Erro_relativo_max']
+    )
+
+    logger.info(
+        f"Memória das colunas numéricas: {df_reducao['MB_antes'].sum():.2f} MB -> "
+        f"{df_reducao['MB_depois'].sum():.2f} MB ({len(novos_tipos)} coluna(s) reduzida(s)):\n"
+        f"{df_reducao.to_string(index=False)}"
+    )
+
+    return df, df_reducao
+
+def converter_categorias(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Função para converter as dimensões de CATEGORIAS em Categorical ordenado.
+
+    Valores fora do conjunto fixo não são descartados: eles são adicionados ao
+    final das categorias (em ordem alfabética) e um aviso é registrado no log.
+
+    Args:
+        df (pd.DataFrame): DataFrame com as dimensões já limpas (sem espaços)
+
+    Returns:
+        pd.DataFrame: DataFrame com as dimensões convertidas
+    """
+
+    for coluna, categorias in CATEGORIAS.items():
+        novos = sorted(set(df[coluna].unique()) - set(categorias))
+
+        if novos:
+            logger.warning(f"Valores fora das categorias conhecidas em '{coluna}': {novos}")
+
+        df[coluna] = pd.Categorical(df[coluna], categories=categorias + novos, ordered=True)
+
+    return df
+
+def unificar_categorias(dfs: list) -> list:
+    """
+    Função para alinhar as categorias das dimensões de CATEGORIAS entre vários DataFrames.
+
+    Útil antes de concatenar partes limpas separadamente (blocos, partições), que
+    podem ter acrescentado valores desconhecidos diferentes. As categorias finais
+    seguem a mesma regra de converter_categorias: conjunto fixo + novos em ordem alfabética.
+
+    Args:
+        dfs (list): Lista de DataFrames com as dimensões já convertidas
+
+    Returns:
+        list: Os mesmos DataFrames com categorias idênticas em cada dimensão
+    """
+
+    for coluna, categorias in CATEGORIAS.items():
+        # Só alinha colunas presentes e categóricas em todos (o Parquet devolve
+        # Categorical de inteiros como inteiro; converter_categorias trata esses casos)
+        if not all(coluna in df.columns and isinstance(df[coluna].dtype, pd.CategoricalDtype) for df in dfs):
+            continue
+
+        presentes = set().union(*(df[coluna].cat.categories for df in dfs))
+        finais = categorias + sorted(presentes - set(categorias))
+
+        dfs = [df.assign(**{coluna: df[coluna].cat.set_categories(finais)}) for df in dfs]
+
+    return dfs
+
+# Prefixo fixo dos valores de 'Time_taken(min)' (ex.: '(min) 24')
+PREFIXO_TEMPO = '(min) '
+
+# --- PARSERS POR VALOR ÚNICO ---
+# Colunas de texto repetem poucos valores distintos (datas, climas, tempos): cada
+# valor distinto é convertido uma única vez e o resultado é espalhado pelas linhas.
+
+def por_valor_unico(serie: pd.Series, converter) -> pd.Series:
+    """
+    Função para aplicar uma conversão vetorizada apenas aos valores distintos de uma Series.
+
+    Args:
+        serie (pd.Series): Coluna a ser convertida
+        converter (Callable[[pd.Index], pd.Index]): Conversão aplicada ao Index de valores distintos
+
+    Returns:
+        pd.Series: Coluna convertida, com o mesmo índice e nome (nulos continuam nulos)
+
+    Exemplo de uso:
+        df['Order_Date'] = por_valor_unico(df['Order_Date'], lambda x: pd.to_datetime(x, format='%d-%m-%Y'))
+    """
+
+    codigos, unicos = pd.factorize(serie)
+
+    # O conversor pode devolver uma Series com índice próprio (ex.: isocalendar()
+    # indexado pelas datas): as posições passam a ser os rótulos
+    convertidos = pd.Series(converter(pd.Index(unicos))).reset_index(drop=True)
+
+    # Código -1 indica nulo: o reindex (agora por posição) o transforma em NaN/NaT
+    valores = convertidos.take(codigos) if (codigos >= 0).all() else convertidos.reindex(codigos)
+
+    return valores.set_axis(serie.index).rename(serie.name)
+
+def _parse_minutos(valores: pd.Index) -> pd.Index:
+    # Formato conhecido ('(min) 24'): fatia o prefixo; qualquer outro formato cai na regex original
+    if valores.str.startswith(PREFIXO_TEMPO).all():
+        return valores.str.slice(len(PREFIXO_TEMPO)).astype('int64')
+
+    return pd.Index(valores.astype(str).str.extract(r'(\d+)', expand=False)).astype('int64')
+
+def _parse_datas(valores: pd.Index) -> pd.Index:
+    return pd.to_datetime(valores, format='%d-%m-%Y')
+
+# --- ETAPAS DA LIMPEZA ---
+# Cada etapa recebe e devolve o DataFrame. A lista ETAPAS_LIMPEZA define a ordem
+# e é percorrida por limpar_dataframe (e pelos benchmarks, etapa a etapa).
+
+def _remover_nulos(df: pd.DataFrame) -> pd.DataFrame:
+    # 1. Remoção de Nulos (Substitui as 7 linhas de filtros manuais)
+    # Removemos linhas onde qualquer coluna essencial tenha virado NaN na leitura
+    df.dropna(inplace=True)
+
+    return df
+
+def _remover_espacos(df: pd.DataFrame) -> pd.DataFrame:
+    # 2. Limpeza de Espaços em Branco (Strip) em massa
+    # Seleciona apenas colunas do tipo 'object' (texto) e remove espaços das pontas
+    # (uma vez por valor distinto)
+    for coluna in df.select_dtypes(include=['object']).columns:
+        df[coluna] = por_valor_unico(df[coluna], lambda x: x.str.strip())
+
+    return df
+
+def _ajustar_numericos(df: pd.DataFrame) -> pd.DataFrame:
+    # 3. Ajuste de Tipos Numéricos
+    # Usamos o dicionário para organizar a conversão
+    return df.astype({
+        'Delivery_person_Age': int,
+        'multiple_deliveries': int,
+        'Delivery_person_Ratings': float
+    })
+
+def _tratar_datas(df: pd.DataFrame) -> pd.DataFrame:
+    # 4. Tratamento de Datas
+    # Poucas dezenas de datas distintas: cada uma é convertida (e tem a semana calculada) uma vez
+    df['Order_Date'] = por_valor_unico(df['Order_Date'], _parse_datas)
+    df['Week_of_Year'] = por_valor_unico(df['Order_Date'], lambda x: x.isocalendar().week)
+
+    return df
+
+def _limpeza_especifica(df: pd.DataFrame) -> pd.DataFrame:
+    # 5. Limpeza Específica (Regex e Replace)
+
+    # Remove '(min) ' e converte para int (fatiando o prefixo fixo, uma vez por valor distinto)
+    df['Time_taken(min)'] = por_valor_unico(df['Time_taken(min)'], _parse_minutos)
+
+    # Remove a palavra 'conditions ' de qualquer clima (mais genérico que o dicionário)
+    df['Weatherconditions'] = por_valor_unico(
+        df['Weatherconditions'], lambda x: x.str.replace('conditions ', '', regex=False)
+    )
+
+    return df
+
+def _memoria_colunas(df: pd.DataFrame, colunas: list) -> int:
+    # Mesmo valor de memory_usage(deep=True), medindo cada string distinta uma única vez
+    total = 0
+    for coluna in colunas:
+        serie = df[coluna]
+        if serie.dtype == object:
+            contagem = serie.value_counts(dropna=False)
+            total += serie.to_numpy().nbytes + sum(sys.getsizeof(valor) * n for valor, n in contagem.items())
+        else:
+            total += serie.memory_usage(index=False, deep=True)
+
+    return int(total)
+
+def _converter_dimensoes(df: pd.DataFrame) -> pd.DataFrame:
+    # 6. Dimensões Categóricas
+    # Strings repetidas viram códigos inteiros: menos memória e groupby/isin mais rápidos
+    mem_antes = _memoria_colunas(df, list(CATEGORIAS))
+    df = converter_categorias(df)
+    mem_depois = _memoria_colunas(df, list(CATEGORIAS))
+    logger.info(f"Memória das dimensões categóricas: {mem_antes / 2**20:.2f} MB -> {mem_depois / 2**20:.2f} MB")
+
+    return df
+
+def _colunas_derivadas(df: pd.DataFrame) -> pd.DataFrame:
+    # 7. Colunas Derivadas
+    # Distância restaurante -> entrega calculada uma única vez, de forma vetorizada
+    df['Distance'] = distancia_entrega(df)
+
+    return df
+
+def _resetar_indice(df: pd.DataFrame) -> pd.DataFrame:
+    # Resetar o index após a remoção de linhas é boa prática
+    df.reset_index(drop=True, inplace=True)
+
+    return df
+
+ETAPAS_LIMPEZA = [
+    ('remover_nulos', _remover_nulos),
+    ('remover_espacos', _remover_espacos),
+    ('ajustar_numericos', _ajustar_numericos),
+    ('tratar_datas', _tratar_datas),
+    ('limpeza_especifica', _limpeza_especifica),
+    ('converter_dimensoes', _converter_dimensoes),
+    ('colunas_derivadas', _colunas_derivadas),
+    ('resetar_indice', _resetar_indice)
+]
+
+@instrumentar
+def limpar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Função com as regras de limpeza aplicadas ao DataFrame bruto lido do CSV.
+    O DataFrame recebido é alterado (remoção de nulos in-place).
+
+    As regras são as etapas de ETAPAS_LIMPEZA, aplicadas em ordem.
+
+    Args:
+        df (pd.DataFrame): DataFrame bruto (lido com na_values=NA_FORMATS e dtype=TIPOS_CSV)
+
+    Returns:
+        pd.DataFrame: DataFrame limpo
+
+    Raises:
+        KeyError: Se alguma coluna obrigatória não existir no DataFrame.
+
+    Exemplo de uso:
+        df_limpo = limpar_dataframe(pd.read_csv(path, na_values=NA_FORMATS, dtype=TIPOS_CSV))
+    """
+
+    inicio = time.perf_counter()
+    linhas_inicio = len(df)
+    tempos = []
+
+    for nome, etapa in ETAPAS_LIMPEZA:
+        inicio_etapa = time.perf_counter()
+        linhas_antes = len(df)
+
+        df = etapa(df)
+
+        decorrido = time.perf_counter() - inicio_etapa
+        tempos.append(f"{nome} {decorrido * 1000:.0f} ms")
+        logger.debug(f"Etapa {nome}: {decorrido:.3f}s, {linhas_antes} -> {len(df)} linhas.")
+
+    logger.info(
+        f"Limpeza de {linhas_inicio} -> {len(df)} linhas em {time.perf_counter() - inicio:.3f}s "
+        f"({', '.join(tempos)})."
+    )
+
+    return df
+
+@instrumentar
+def df_cleaning(
+    path: str,
+    df_clean: bool = True,
+    usar_snapshot: bool = True,
+    reduzir_memoria: bool | None = None) -> pd.DataFrame | None:
     """
     Função para carregar e limpar um DataFrame a partir de um arquivo CSV.
     Limpeza inclui remoção de nulos, ajuste de tipos de dados, remoção de espaços em branco,
-    e tratamento específico de colunas.
+    tratamento específico de colunas e cálculo da coluna derivada 'Distance' (km).
+
+    O resultado limpo é persistido em um snapshot Parquet (ver src.snapshot). Enquanto
+    o CSV e a versão da limpeza não mudarem, as próximas cargas leem o snapshot direto.
+    A cópia em memória compartilhada pelas páginas fica em src.dataset_store.
+
+    No modo de orçamento de memória, as colunas numéricas são reduzidas ao menor
+    tipo que comporta seus valores (ver reduzir_tipos). O snapshot continua com
+    os tipos completos; a redução é aplicada depois da leitura.
 
     Args:
         path (str): Caminho para o arquivo CSV.
         df_clean (bool): Se True, aplica a limpeza no DataFrame. Se False, retorna o DataFrame bruto.
+        usar_snapshot (bool): Se True, lê/grava o snapshot Parquet do dataset limpo.
+        reduzir_memoria (bool | None): Se True, reduz os tipos numéricos do dataset limpo
+            (padrão: MEMORIA_REDUZIDA, variável de ambiente CURRY_MEMORIA_REDUZIDA).
     Returns:
         pd.DataFrame: DataFrame limpo ou bruto dependendo do parâmetro df_clean.
     Raises:
@@ -38,47 +461,34 @@ def df_cleaning(path: str, df_clean: bool = True) -> pd.DataFrame | None:
         raise FileNotFoundError(f"Arquivo não encontrado: {path}")
 
     try:
-        # O Pandas vai ler "NaN " (com espaço) e "conditions NaN" automaticamente como dados nulos.
-        na_formats = ["NaN ", "NaN", "conditions NaN"]
-        df = pd.read_csv(path, na_values=na_formats)
+        inicio = time.perf_counter()
+        reduzir_memoria = MEMORIA_REDUZIDA if reduzir_memoria is None else reduzir_memoria
+
+        if df_clean and usar_snapshot:
+            chave = chave_snapshot(path, VERSAO_LIMPEZA)
+            df = ler_snapshot(path, chave)
+
+            if df is not None:
+                # O Parquet não preserva Categorical de inteiros (ex.: 'Vehicle_condition')
+                df = converter_categorias(df)
+                if reduzir_memoria:
+                    df, _ = reduzir_tipos(df)
+                logger.info(f"Dataset carregado do snapshot em {time.perf_counter() - inicio:.3f}s ({len(df)} linhas).")
+                return df
+
+        df = pd.read_csv(path, na_values=NA_FORMATS, dtype=TIPOS_CSV)
 
         if not df_clean:
             return df
 
-        # --- INÍCIO DA LIMPEZA ---
-        
-        # 1. Remoção de Nulos (Substitui as 7 linhas de filtros manuais)
-        # Removemos linhas onde qualquer coluna essencial tenha virado NaN na leitura
-        df.dropna(inplace=True)
-
-        # 2. Limpeza de Espaços em Branco (Strip) em massa
-        # Seleciona apenas colunas do tipo 'object' (texto) e remove espaços das pontas
-        cols_texto = df.select_dtypes(include=['object']).columns
-        df[cols_texto] = df[cols_texto].apply(lambda x: x.str.strip())
-
-        # 3. Ajuste de Tipos Numéricos
-        # Usamos o dicionário para organizar a conversão
-        df = df.astype({
-            'Delivery_person_Age': int,
-            'multiple_deliveries': int,
-            'Delivery_person_Ratings': float
-        })
+        df = limpar_dataframe(df)
+        logger.info(f"Dataset carregado do CSV em {time.perf_counter() - inicio:.3f}s ({len(df)} linhas).")
+
+        if usar_snapshot:
+            salvar_snapshot(df, path, chave)
 
-        # 5. Tratamento de Datas
-        df['Order_Date'] = pd.to_datetime(df['Order_Date'], format='%d-%m-%Y')
-        df['Week_of_Year'] = df['Order_Date'].dt.isocalendar().week
-
-        # 6. Limpeza Específica (Regex e Replace)
-        
-        # Remove '(min) ' e converte para int
-        # Regex: pega apenas os dígitos (\d+)
-        df['Time_taken(min)'] = df['Time_taken(min)'].astype(str).str.extract(r'(\d+)').astype(int)
-
-        # Remove a palavra 'conditions ' de qualquer clima (mais genérico que o dicionário)
-        df['Weatherconditions'] = df['Weatherconditions'].str.replace('conditions ', '', regex=False)
-        
-        # Resetar o index após a remoção de linhas é boa prática
-        df.reset_index(drop=True, inplace=True)
+        if reduzir_memoria:
+            df, _ = reduzir_tipos(df)
 
         return df
 
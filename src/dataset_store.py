@@ -0,0 +1,312 @@
+"""
+Docstring para src.dataset_store
+
+Armazenamento do dataset compartilhado por todas as páginas e sessões do processo.
+
+Para cada origem de dados é mantida uma única entrada somente leitura com o
+dataset limpo, o índice de filtros, o cubo de métricas e os índices espaciais
+(restaurantes e locais de entrega) da versão atual do arquivo. As sessões
+recebem visões rasas (sem cópia dos dados) do dataset; com o copy-on-write do
+pandas ativo, qualquer alteração feita por uma página gera uma cópia local e
+nunca atinge a entrada compartilhada. O módulo não altera as opções do pandas:
+o copy-on-write é ativado pelos pontos de entrada do app (Home.py e pages/) e
+pelos testes; sem ele, visao() devolve uma cópia completa.
+
+A origem pode ser o CSV bruto ou o diretório do dataset incremental
+(src.ingestao): neste caso as partições já limpas e o cubo mantido pela
+ingestão são lidos direto, sem limpar o CSV de novo. caminho_dados() escolhe o
+dataset incremental sempre que algo já foi ingerido.
+
+A versão dos dados é derivada do tamanho e da data de modificação do arquivo
+(ou do manifesto da ingestão) e da versão das regras de limpeza (e dos modos de
+orçamento de memória, que altera os tipos numéricos, e de contagem aproximada
+de entregadores, que altera o cubo); quando ela muda, a entrada é recarregada
+na próxima chamada. invalidar() força o recarregamento.
+"""
+
+import logging
+import os
+import threading
+import time
+import pandas as pd
+from dataclasses import dataclass
+
+from src.cube import Cubo, construir_cubo
+from src.data_cleaning import MEMORIA_REDUZIDA, VERSAO_LIMPEZA, df_cleaning, reduzir_tipos
+from src.filter_engine import IndiceFiltros
+from src.hyperloglog import DISTINTOS_APROXIMADOS, construir_esbocos
+from src.ingestao import DATASET_DIR, carregar_cubo_incremental, carregar_dataset_incremental, ler_manifesto
+from src.memo import registrar_quadro, tamanho_bytes
+from src.snapshot import snapshot_atual
+from src.spatial_index import IndiceEspacial
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class EntradaDataset:
+    """
+    Versão carregada de um arquivo de dados, compartilhada entre as sessões.
+
+    Attributes:
+        caminho (str): Caminho do arquivo CSV ou do diretório do dataset incremental
+        versao (str): Versão dos dados (ver versao_dados)
+        df (pd.DataFrame): Dataset limpo (não deve ser alterado; use visao())
+        indice (IndiceFiltros): Índice de filtros do dataset
+        cubo (Cubo): Cubo de métricas do dataset
+        espacial_entregas (IndiceEspacial): Índice em grade dos locais de entrega
+        espacial_restaurantes (IndiceEspacial): Índice em grade dos restaurantes
+        bytes_df (int): Memória ocupada pelo dataset
+        bytes_indice (int): Memória ocupada pelos bitmaps do índice
+        bytes_cubo (int): Memória ocupada pelo cubo (com os esboços, se houver)
+        bytes_espacial (int): Memória ocupada pelos índices espaciais
+        carregado_em (float): Instante da carga (time.time())
+    """
+
+    caminho: str
+    versao: str
+    df: pd.DataFrame
+    indice: IndiceFiltros
+    cubo: Cubo
+    espacial_entregas: IndiceEspacial
+    espacial_restaurantes: IndiceEspacial
+    bytes_df: int
+    bytes_indice: int
+    bytes_cubo: int
+    bytes_espacial: int
+    carregado_em: float
+
+    @property
+    def bytes_residentes(self) -> int:
+        return self.bytes_df + self.bytes_indice + self.bytes_cubo + self.bytes_espacial
+
+    def visao(self) -> pd.DataFrame:
+        """
+        Função para obter uma visão do dataset sem copiar os dados.
+
+        Returns:
+            pd.DataFrame: Cópia rasa do dataset (os dados só são copiados se forem
+            alterados); sem copy-on-write ativo, uma cópia completa
+        """
+
+        rasa = pd.get_option('mode.copy_on_write') is True
+        return registrar_quadro(self.df.copy(deep=not rasa), (self.versao, 'df'))
+
+# Entradas por caminho absoluto da origem
+_ENTRADAS: dict[str, EntradaDataset] = {}
+_TRAVA = threading.Lock()
+
+def caminho_dados(path_csv: str, dataset_dir: str = DATASET_DIR) -> str:
+    """
+    Função para escolher a origem dos dados das páginas.
+
+    Args:
+        path_csv (str): Caminho do CSV bruto
+        dataset_dir (str): Diretório do dataset incremental
+
+    Returns:
+        str: dataset_dir, se a ingestão incremental já gerou um cubo; senão path_csv
+
+    Example:
+        dados = obter_dataset(caminho_dados(str(DATA_PATH)))
+    """
+
+    try:
+        if ler_manifesto(dataset_dir)['cubo'] is not None:
+            return dataset_dir
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Manifesto da ingestão ilegível, usando o CSV: {e}")
+
+    return path_csv
+
+def versao_dados(path: str) -> str:
+    """
+    Função para calcular a versão dos dados de um arquivo (ou dataset incremental) sem lê-lo.
+
+    Args:
+        path (str): Caminho do arquivo de dados ou do diretório do dataset incremental
+
+    Returns:
+        str: '<tamanho>-<mtime_ns>-v<VERSAO_LIMPEZA>' (com o sufixo '-incremental' para o dataset
+            incremental, '-reduzida' no modo de orçamento de memória e '-hll' no modo de
+            contagem aproximada de entregadores)
+    """
+
+    # O manifesto é regravado a cada ingestão: sua data de modificação versiona o dataset inteiro
+    incremental = os.path.isdir(path)
+    estado = os.stat(os.path.join(path, 'manifest.json') if incremental else path)
+
+    sufixo = '-incremental' if incremental else ''
+    sufixo += '-reduzida' if MEMORIA_REDUZIDA else ''
+    sufixo += '-hll' if DISTINTOS_APROXIMADOS else ''
+
+    return f"{estado.st_size}-{estado.st_mtime_ns}-v{VERSAO_LIMPEZA}{sufixo}"
+
+def _tamanho_indice(indice: IndiceFiltros) -> int:
+    bitmaps = [bitmap for valores in indice.bitmaps.values() for bitmap in valores.values()]
+    bitmaps += list(indice.bitmaps_datas)
+
+    return sum(bitmap.nbytes for bitmap in bitmaps) + indice.datas.nbytes
+
+def _carregar_incremental(dataset_dir: str) -> tuple[pd.DataFrame | None, Cubo | None]:
+    df = carregar_dataset_incremental(dataset_dir)
+    cubo = carregar_cubo_incremental(dataset_dir)
+
+    if df is None or cubo is None:
+        return None, None
+
+    if MEMORIA_REDUZIDA:
+        df, _ = reduzir_tipos(df)
+
+    # O cubo foi gravado no modo da ingestão: acerta os esboços para o modo atual
+    if DISTINTOS_APROXIMADOS and cubo.esbocos is None:
+        cubo = Cubo(cubo.dados, construir_esbocos(df))
+    elif not DISTINTOS_APROXIMADOS and cubo.esbocos is not None:
+        cubo = Cubo(cubo.dados)
+
+    return df, cubo
+
+def _carregar(path: str, versao: str) -> EntradaDataset | None:
+    inicio = time.perf_counter()
+
+    if os.path.isdir(path):
+        df, cubo = _carregar_incremental(path)
+    else:
+        df = df_cleaning(path, df_clean=True)
+
+        # DuckDB e Polars agregam o cubo direto do snapshot recém lido ou gravado. No modo de
+        # orçamento de memória o snapshot tem tipos diferentes do Dataframe, que é usado no lugar
+        parquet = snapshot_atual(path, VERSAO_LIMPEZA) if not MEMORIA_REDUZIDA else None
+        cubo = construir_cubo(df, parquet=parquet) if df is not None else None
+
+    if df is None:
+        return None
+
+    indice = IndiceFiltros(df)
+    espacial_entregas = IndiceEspacial(
+        df, 'Delivery_location_latitude', 'Delivery_location_longitude', 'Time_taken(min)'
+    )
+    espacial_restaurantes = IndiceEspacial(df, 'Restaurant_latitude', 'Restaurant_longitude', 'Time_taken(min)')
+
+    # Chaves de conteúdo para a memoização (src.memo): o dataset, o índice e o cubo desta versão
+    registrar_quadro(df, (versao, 'df'))
+    registrar_quadro(indice, (versao, 'indice'))
+    registrar_quadro(cubo, (versao, 'cubo'))
+
+    entrada = EntradaDataset(
+        caminho=path,
+        versao=versao,
+        df=df,
+        indice=indice,
+        cubo=cubo,
+        espacial_entregas=espacial_entregas,
+        espacial_restaurantes=espacial_restaurantes,
+        bytes_df=int(df.memory_usage(deep=True).sum()),
+        bytes_indice=_tamanho_indice(indice),
+        bytes_cubo=tamanho_bytes(cubo),
+        bytes_espacial=espacial_entregas.nbytes + espacial_restaurantes.nbytes,
+        carregado_em=time.time()
+    )
+
+    logger.info(
+        f"Dataset {versao} carregado no armazenamento compartilhado em {time.perf_counter() - inicio:.3f}s: "
+        f"{len(df)} linhas, {entrada.bytes_residentes / 1024 ** 2:.1f} MB residentes."
+    )
+
+    return entrada
+
+def obter_dataset(path: str) -> EntradaDataset | None:
+    """
+    Função para obter a entrada compartilhada da versão atual de uma origem de dados.
+
+    A primeira chamada (ou a primeira após uma mudança de versão) carrega o
+    dataset, o índice de filtros, o cubo e os índices espaciais; as demais devolvem a mesma entrada.
+    Sessões concorrentes esperam a carga em andamento em vez de repeti-la.
+
+    Args:
+        path (str): Caminho do arquivo CSV de origem ou do diretório do dataset incremental
+
+    Returns:
+        EntradaDataset | None: Entrada compartilhada, ou None se os dados não puderem ser carregados
+
+    Example:
+        dados = obter_dataset(caminho_dados(str(DATA_PATH)))
+        df = dados.visao()
+    """
+
+    path = os.path.abspath(path)
+
+    try:
+        versao = versao_dados(path)
+    except OSError as e:
+        logger.error(f"Arquivo de dados inacessível: {e}")
+        return None
+
+    entrada = _ENTRADAS.get(path)
+    if entrada is not None and entrada.versao == versao:
+        return entrada
+
+    with _TRAVA:
+        # Outra sessão pode ter carregado enquanto esta esperava a trava
+        entrada = _ENTRADAS.get(path)
+        if entrada is not None and entrada.versao == versao:
+            return entrada
+
+        if entrada is not None:
+            logger.info(f"Versão dos dados mudou ({entrada.versao} -> {versao}); recarregando {path}.")
+
+        nova = _carregar(path, versao)
+
+        if nova is None:
+            return None
+
+        _ENTRADAS[path] = nova
+
+    return nova
+
+def invalidar(path: str | None = None) -> None:
+    """
+    Função para descartar entradas do armazenamento, forçando o recarregamento na próxima chamada.
+
+    Args:
+        path (str | None): Arquivo a ser descartado; None descarta todos
+    """
+
+    with _TRAVA:
+        if path is None:
+            _ENTRADAS.clear()
+        else:
+            _ENTRADAS.pop(os.path.abspath(path), None)
+
+    logger.info(f"Armazenamento de datasets invalidado ({path or 'todos'}).")
+
+def relatorio_armazenamento() -> pd.DataFrame:
+    """
+    Função para gerar um relatório da memória residente do armazenamento compartilhado.
+
+    Returns:
+        pd.DataFrame: Uma linha por entrada com as colunas 'Caminho', 'Versao', 'Linhas',
+            'MB_dataset', 'MB_indice', 'MB_cubo', 'MB_espacial' e 'MB_total'
+
+    Example:
+        st.dataframe(relatorio_armazenamento())
+    """
+
+    linhas = [
+        {
+            'Caminho': entrada.caminho,
+            'Versao': entrada.versao,
+            'Linhas': len(entrada.df),
+            'MB_dataset': entrada.bytes_df / 1024 ** 2,
+            'MB_indice': entrada.bytes_indice / 1024 ** 2,
+            'MB_cubo': entrada.bytes_cubo / 1024 ** 2,
+            'MB_espacial': entrada.bytes_espacial / 1024 ** 2,
+            'MB_total': entrada.bytes_residentes / 1024 ** 2
+        }
+        for entrada in list(_ENTRADAS.values())
+    ]
+
+    return pd.DataFrame(
+        linhas,
+        columns=['Caminho', 'Versao', 'Linhas', 'MB_dataset', 'MB_indice', 'MB_cubo', 'MB_espacial', 'MB_total']
+    )
@@ -0,0 +1,150 @@
+"""
+Docstring para src.figuras
+
+Serialização em cache dos gráficos Plotly.
+
+Para o mesmo estado dos filtros, o JSON de um gráfico é sempre o mesmo. Em
+vez de agregar os dados e montar a figura com plotly.express a cada rerun, a
+figura é serializada uma vez (os arrays numéricos vão como binário em base64,
+formato padrão do Plotly 6). Nas exibições seguintes, a figura é reconstruída
+a partir desse JSON (sem plotly.express e sem pandas) e exibida pelo
+st.plotly_chart.
+
+O custo de CPU de cada serialização, o tempo de cada exibição (reconstrução
+da figura e nova serialização pelo st.plotly_chart) e o tamanho do JSON em
+cache são acumulados em METRICAS_FIGURAS (ver relatorio_figuras). O tamanho
+do JSON é uma aproximação do que vai ao navegador: o st.plotly_chart gera o
+próprio payload, que não é medido aqui.
+"""
+
+import logging
+import threading
+import time
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from dataclasses import dataclass
+from typing import Callable
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class FiguraSerializada:
+    """
+    Gráfico Plotly já serializado para envio ao navegador.
+
+    Attributes:
+        nome (str): Nome do gráfico (usado nas métricas)
+        spec (str): JSON da figura
+        altura (int | None): Altura definida no layout da figura, se houver
+        cpu_s (float): Tempo de CPU gasto para montar e serializar a figura
+    """
+
+    nome: str
+    spec: str
+    altura: int | None
+    cpu_s: float
+
+    @property
+    def bytes(self) -> int:
+        return len(self.spec.encode('utf-8'))
+
+# Métricas por gráfico: serializações, CPU, exibições, tempo de exibição e tamanho do JSON em cache
+METRICAS_FIGURAS: dict[str, dict] = {}
+_TRAVA = threading.Lock()
+
+def _registrar(nome: str, **incrementos) -> None:
+    with _TRAVA:
+        metricas = METRICAS_FIGURAS.setdefault(
+            nome, {'serializacoes': 0, 'cpu_s': 0.0, 'exibicoes': 0, 'exibicao_s': 0.0, 'bytes_exibidos': 0, 'bytes': 0}
+        )
+        for campo, valor in incrementos.items():
+            if campo == 'bytes':
+                metricas[campo] = valor
+            else:
+                metricas[campo] += valor
+
+def figura_serializada(func: Callable, *args, **kwargs) -> FiguraSerializada:
+    """
+    Função para montar um gráfico e serializá-lo, medindo o tempo de CPU.
+
+    Args:
+        func (Callable): Função que devolve uma figura Plotly (ex.: pedidos_por_dia)
+        *args: Argumentos de func
+        **kwargs: Argumentos nomeados de func
+
+    Returns:
+        FiguraSerializada: Figura pronta para exibir_figura
+
+    Example:
+        figura = figura_serializada(pedidos_por_dia, cubo)
+    """
+
+    inicio = time.process_time()
+
+    fig = func(*args, **kwargs)
+    spec = pio.to_json(fig, validate=False)
+    altura = fig.layout.height
+
+    figura = FiguraSerializada(
+        nome=func.__name__,
+        spec=spec,
+        altura=int(altura) if altura else None,
+        cpu_s=time.process_time() - inicio
+    )
+    _registrar(figura.nome, serializacoes=1, cpu_s=figura.cpu_s, bytes=figura.bytes)
+
+    return figura
+
+def exibir_figura(figura: FiguraSerializada, width: str | int = 'stretch') -> None:
+    """
+    Função para exibir um gráfico já serializado, sem agregar os dados nem montá-lo de novo com plotly.express.
+
+    O tempo da exibição (reconstrução da figura e serialização pelo
+    st.plotly_chart) é registrado em METRICAS_FIGURAS.
+
+    Args:
+        figura (FiguraSerializada): Saída de figura_serializada (ou de MemoVisao.figura)
+        width (str | int): Largura, como em st.plotly_chart
+    """
+
+    inicio = time.perf_counter()
+
+    st.plotly_chart(pio.from_json(figura.spec), width=width)
+
+    _registrar(
+        figura.nome, exibicoes=1, exibicao_s=time.perf_counter() - inicio, bytes_exibidos=figura.bytes
+    )
+
+    return None
+
+def relatorio_figuras() -> pd.DataFrame:
+    """
+    Função para resumir o custo de cada gráfico: CPU por serialização, tempo por exibição e tamanho do JSON.
+
+    Returns:
+        pd.DataFrame: Uma linha por gráfico com as colunas 'Grafico', 'Serializacoes',
+            'CPU_ms_medio' (serialização), 'KB' (JSON em cache), 'Exibicoes', 'Exibicao_ms_media'
+            e 'KB_spec_exibidos' (tamanho do JSON em cache vezes as exibições, não o payload
+            gerado pelo st.plotly_chart)
+    """
+
+    with _TRAVA:
+        linhas = [
+            {
+                'Grafico': nome,
+                'Serializacoes': m['serializacoes'],
+                'CPU_ms_medio': 1000 * m['cpu_s'] / m['serializacoes'] if m['serializacoes'] else 0.0,
+                'KB': m['bytes'] / 1024,
+                'Exibicoes': m['exibicoes'],
+                'Exibicao_ms_media': 1000 * m['exibicao_s'] / m['exibicoes'] if m['exibicoes'] else 0.0,
+                'KB_spec_exibidos': m['bytes_exibidos'] / 1024
+            }
+            for nome, m in METRICAS_FIGURAS.items()
+        ]
+
+    return pd.DataFrame(
+        linhas,
+        columns=['Grafico', 'Serializacoes', 'CPU_ms_medio', 'KB', 'Exibicoes', 'Exibicao_ms_media', 'KB_spec_exibidos']
+    )
@@ -0,0 +1,181 @@
+"""
+Docstring para src.filter_engine
+
+Motor de filtros baseado em bitmaps para a barra lateral.
+
+Para cada valor de cada dimensão filtrável (trânsito, clima, cidade e data do
+pedido) é pré-computado, na carga dos dados, um bitmap compactado (1 bit por
+linha). Aplicar os filtros se resume a operações OR/AND sobre esses bitmaps,
+pulando as dimensões em que todos os valores estão selecionados, e o
+DataFrame resultante é materializado no máximo uma vez.
+
+O índice só vale para o DataFrame (ou visões rasas dele) sobre o qual foi
+construído: IndiceFiltros.pertence compara o buffer da coluna 'Order_Date',
+então um DataFrame reordenado ou de outra versão dos dados, mesmo com o mesmo
+número de linhas, não usa posições erradas.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Dimensões categóricas filtradas pela barra lateral
+DIMENSOES_FILTRO = ['Road_traffic_density', 'Weatherconditions', 'City']
+
+class IndiceFiltros:
+    """
+    Índice de bitmaps (um por valor de dimensão) de um DataFrame limpo.
+
+    Attributes:
+        n_linhas (int): Número de linhas do DataFrame indexado
+        vazio (np.ndarray): Bitmap compactado sem nenhuma linha selecionada
+        bitmaps (dict): {dimensão: {valor: bitmap compactado (np.uint8)}}
+        datas (np.ndarray): Datas distintas de 'Order_Date' em ordem crescente
+        bitmaps_datas (list): Bitmap compactado de cada data em `datas`
+        origem (np.ndarray): Coluna 'Order_Date' do DataFrame indexado (sem cópia), que
+            identifica os dados e a ordem das linhas (ver pertence)
+
+    Example:
+        indice = IndiceFiltros(df)
+        df_filtrado = filtros(df, date_slider, traffic, weather, cities, indice=indice)
+    """
+
+    def __init__(self, df: pd.DataFrame, dimensoes: list = DIMENSOES_FILTRO):
+        self.n_linhas = len(df)
+        self.origem = df['Order_Date'].to_numpy()
+        self.vazio = np.zeros((self.n_linhas + 7) // 8, dtype=np.uint8)
+        self.bitmaps = {dim: self._bitmaps_coluna(df[dim]) for dim in dimensoes}
+
+        codigos, datas = pd.factorize(df['Order_Date'], sort=True)
+        self.datas = datas.to_numpy()
+        self.bitmaps_datas = [np.packbits(codigos == i) for i in range(len(self.datas))]
+
+    @staticmethod
+    def _bitmaps_coluna(coluna: pd.Series) -> dict:
+        # Códigos inteiros: reaproveita o Categorical quando existir
+        if isinstance(coluna.dtype, pd.CategoricalDtype):
+            codigos, valores = coluna.cat.codes.to_numpy(), coluna.cat.categories
+        else:
+            codigos, valores = pd.factorize(coluna, sort=True)
+
+        bitmaps = {}
+        for i, valor in enumerate(valores):
+            selecionado = codigos == i
+
+            # Valores sem nenhuma linha não entram no índice
+            if selecionado.any():
+                bitmaps[valor] = np.packbits(selecionado)
+
+        return bitmaps
+
+    def _mascara_dimensao(self, dimensao: str, selecionados: list) -> np.ndarray | None:
+        bitmaps = self.bitmaps[dimensao]
+
+        # Todos os valores presentes foram selecionados: a dimensão não filtra nada
+        if set(bitmaps).issubset(selecionados):
+            return None
+
+        escolhidos = [bitmaps[valor] for valor in selecionados if valor in bitmaps]
+        if not escolhidos:
+            return self.vazio
+
+        return np.bitwise_or.reduce(escolhidos)
+
+    def _mascara_datas(self, date_slider: tuple) -> np.ndarray | None:
+        inicio, fim = np.datetime64(date_slider[0]), np.datetime64(date_slider[1])
+        dentro = (self.datas >= inicio) & (self.datas <= fim)
+
+        # Intervalo cobre todas as datas do dataset
+        if dentro.all():
+            return None
+
+        escolhidos = [bitmap for bitmap, ok in zip(self.bitmaps_datas, dentro) if ok]
+        if not escolhidos:
+            return self.vazio
+
+        return np.bitwise_or.reduce(escolhidos)
+
+    @staticmethod
+    def _buffer(valores: np.ndarray) -> tuple:
+        return valores.__array_interface__['data'][0], valores.strides, len(valores)
+
+    def pertence(self, df: pd.DataFrame) -> bool:
+        """
+        Método para verificar se o índice foi construído sobre as linhas de df, na mesma ordem.
+
+        Visões rasas (copy(deep=False)) compartilham o buffer das colunas e são
+        aceitas; cópias, reordenações e recortes não. O índice mantém a coluna de
+        origem viva, então o endereço do buffer não pode ser reaproveitado por outro DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame a ser filtrado
+
+        Returns:
+            bool: True se as posições do índice valem para df
+        """
+
+        if len(df) != self.n_linhas:
+            return False
+
+        return self._buffer(df['Order_Date'].to_numpy()) == self._buffer(self.origem)
+
+    def posicoes(
+        self,
+        date_slider: tuple,
+        traffic_options: list,
+        weather_cond: list,
+        cities: list) -> np.ndarray | None:
+        """
+        Método para calcular as posições das linhas que atendem aos filtros.
+
+        Args:
+            date_slider (tuple): Tupla com as datas (início, fim), inclusivas
+            traffic_options (list): Lista com condições de transito
+            weather_cond (list): Lista com condições climáticas
+            cities (list): Lista com as cidades
+
+        Returns:
+            np.ndarray | None: Posições (iloc) selecionadas, ou None se nenhum filtro restringir as linhas
+        """
+
+        mascaras = [
+            self._mascara_datas(date_slider),
+            self._mascara_dimensao('Road_traffic_density', traffic_options),
+            self._mascara_dimensao('Weatherconditions', weather_cond),
+            self._mascara_dimensao('City', cities)
+        ]
+        mascaras = [mascara for mascara in mascaras if mascara is not None]
+
+        if not mascaras:
+            return None
+
+        mascara = np.bitwise_and.reduce(mascaras)
+
+        return np.flatnonzero(np.unpackbits(mascara, count=self.n_linhas))
+
+def obter_indice(path: str) -> IndiceFiltros | None:
+    """
+    Função para obter o índice de filtros da versão atual do dataset.
+
+    O índice é construído uma vez por versão dos dados e compartilhado entre
+    as sessões (ver src.dataset_store).
+
+    Args:
+        path (str): Caminho para o arquivo CSV de origem
+
+    Returns:
+        IndiceFiltros | None: Índice de bitmaps, ou None se os dados não puderem ser carregados
+
+    Example:
+        indice = obter_indice(str(DATA_PATH))
+    """
+
+    # Import local: src.dataset_store depende deste módulo
+    from src.dataset_store import obter_dataset
+
+    dados = obter_dataset(path)
+
+    return None if dados is None else dados.indice
@@ -0,0 +1,268 @@
+"""
+Docstring para src.hyperloglog
+
+Contagem aproximada de valores distintos (HyperLogLog) por célula de filtros.
+
+Para cada combinação de dia e das dimensões filtráveis pela barra lateral
+(DIMENSOES_ESBOCO) é guardado um esboço HyperLogLog dos entregadores: 2^precisao
+registradores de 1 byte. Esboços se combinam pelo máximo registrador a
+registrador, então a quantidade de entregadores distintos de qualquer semana,
+intervalo de datas ou seleção de filtros sai da combinação dos esboços das
+células selecionadas, sem reler os pedidos.
+
+Com a precisão padrão (10, 1 KB por célula), o erro padrão da estimativa é de
+cerca de 3% (1,04 / sqrt(2^precisao)); para poucos distintos, a correção de
+contagem linear deixa o erro bem menor.
+"""
+
+import logging
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from src.data_cleaning import unificar_categorias
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Dimensões das células dos esboços: o dia e os filtros da barra lateral
+DIMENSOES_ESBOCO = ['Order_Date', 'City', 'Road_traffic_density', 'Weatherconditions']
+
+# Bits do hash usados para escolher o registrador (2^PRECISAO_HLL registradores por esboço)
+PRECISAO_HLL = 10
+
+# Modo aproximado: o cubo guarda os esboços e as contagens de entregadores distintos
+# saem deles. Desligado por padrão; CURRY_DISTINTOS_APROXIMADOS=1 liga.
+DISTINTOS_APROXIMADOS = os.environ.get('CURRY_DISTINTOS_APROXIMADOS', '0') == '1'
+
+@dataclass
+class EsbocosHLL:
+    """
+    Esboços HyperLogLog de uma coluna, um por célula de DIMENSOES_ESBOCO.
+
+    Attributes:
+        chaves (pd.DataFrame): Uma linha por célula com as colunas de DIMENSOES_ESBOCO
+            e 'Week_of_Year' (derivada de 'Order_Date')
+        registros (np.ndarray): Matriz uint8 (células x 2^precisao) com os registradores
+        precisao (int): Bits do hash usados para escolher o registrador
+    """
+
+    chaves: pd.DataFrame
+    registros: np.ndarray
+    precisao: int = PRECISAO_HLL
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.registros.nbytes + self.chaves.memory_usage(deep=True).sum())
+
+def hash_valores(serie: pd.Series) -> np.ndarray:
+    """
+    Função para calcular um hash de 64 bits, estável entre processos, para cada valor de uma Series.
+
+    Cada valor distinto é calculado uma única vez (poucos entregadores, muitos pedidos).
+
+    Args:
+        serie (pd.Series): Valores (nulos não devem estar presentes)
+
+    Returns:
+        np.ndarray: Hashes uint64, na ordem das linhas
+    """
+
+    codigos, unicos = pd.factorize(serie)
+    hashes = pd.util.hash_pandas_object(pd.Series(unicos), index=False).to_numpy()
+
+    return hashes[codigos]
+
+def _posicoes(hashes: np.ndarray, precisao: int) -> tuple[np.ndarray, np.ndarray]:
+    # Registrador (primeiros `precisao` bits) e posição do primeiro bit 1 nos 32 bits seguintes (1 a 33)
+    registrador = (hashes >> np.uint64(64 - precisao)).astype(np.int64)
+    resto = (hashes << np.uint64(precisao)) >> np.uint64(32)
+
+    # frexp devolve o número de bits do valor (exato: o resto cabe em 32 bits)
+    bits = np.frexp(resto.astype(np.float64))[1]
+
+    return registrador, (33 - bits).astype(np.uint8)
+
+def estimar_distintos(registros: np.ndarray) -> np.ndarray:
+    """
+    Função para estimar a quantidade de valores distintos de cada esboço.
+
+    Args:
+        registros (np.ndarray): Matriz (esboços x registradores) ou um único esboço
+
+    Returns:
+        np.ndarray: Estimativas (float64), uma por esboço
+    """
+
+    registros = np.atleast_2d(registros)
+    m = registros.shape[1]
+    alfa = 0.7213 / (1 + 1.079 / m)
+
+    estimativa = alfa * m * m / np.exp2(-registros.astype(np.float64)).sum(axis=1)
+
+    # Correção para poucos distintos: contagem linear pelos registradores zerados
+    zerados = (registros == 0).sum(axis=1)
+    linear = m * np.log(m / np.maximum(zerados, 1))
+    usar_linear = (estimativa <= 2.5 * m) & (zerados > 0)
+
+    return np.where(usar_linear, linear, estimativa)
+
+def _combinar_grupos(registros: np.ndarray, codigos: np.ndarray, n_grupos: int) -> np.ndarray:
+    # Máximo registrador a registrador das linhas de cada grupo (codigos de 0 a n_grupos - 1)
+    ordem = np.argsort(codigos, kind='stable')
+    inicios = np.searchsorted(codigos[ordem], np.arange(n_grupos))
+
+    return np.maximum.reduceat(registros[ordem], inicios, axis=0)
+
+def _com_semana(chaves: pd.DataFrame) -> pd.DataFrame:
+    chaves = chaves.copy()
+    chaves['Week_of_Year'] = chaves['Order_Date'].dt.isocalendar().week
+
+    return chaves
+
+def construir_esbocos(
+    df: pd.DataFrame,
+    coluna: str = 'Delivery_person_ID',
+    precisao: int = PRECISAO_HLL) -> EsbocosHLL:
+    """
+    Função para construir os esboços de uma coluna, em uma única passada pelos pedidos.
+
+    Args:
+        df (pd.DataFrame): Dataset limpo (saída de df_cleaning)
+        coluna (str): Coluna cujos valores distintos serão contados
+        precisao (int): Bits do hash usados para escolher o registrador (4 a 16)
+
+    Returns:
+        EsbocosHLL: Um esboço por célula de DIMENSOES_ESBOCO presente nos dados
+
+    Example:
+        esbocos = construir_esbocos(df)
+    """
+
+    if not 4 <= precisao <= 16:
+        raise ValueError(f"Precisão do HyperLogLog fora do intervalo 4-16: {precisao}")
+
+    df = df.loc[df[coluna].notna(), DIMENSOES_ESBOCO + [coluna]]
+    agrupado = df.groupby(DIMENSOES_ESBOCO, observed=True, sort=True)
+    celulas = agrupado.ngroup().to_numpy()
+    chaves = agrupado.size().index.to_frame(index=False)
+
+    registrador, posicao = _posicoes(hash_valores(df[coluna]), precisao)
+    validas = celulas >= 0
+
+    m = 2 ** precisao
+    registros = np.zeros(len(chaves) * m, dtype=np.uint8)
+    np.maximum.at(registros, celulas[validas] * m + registrador[validas], posicao[validas])
+
+    return EsbocosHLL(_com_semana(chaves), registros.reshape(len(chaves), m), precisao)
+
+def filtrar_esbocos(esbocos: EsbocosHLL, mascara: pd.Series | np.ndarray) -> EsbocosHLL:
+    """
+    Função para manter apenas os esboços das células selecionadas.
+
+    Args:
+        esbocos (EsbocosHLL): Esboços
+        mascara (pd.Series | np.ndarray): Seleção booleana, uma posição por célula
+
+    Returns:
+        EsbocosHLL: Esboços das células selecionadas
+    """
+
+    mascara = np.asarray(mascara, dtype=bool)
+
+    return EsbocosHLL(esbocos.chaves.loc[mascara, :], esbocos.registros[mascara], esbocos.precisao)
+
+def combinar_esbocos(lista: list) -> EsbocosHLL:
+    """
+    Função para combinar esboços de partes diferentes do dataset (ex.: blocos ou partições).
+
+    Células iguais são unidas pelo máximo registrador a registrador, de modo que
+    o resultado é o mesmo de construir os esboços sobre todas as partes juntas.
+
+    Args:
+        lista (list): Lista de EsbocosHLL com a mesma precisão
+
+    Returns:
+        EsbocosHLL: Esboços combinados
+    """
+
+    precisoes = {esbocos.precisao for esbocos in lista}
+    if len(precisoes) != 1:
+        raise ValueError(f"Esboços com precisões diferentes não podem ser combinados: {sorted(precisoes)}")
+
+    chaves = pd.concat(
+        unificar_categorias([esbocos.chaves.loc[:, DIMENSOES_ESBOCO] for esbocos in lista]), ignore_index=True
+    )
+    registros = np.concatenate([esbocos.registros for esbocos in lista])
+
+    agrupado = chaves.groupby(DIMENSOES_ESBOCO, observed=True, sort=True)
+    codigos = agrupado.ngroup().to_numpy()
+    chaves = agrupado.size().index.to_frame(index=False)
+
+    return EsbocosHLL(_com_semana(chaves), _combinar_grupos(registros, codigos, len(chaves)), precisoes.pop())
+
+def distintos_por(esbocos: EsbocosHLL, por: list) -> pd.DataFrame:
+    """
+    Função para estimar os valores distintos por grupo, combinando os esboços das células de cada grupo.
+
+    Args:
+        esbocos (EsbocosHLL): Esboços (já filtrados)
+        por (list): Colunas de agrupamento de esbocos.chaves (lista vazia estima o total)
+
+    Returns:
+        pd.DataFrame: Colunas de `por` e 'Distintos' (estimativa arredondada)
+
+    Example:
+        df_aux = distintos_por(cubo.esbocos, ['Week_of_Year'])
+    """
+
+    if esbocos.registros.shape[0] == 0:
+        return pd.DataFrame(columns=por + ['Distintos'])
+
+    if not por:
+        estimativa = estimar_distintos(esbocos.registros.max(axis=0))
+        return pd.DataFrame({'Distintos': np.round(estimativa).astype('int64')})
+
+    agrupado = esbocos.chaves.groupby(por, observed=True, sort=True)
+    codigos = agrupado.ngroup().to_numpy()
+    df_aux = agrupado.size().index.to_frame(index=False)
+
+    registros = _combinar_grupos(esbocos.registros, codigos, len(df_aux))
+    df_aux['Distintos'] = np.round(estimar_distintos(registros)).astype('int64')
+
+    return df_aux
+
+def salvar_esbocos(esbocos: EsbocosHLL, path: str) -> None:
+    """
+    Função para gravar os esboços em Parquet (uma linha por célula, registradores em binário).
+
+    Args:
+        esbocos (EsbocosHLL): Esboços
+        path (str): Arquivo de destino
+    """
+
+    df_aux = esbocos.chaves.loc[:, DIMENSOES_ESBOCO].reset_index(drop=True)
+    df_aux['Registros'] = [linha.tobytes() for linha in esbocos.registros]
+    df_aux.to_parquet(path, index=False)
+
+def ler_esbocos(path: str) -> EsbocosHLL:
+    """
+    Função para ler os esboços gravados por salvar_esbocos.
+
+    Args:
+        path (str): Arquivo Parquet
+
+    Returns:
+        EsbocosHLL: Esboços
+    """
+
+    df_aux = pd.read_parquet(path)
+    registros = np.frombuffer(b''.join(df_aux.pop('Registros')), dtype=np.uint8)
+    m = registros.size // max(len(df_aux), 1)
+
+    return EsbocosHLL(
+        _com_semana(df_aux),
+        registros.reshape(len(df_aux), m).copy(),
+        int(np.log2(m)) if len(df_aux) else PRECISAO_HLL
+    )
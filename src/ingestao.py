@@ -0,0 +1,515 @@
+"""
+Docstring para src.ingestao
+
+Ingestão do dataset em blocos e ingestão incremental de novas partições.
+
+- Em blocos: o CSV é lido em blocos de tamanho limitado (calculado a partir de
+  um orçamento de memória), cada bloco passa pelas mesmas regras de limpeza de
+  df_cleaning (limpar_dataframe) e o resultado é gravado incrementalmente em
+  Parquet e/ou acumulado no cubo de métricas.
+- Incremental: arquivos de pedidos (diários/semanais) colocados em um diretório
+  de entrada são limpos uma única vez, gravados como partições Parquet e somados
+  ao cubo de métricas armazenado. Um manifesto com o checksum de cada arquivo
+  torna o processo idempotente.
+- Paralela: vários arquivos (um diretório ou um padrão glob, ex.: um CSV por
+  região ou por mês) são limpos ao mesmo tempo, um por processo, e unidos na
+  ordem dos nomes. Um arquivo com erro é registrado no log e ignorado.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dataclasses import dataclass
+
+from src.cube import Cubo, caminho_esbocos, combinar_cubos, construir_cubo, ler_cubo, salvar_cubo
+from src.data_cleaning import (
+    NA_FORMATS, TIPOS_CSV, converter_categorias, df_cleaning, limpar_dataframe, unificar_categorias
+)
+from src.log_config import setup_logging
+from src.snapshot import hash_arquivo
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Diretórios padrão da ingestão incremental (raiz do projeto -> data/...)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+LANDING_DIR = os.path.join(DATA_DIR, 'landing')
+DATASET_DIR = os.path.join(DATA_DIR, 'processed', 'dataset')
+
+# Quantas vezes o tamanho de um bloco bruto fica em memória no pico da limpeza
+# (bloco bruto + cópias intermediárias das etapas de limpeza)
+FATOR_PICO_LIMPEZA = 4
+
+@dataclass
+class ResultadoIngestao:
+    """
+    Resumo de uma ingestão em blocos.
+
+    Attributes:
+        destino (str | None): Caminho do Parquet gravado (None se não houve gravação)
+        linhas (int): Total de linhas limpas
+        blocos (int): Quantidade de blocos lidos
+        cubo (Cubo | None): Cubo de métricas acumulado (None se não solicitado)
+    """
+
+    destino: str | None
+    linhas: int
+    blocos: int
+    cubo: Cubo | None
+
+def linhas_por_bloco(path: str, orcamento_mb: float, amostra: int = 1000) -> int:
+    """
+    Função para estimar quantas linhas cabem em um bloco dentro do orçamento de memória.
+
+    A estimativa usa o tamanho médio (em memória) das primeiras linhas do CSV.
+
+    Args:
+        path (str): Caminho para o arquivo CSV
+        orcamento_mb (float): Memória máxima para processar um bloco, em MB
+        amostra (int): Quantidade de linhas usadas na estimativa
+
+    Returns:
+        int: Quantidade de linhas por bloco (no mínimo 1)
+    """
+
+    df_amostra = pd.read_csv(path, na_values=NA_FORMATS, dtype=TIPOS_CSV, nrows=amostra)
+
+    if df_amostra.empty:
+        return amostra
+
+    bytes_linha = df_amostra.memory_usage(index=False, deep=True).sum() / len(df_amostra)
+
+    return max(1, int(orcamento_mb * 2**20 / (bytes_linha * FATOR_PICO_LIMPEZA)))
+
+def ingerir_em_blocos(
+    path: str,
+    destino: str | None = None,
+    orcamento_mb: float = 256,
+    gerar_cubo: bool = True) -> ResultadoIngestao:
+    """
+    Função para limpar um CSV bloco a bloco, gravando em Parquet e/ou acumulando o cubo.
+
+    O resultado gravado é idêntico ao de df_cleaning (mesmas regras, tipos e índice);
+    use ler_parquet_limpo para carregá-lo.
+
+    Args:
+        path (str): Caminho para o arquivo CSV
+        destino (str | None): Caminho do Parquet de saída. Se None, nada é gravado.
+        orcamento_mb (float): Memória máxima para processar um bloco, em MB
+        gerar_cubo (bool): Se True, acumula o cubo de métricas dos blocos
+
+    Returns:
+        ResultadoIngestao: Resumo da ingestão com o cubo acumulado
+
+    Raises:
+        FileNotFoundError: Se o arquivo no caminho especificado não for encontrado.
+
+    Example:
+        resultado = ingerir_em_blocos('data/raw/train.csv', 'data/processed/train.parquet', orcamento_mb=128)
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    inicio = time.perf_counter()
+    tamanho_bloco = linhas_por_bloco(path, orcamento_mb)
+    logger.info(f"Ingestão em blocos de {path}: {tamanho_bloco} linhas por bloco (orçamento {orcamento_mb} MB).")
+
+    escritor = None
+    cubo = None
+    linhas = 0
+    blocos = 0
+
+    try:
+        leitor = pd.read_csv(path, na_values=NA_FORMATS, dtype=TIPOS_CSV, chunksize=tamanho_bloco)
+
+        for bloco in leitor:
+            blocos += 1
+            bloco = limpar_dataframe(bloco)
+
+            if bloco.empty:
+                continue
+
+            # Índice contínuo entre blocos, como no reset_index do caminho em memória
+            bloco.index = pd.RangeIndex(linhas, linhas + len(bloco))
+
+            if destino is not None:
+                esquema = escritor.schema if escritor is not None else None
+                tabela = pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False)
+
+                if escritor is None:
+                    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+                    escritor = pq.ParquetWriter(f"{destino}.tmp", tabela.schema)
+
+                escritor.write_table(tabela)
+
+            if gerar_cubo:
+                parcial = construir_cubo(bloco)
+                cubo = parcial if cubo is None else combinar_cubos([cubo, parcial])
+
+            linhas += len(bloco)
+
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    if escritor is not None:
+        os.replace(f"{destino}.tmp", destino)
+
+    logger.info(f"Ingestão em blocos concluída em {time.perf_counter() - inicio:.3f}s: {linhas} linhas em {blocos} blocos.")
+
+    return ResultadoIngestao(
+        destino=destino if escritor is not None else None,
+        linhas=linhas,
+        blocos=blocos,
+        cubo=cubo
+    )
+
+def ler_parquet_limpo(path: str) -> pd.DataFrame:
+    """
+    Função para ler um Parquet gravado por ingerir_em_blocos.
+
+    As categorias das dimensões são normalizadas para a mesma ordem de df_cleaning
+    (blocos diferentes podem ter acrescentado valores desconhecidos em outra ordem).
+
+    Args:
+        path (str): Caminho do Parquet
+
+    Returns:
+        pd.DataFrame: Dataset limpo
+    """
+
+    return converter_categorias(pd.read_parquet(path))
+
+def listar_arquivos(origem: str, padrao: str = '*.csv') -> list:
+    """
+    Função para listar os arquivos de uma ingestão: um diretório (filtrado por padrao) ou um padrão glob.
+
+    Args:
+        origem (str): Diretório ou padrão glob (ex.: 'data/landing/2022-*.csv')
+        padrao (str): Padrão glob aplicado quando origem é um diretório
+
+    Returns:
+        list: Caminhos em ordem alfabética
+    """
+
+    if os.path.isdir(origem):
+        origem = os.path.join(origem, padrao)
+
+    return sorted(caminho for caminho in glob.glob(origem) if os.path.isfile(caminho))
+
+def _limpar_arquivo(path: str, usar_snapshot: bool) -> pd.DataFrame | None:
+    # Roda no processo filho: garante que os logs sigam a configuração de src.log_config
+    setup_logging()
+
+    return df_cleaning(path, usar_snapshot=usar_snapshot)
+
+def ingerir_paralelo(
+    origem: str,
+    padrao: str = '*.csv',
+    processos: int | None = None,
+    usar_snapshot: bool = True,
+    destino: str | None = None) -> pd.DataFrame | None:
+    """
+    Função para limpar vários CSVs em paralelo (um processo por arquivo) e uni-los.
+
+    Cada arquivo passa por df_cleaning (mesmas regras e, se usar_snapshot, o
+    mesmo snapshot Parquet por arquivo). O resultado é unido na ordem
+    alfabética dos arquivos, independentemente de qual processo termina
+    primeiro, com índice contínuo e as categorias alinhadas. Um arquivo que
+    falha (erro na limpeza, arquivo vazio ou processo interrompido) é
+    registrado no log e ignorado, sem interromper os demais.
+
+    Args:
+        origem (str): Diretório ou padrão glob dos arquivos
+        padrao (str): Padrão glob aplicado quando origem é um diretório
+        processos (int | None): Processos em paralelo (padrão: um por núcleo, limitado ao número de arquivos)
+        usar_snapshot (bool): Se True, lê/grava o snapshot Parquet de cada arquivo
+        destino (str | None): Se informado, grava o resultado em Parquet (ler com ler_parquet_limpo)
+
+    Returns:
+        pd.DataFrame | None: Dataset limpo de todos os arquivos válidos (None se nenhum for válido)
+
+    Example:
+        df = ingerir_paralelo('data/landing', processos=4)
+        df = ingerir_paralelo('data/landing/2022-0*.csv')
+    """
+
+    arquivos = listar_arquivos(origem, padrao)
+
+    if not arquivos:
+        logger.warning(f"Nenhum arquivo encontrado em {origem}.")
+        return None
+
+    inicio = time.perf_counter()
+    processos = max(1, min(processos or os.cpu_count() or 1, len(arquivos)))
+    logger.info(f"Ingestão paralela de {len(arquivos)} arquivo(s) com {processos} processo(s).")
+
+    resultados = {}
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {executor.submit(_limpar_arquivo, path, usar_snapshot): path for path in arquivos}
+
+        for futuro in as_completed(futuros):
+            path = futuros[futuro]
+
+            try:
+                df = futuro.result()
+            except Exception as e:
+                logger.error(f"Falha ao limpar {path}; arquivo ignorado: {e}", exc_info=True)
+                continue
+
+            # df_cleaning devolve None (e registra o motivo no log) quando a limpeza falha
+            if df is None:
+                logger.error(f"Falha ao limpar {path}; arquivo ignorado.")
+                continue
+
+            if df.empty:
+                logger.warning(f"Arquivo {path} sem linhas válidas após a limpeza; arquivo ignorado.")
+                continue
+
+            resultados[path] = df
+
+    # Ordem determinística: a dos nomes dos arquivos, não a de término dos processos
+    partes = [resultados[path] for path in arquivos if path in resultados]
+
+    if not partes:
+        logger.error("Nenhum arquivo válido na ingestão paralela.")
+        return None
+
+    df = converter_categorias(pd.concat(unificar_categorias(partes), ignore_index=True))
+
+    if destino is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+        df.to_parquet(f"{destino}.tmp", index=False)
+        os.replace(f"{destino}.tmp", destino)
+
+    logger.info(
+        f"Ingestão paralela concluída em {time.perf_counter() - inicio:.3f}s: "
+        f"{len(df)} linhas de {len(partes)}/{len(arquivos)} arquivo(s)."
+    )
+
+    return df
+
+def _caminhos_dataset(dataset_dir: str) -> dict:
+    return {
+        'manifesto': os.path.join(dataset_dir, 'manifest.json'),
+        'particoes': os.path.join(dataset_dir, 'particoes'),
+        'cubos': os.path.join(dataset_dir, 'cubos')
+    }
+
+def ler_manifesto(dataset_dir: str = DATASET_DIR) -> dict:
+    """
+    Função para ler o manifesto da ingestão incremental.
+
+    Args:
+        dataset_dir (str): Diretório do dataset incremental
+
+    Returns:
+        dict: {'arquivos': {nome: {'sha256', 'tamanho', 'linhas', 'particao', 'ingerido_em'}},
+               'cubo': nome do arquivo do cubo atual (ou None)}
+    """
+
+    caminho = _caminhos_dataset(dataset_dir)['manifesto']
+
+    if not os.path.exists(caminho):
+        return {'arquivos': {}, 'cubo': None}
+
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def _gravar_manifesto(manifesto: dict, dataset_dir: str) -> None:
+    caminho = _caminhos_dataset(dataset_dir)['manifesto']
+
+    with open(f"{caminho}.tmp", 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, indent=2)
+    os.replace(f"{caminho}.tmp", caminho)
+
+def ingerir_incremental(
+    landing_dir: str = LANDING_DIR,
+    dataset_dir: str = DATASET_DIR,
+    padrao: str = '*.csv',
+    orcamento_mb: float = 256) -> list:
+    """
+    Função para ingerir apenas os arquivos novos (ou alterados) do diretório de entrada.
+
+    Cada arquivo novo é limpo em blocos (ingerir_em_blocos), gravado como uma
+    partição Parquet e tem seu cubo parcial somado ao cubo armazenado; o
+    histórico já ingerido não é relido. Arquivos cujo checksum já consta no
+    manifesto são ignorados, então rodar a ingestão de novo não duplica dados.
+    Se um arquivo já ingerido mudar de conteúdo, sua partição é substituída e o
+    cubo é recombinado a partir dos cubos parciais (sem reler as partições).
+
+    O manifesto é o ponto de confirmação: ele só é gravado depois das partições
+    e do novo cubo, e arquivos obsoletos só são apagados depois dele. Uma falha
+    no meio do processo apenas faz os mesmos arquivos serem reprocessados.
+
+    Args:
+        landing_dir (str): Diretório onde os novos arquivos são depositados
+        dataset_dir (str): Diretório do dataset incremental (partições, cubos e manifesto)
+        padrao (str): Padrão glob dos arquivos de entrada
+        orcamento_mb (float): Memória máxima para processar um bloco, em MB
+
+    Returns:
+        list: Nomes dos arquivos ingeridos nesta execução
+
+    Example:
+        novos = ingerir_incremental('data/landing')
+    """
+
+    caminhos = _caminhos_dataset(dataset_dir)
+    os.makedirs(caminhos['particoes'], exist_ok=True)
+    os.makedirs(caminhos['cubos'], exist_ok=True)
+
+    manifesto = ler_manifesto(dataset_dir)
+    arquivos = manifesto['arquivos']
+    hashes_ingeridos = {info['sha256'] for info in arquivos.values()}
+
+    cubo = carregar_cubo_incremental(dataset_dir)
+    recombinar = False
+    obsoletos = []
+    ingeridos = []
+
+    for path in sorted(glob.glob(os.path.join(landing_dir, padrao))):
+        nome = os.path.basename(path)
+        sha = hash_arquivo(path)
+
+        if sha in hashes_ingeridos:
+            logger.debug(f"Arquivo já ingerido, ignorando: {nome}")
+            continue
+
+        inicio = time.perf_counter()
+        particao = f"{os.path.splitext(nome)[0]}-{sha[:12]}.parquet"
+
+        resultado = ingerir_em_blocos(
+            path,
+            destino=os.path.join(caminhos['particoes'], particao),
+            orcamento_mb=orcamento_mb
+        )
+
+        if resultado.destino is None:
+            logger.warning(f"Arquivo {nome} não tem linhas válidas após a limpeza.")
+        else:
+            salvar_cubo(resultado.cubo, os.path.join(caminhos['cubos'], particao))
+
+        # Mesmo nome com conteúdo novo: a partição antiga sai e o cubo é recombinado
+        anterior = arquivos.get(nome)
+        if anterior is not None:
+            if anterior['particao'] is not None:
+                obsoletos += [os.path.join(caminhos[d], anterior['particao']) for d in ('particoes', 'cubos')]
+                obsoletos.append(caminho_esbocos(os.path.join(caminhos['cubos'], anterior['particao'])))
+            logger.info(f"Arquivo {nome} alterado desde a última ingestão: partição substituída.")
+            recombinar = True
+        elif resultado.cubo is not None:
+            cubo = resultado.cubo if cubo is None else combinar_cubos([cubo, resultado.cubo])
+
+        arquivos[nome] = {
+            'sha256': sha,
+            'tamanho': os.path.getsize(path),
+            'linhas': resultado.linhas,
+            'particao': particao if resultado.destino is not None else None,
+            'ingerido_em': datetime.now().isoformat(timespec='seconds')
+        }
+        hashes_ingeridos.add(sha)
+        ingeridos.append(nome)
+
+        logger.info(f"Partição {nome} ingerida em {time.perf_counter() - inicio:.3f}s ({resultado.linhas} linhas).")
+
+    if not ingeridos:
+        return ingeridos
+
+    if recombinar:
+        cubos = [
+            ler_cubo(os.path.join(caminhos['cubos'], info['particao']))
+            for info in arquivos.values()
+            if info['particao'] is not None
+        ]
+        cubo = combinar_cubos(cubos) if cubos else None
+
+    # Novo cubo em um arquivo novo: o anterior continua válido até o manifesto mudar
+    if manifesto['cubo'] is not None:
+        obsoletos.append(os.path.join(dataset_dir, manifesto['cubo']))
+        obsoletos.append(caminho_esbocos(os.path.join(dataset_dir, manifesto['cubo'])))
+        manifesto['cubo'] = None
+
+    if cubo is not None:
+        manifesto['cubo'] = f"cubo-{datetime.now():%Y%m%d%H%M%S%f}.parquet"
+        salvar_cubo(cubo, os.path.join(dataset_dir, manifesto['cubo']))
+
+    _gravar_manifesto(manifesto, dataset_dir)
+
+    for caminho in obsoletos:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+    return ingeridos
+
+def carregar_dataset_incremental(dataset_dir: str = DATASET_DIR) -> pd.DataFrame | None:
+    """
+    Função para carregar o dataset completo a partir das partições ingeridas.
+
+    Args:
+        dataset_dir (str): Diretório do dataset incremental
+
+    Returns:
+        pd.DataFrame | None: Dataset limpo (partições na ordem de ingestão) ou None se vazio
+    """
+
+    caminhos = _caminhos_dataset(dataset_dir)
+    particoes = [
+        pd.read_parquet(os.path.join(caminhos['particoes'], info['particao']))
+        for info in ler_manifesto(dataset_dir)['arquivos'].values()
+        if info['particao'] is not None
+    ]
+
+    if not particoes:
+        return None
+
+    # Categorical de inteiros volta do Parquet como inteiro: reconverte após a concatenação
+    return converter_categorias(pd.concat(unificar_categorias(particoes), ignore_index=True))
+
+def carregar_cubo_incremental(dataset_dir: str = DATASET_DIR) -> Cubo | None:
+    """
+    Função para carregar o cubo de métricas mantido pela ingestão incremental.
+
+    Contagens por dia e por semana saem direto do cubo
+    (ex.: agregar_cubo(cubo, ['Week_of_Year'], [])) e, se o cubo foi gerado no
+    modo aproximado, os entregadores distintos saem dos seus esboços
+    (ex.: distintos_por(cubo.esbocos, ['Week_of_Year'])).
+
+    Args:
+        dataset_dir (str): Diretório do dataset incremental
+
+    Returns:
+        Cubo | None: Cubo de métricas ou None se nada foi ingerido
+    """
+
+    nome = ler_manifesto(dataset_dir)['cubo']
+
+    return ler_cubo(os.path.join(dataset_dir, nome)) if nome is not None else None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingestão incremental de arquivos de pedidos.")
+    parser.add_argument('--landing', default=LANDING_DIR, help="Diretório de entrada dos arquivos")
+    parser.add_argument('--dataset', default=DATASET_DIR, help="Diretório do dataset incremental")
+    parser.add_argument('--padrao', default='*.csv', help="Padrão glob dos arquivos")
+    parser.add_argument('--orcamento-mb', type=float, default=256, help="Memória máxima por bloco (MB)")
+    parser.add_argument('--saida', help="Limpa todos os arquivos em paralelo e grava um único Parquet (sem manifesto)")
+    parser.add_argument('--processos', type=int, help="Processos da ingestão paralela (padrão: um por núcleo)")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    if args.saida:
+        ingerir_paralelo(args.landing, args.padrao, args.processos, destino=args.saida)
+    else:
+        novos = ingerir_incremental(args.landing, args.dataset, args.padrao, args.orcamento_mb)
+        logger.info(f"{len(novos)} arquivo(s) ingerido(s): {novos}")
@@ -1,7 +1,14 @@
 # src/log_config.py
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Rotação do logs/telemetria.jsonl: tamanho máximo de cada arquivo e quantos arquivos antigos manter
+TELEMETRIA_MAX_BYTES = 10 * 1024 ** 2
+TELEMETRIA_BACKUPS = 3
 
 def setup_logging():
     # Caminho dinâmico para garantir que funcione em qualquer OS
@@ -20,3 +27,25 @@ def setup_logging():
                 logging.FileHandler(LOG_FILE)
             ]
         )
+
+    # Registros de telemetria (src.telemetria): uma linha JSON por chamada medida,
+    # em arquivo próprio para não misturar com o log de texto. A chamada medida só
+    # enfileira o registro; uma thread grava o arquivo, que roda ao atingir TELEMETRIA_MAX_BYTES
+    logger_telemetria = logging.getLogger('src.telemetria.registros')
+    if not logger_telemetria.handlers:
+        arquivo = RotatingFileHandler(
+            os.path.join(LOG_DIR, 'telemetria.jsonl'),
+            maxBytes=TELEMETRIA_MAX_BYTES,
+            backupCount=TELEMETRIA_BACKUPS,
+            encoding='utf-8'
+        )
+        arquivo.setFormatter(logging.Formatter('%(message)s'))
+
+        fila = queue.SimpleQueue()
+        gravador = QueueListener(fila, arquivo)
+        gravador.start()
+        atexit.register(gravador.stop)
+
+        logger_telemetria.addHandler(QueueHandler(fila))
+        logger_telemetria.setLevel(logging.INFO)
+        logger_telemetria.propagate = False
@@ -0,0 +1,360 @@
+"""
+Docstring para src.memo
+
+Memoização, compartilhada entre as sessões, dos resultados que dependem dos
+filtros da barra lateral.
+
+Cada combinação de filtros vira uma chave normalizada (datas em ISO e listas
+ordenadas), de modo que voltar a uma combinação já vista (por qualquer
+usuário) devolve o Dataframe filtrado, as tabelas e os gráficos prontos. Os
+resultados ficam em um LRU limitado por bytes, com contadores de acertos,
+falhas e remoções.
+
+Dataframes, cubos e índices só entram na chave pelo conteúdo que
+representam: os do armazenamento compartilhado e os devolvidos pela própria
+memoização recebem uma chave de conteúdo (registrar_quadro); passar um
+Dataframe sem chave registrada é um erro, em vez de um acerto errado no cache.
+
+Os objetos devolvidos são compartilhados: devem ser tratados como somente
+leitura (com o copy-on-write ativo, alterações em Dataframes geram cópias).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+import weakref
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable
+
+from src.cube import Cubo
+from src.figuras import FiguraSerializada, figura_serializada
+from src.filter_engine import IndiceFiltros
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Limite de memória do cache compartilhado (MB), configurável por variável de ambiente
+LIMITE_CACHE_MB = int(os.environ.get('CURRY_CACHE_MB', '256'))
+
+def chave_filtros(
+    date_slider: tuple,
+    traffic_options: list,
+    weather_cond: list,
+    cities: list) -> str:
+    """
+    Função para gerar a chave normalizada de uma combinação de filtros da barra lateral.
+
+    A ordem em que as opções foram selecionadas não altera a chave.
+
+    Args:
+        date_slider (tuple): Tupla com as datas
+        traffic_options (list): Lista com condições de transito
+        weather_cond (list): Lista com condições climáticas
+        cities (list): Lista com as cidades
+
+    Returns:
+        str: Hash hexadecimal da combinação de filtros
+
+    Example:
+        chave = chave_filtros(date_slider, traffic_options, weather_cond, cities)
+    """
+
+    normalizado = {
+        'datas': [pd.Timestamp(data).isoformat() for data in date_slider],
+        'trafego': sorted(map(str, traffic_options)),
+        'clima': sorted(map(str, weather_cond)),
+        'cidades': sorted(map(str, cities))
+    }
+
+    return hashlib.sha1(json.dumps(normalizado).encode('utf-8')).hexdigest()[:16]
+
+def tamanho_bytes(valor: Any) -> int:
+    """
+    Função para estimar a memória ocupada por um resultado guardado no cache.
+
+    Args:
+        valor (Any): Dataframe, Series, Cubo, gráfico ou qualquer objeto serializável
+
+    Returns:
+        int: Tamanho estimado em bytes
+    """
+
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(valor, pd.DataFrame) else uso)
+
+    if isinstance(valor, Cubo):
+        esbocos = valor.esbocos.nbytes if valor.esbocos is not None else 0
+        return int(valor.dados.memory_usage(deep=True).sum()) + esbocos
+
+    if isinstance(valor, FiguraSerializada):
+        return valor.bytes
+
+    if isinstance(valor, (tuple, list)):
+        return sum(tamanho_bytes(item) for item in valor)
+
+    try:
+        return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(valor)
+
+class CacheLRU:
+    """
+    Cache LRU (menos usado recentemente) limitado pelo total de bytes guardados.
+
+    Seguro para uso por várias sessões (threads) ao mesmo tempo.
+
+    Attributes:
+        limite_bytes (int): Total máximo de bytes guardados
+        bytes (int): Total de bytes guardados no momento
+        acertos (int): Consultas atendidas pelo cache
+        falhas (int): Consultas que precisaram calcular o resultado
+        remocoes (int): Entradas removidas para respeitar o limite
+
+    Example:
+        cache = CacheLRU(limite_bytes=64 * 1024 ** 2)
+        fig = cache.obter_ou_calcular(chave, lambda: pedidos_por_dia(cubo))
+    """
+
+    def __init__(self, limite_bytes: int):
+        self.limite_bytes = limite_bytes
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter_ou_calcular(self, chave: tuple, calcular: Callable[[], Any]) -> Any:
+        """
+        Função para devolver o resultado guardado para a chave ou calculá-lo e guardá-lo.
+
+        Args:
+            chave (tuple): Chave do resultado (precisa ser hashable)
+            calcular (Callable[[], Any]): Função sem argumentos que calcula o resultado
+
+        Returns:
+            Any: Resultado guardado ou recém calculado
+        """
+
+        with self._trava:
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return self._entradas[chave][0]
+            self.falhas += 1
+
+        # O cálculo fica fora da trava para não bloquear as outras sessões
+        valor = calcular()
+        tamanho = tamanho_bytes(valor)
+
+        if tamanho > self.limite_bytes:
+            logger.warning(f"Resultado de {tamanho / 1024 ** 2:.1f} MB excede o limite do cache; não será guardado.")
+            return valor
+
+        with self._trava:
+            if chave not in self._entradas:
+                self._entradas[chave] = (valor, tamanho)
+                self.bytes += tamanho
+
+            while self.bytes > self.limite_bytes:
+                _, (_, tamanho_removido) = self._entradas.popitem(last=False)
+                self.bytes -= tamanho_removido
+                self.remocoes += 1
+
+        return valor
+
+    def limpar(self) -> None:
+        """
+        Função para esvaziar o cache (os contadores são mantidos).
+        """
+
+        with self._trava:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def estatisticas(self) -> dict:
+        """
+        Função para resumir o estado do cache.
+
+        Returns:
+            dict: Entradas, MB guardados, limite em MB, acertos, falhas, remoções e taxa de acerto
+        """
+
+        consultas = self.acertos + self.falhas
+
+        return {
+            'entradas': len(self._entradas),
+            'mb': self.bytes / 1024 ** 2,
+            'limite_mb': self.limite_bytes / 1024 ** 2,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'remocoes': self.remocoes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0
+        }
+
+# Cache único do processo, compartilhado por todas as sessões e páginas
+CACHE_VISOES = CacheLRU(LIMITE_CACHE_MB * 1024 ** 2)
+
+# Chave de conteúdo de cada Dataframe, Series, cubo ou índice registrado, por id() do objeto.
+# A entrada sai do registro quando o objeto é coletado, antes que o id possa ser reutilizado
+_QUADROS = (pd.DataFrame, pd.Series, Cubo, IndiceFiltros)
+_CHAVES_QUADROS: dict[int, Any] = {}
+_TRAVA_QUADROS = threading.Lock()
+
+def registrar_quadro(valor: Any, chave: Any) -> Any:
+    """
+    Função para associar a um Dataframe, Series, cubo ou índice a chave do conteúdo que ele representa.
+
+    Objetos com o mesmo conteúdo (ex.: visões rasas do mesmo dataset) podem
+    receber a mesma chave; objetos diferentes nunca devem compartilhar uma.
+
+    Args:
+        valor (Any): Objeto a ser registrado
+        chave (Any): Chave hashable do conteúdo (ex.: (versao, 'df'))
+
+    Returns:
+        Any: O próprio valor
+
+    Example:
+        df = registrar_quadro(entrada.df.copy(deep=False), (entrada.versao, 'df'))
+    """
+
+    ident = id(valor)
+
+    with _TRAVA_QUADROS:
+        if _CHAVES_QUADROS.get(ident) == chave:
+            return valor
+        novo = ident not in _CHAVES_QUADROS
+        _CHAVES_QUADROS[ident] = chave
+
+    if novo:
+        weakref.finalize(valor, _CHAVES_QUADROS.pop, ident, None)
+
+    return valor
+
+def _chave_argumento(valor: Any) -> Any:
+    if isinstance(valor, _QUADROS):
+        chave = _CHAVES_QUADROS.get(id(valor))
+        if chave is None:
+            raise TypeError(
+                f"{type(valor).__name__} sem chave de conteúdo não pode ser memoizado; "
+                "use os objetos do armazenamento compartilhado, os devolvidos pela memoização "
+                "ou registre-o com registrar_quadro."
+            )
+        return chave
+    if isinstance(valor, (list, tuple)):
+        return tuple(_chave_argumento(item) for item in valor)
+    return repr(valor)
+
+class MemoVisao:
+    """
+    Memoização das funções chamadas por uma página para uma combinação de filtros.
+
+    A chave de cada resultado é formada pela versão dos dados, pela chave dos
+    filtros, pelo nome da função e pelos demais argumentos. Dataframes, cubos e
+    índices passados como argumento entram na chave pela sua chave de conteúdo
+    (ver registrar_quadro); os devolvidos por uma chamada memoizada são
+    registrados com a chave dessa chamada, então podem ser passados adiante
+    (um argumento devolvido sem alteração mantém a chave que já tinha).
+
+    Example:
+        memo = MemoVisao(dados.versao, date_slider, traffic_options, weather_cond, cities)
+        cubo = memo(filtros, dados.cubo, date_slider, traffic_options, weather_cond, cities)
+        exibir_figura(memo.figura(pedidos_por_dia, cubo))
+    """
+
+    def __init__(
+        self,
+        versao: str,
+        date_slider: tuple,
+        traffic_options: list,
+        weather_cond: list,
+        cities: list,
+        cache: CacheLRU = CACHE_VISOES):
+        self.chave = (versao, chave_filtros(date_slider, traffic_options, weather_cond, cities))
+        self.cache = cache
+
+    def _chave(self, func: Callable, args: tuple, kwargs: dict) -> tuple:
+        return (
+            self.chave,
+            func.__module__,
+            func.__qualname__,
+            _chave_argumento(args),
+            tuple(sorted((nome, _chave_argumento(valor)) for nome, valor in kwargs.items()))
+        )
+
+    def _precalculado(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        # Gráfico ou mapa gerado em lote por src.relatorios para esta versão e estes filtros, se houver.
+        # Só vale para as chamadas idênticas às do lote: a função registrada e, como único argumento,
+        # a visão devolvida por filtros com os filtros desta memoização
+        from src.relatorios import METRICAS, ler_precalculado
+
+        metrica = METRICAS.get(func.__name__)
+        if kwargs or metrica is None or metrica[0] is not func or len(args) != 1 + len(metrica[3]):
+            return None
+        if tuple(args[1:]) != metrica[3]:
+            return None
+
+        origem = _CHAVES_QUADROS.get(id(args[0]))
+        if not isinstance(args[0], (pd.DataFrame, Cubo)) or not isinstance(origem, tuple) or len(origem) < 3:
+            return None
+        if (origem[0], origem[2]) != (self.chave, 'filtros'):
+            return None
+
+        try:
+            return ler_precalculado(*self.chave, func.__name__)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Relatório pré-calculado de {func.__name__} ilegível; recalculando: {e}")
+            return None
+
+    def _calcular(self, func: Callable, args: tuple, kwargs: dict, calcular: Callable[[], Any]) -> Any:
+        valor = self._precalculado(func, args, kwargs)
+
+        return calcular() if valor is None else valor
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        chave = self._chave(func, args, kwargs)
+        valor = self.cache.obter_ou_calcular(
+            chave,
+            lambda: self._calcular(func, args, kwargs, lambda: func(*args, **kwargs))
+        )
+
+        # Resultados tabulares podem ser passados a outras chamadas memoizadas. Um argumento
+        # devolvido sem alteração (ex.: filtros sem restrição) mantém a chave que já tem
+        devolvido = any(valor is argumento for argumento in (*args, *kwargs.values()))
+        if isinstance(valor, _QUADROS) and not devolvido:
+            registrar_quadro(valor, chave)
+
+        return valor
+
+    def figura(self, func: Callable, *args, **kwargs) -> FiguraSerializada:
+        """
+        Função para obter o gráfico de func já serializado (ver src.figuras).
+
+        Guarda apenas o JSON da figura, não o objeto Plotly. Se o gráfico já
+        foi gerado em lote para estes filtros (src.relatorios), é lido do disco.
+
+        Args:
+            func (Callable): Função que devolve uma figura Plotly
+            *args: Argumentos de func
+            **kwargs: Argumentos nomeados de func
+
+        Returns:
+            FiguraSerializada: Figura pronta para exibir_figura
+        """
+
+        chave = self._chave(func, args, kwargs) + ('figura',)
+
+        return self.cache.obter_ou_calcular(
+            chave,
+            lambda: self._calcular(func, args, kwargs, lambda: figura_serializada(func, *args, **kwargs))
+        )
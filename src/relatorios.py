@@ -0,0 +1,368 @@
+"""
+Docstring para src.relatorios
+
+Geração das métricas do dashboard sem o Streamlit (relatórios pré-calculados).
+
+Para uma lista de presets de filtros (período completo, cada cidade, cada
+semana...), todas as métricas exibidas pelas páginas são calculadas com as
+mesmas funções de src.analysis_tools, em paralelo (um preset por processo), e
+gravadas em um diretório versionado:
+
+    <saida>/<versão dos dados>/<modo>/manifest.json
+    <saida>/<versão dos dados>/<modo>/<chave dos filtros>/preset.json
+    <saida>/<versão dos dados>/<modo>/<chave dos filtros>/<métrica>.plotly.json | .html | .parquet
+    <saida>/<versão dos dados>/<modo>/<chave dos filtros>/valores.json
+
+A versão é a mesma de src.dataset_store e a chave é a de src.memo.chave_filtros,
+então as páginas encontram os gráficos e o mapa já prontos quando os filtros
+da barra lateral coincidem com um preset (ver MemoVisao). O modo ('exato' ou
+'aproximado', ver src.hyperloglog) separa as contagens de entregadores exatas
+das estimadas pelos esboços: cada modo só lê os relatórios gerados nele. Uma execução
+noturna absorve o custo que seria pago pelo primeiro usuário do dia.
+
+Exemplo de uso:
+    python -m src.relatorios --dados data/raw/train.csv --presets completo cidades semanas
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+
+from src import analysis_tools as at
+from src.dataset_store import caminho_dados, obter_dataset, versao_dados
+from src.figuras import FiguraSerializada, figura_serializada
+from src.hyperloglog import DISTINTOS_APROXIMADOS
+from src.log_config import setup_logging
+from src.memo import chave_filtros
+from src.sider import OPCOES_CIDADES, OPCOES_CLIMA, OPCOES_TRAFEGO, PERIODO
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Diretório padrão dos relatórios (configurável por variável de ambiente)
+RELATORIOS_DIR = os.environ.get(
+    'CURRY_RELATORIOS',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed', 'relatorios')
+)
+
+# Métricas exibidas pelas páginas: nome -> (função, tipo, fonte, argumentos extras).
+# Tipos: 'figura' (JSON do Plotly), 'html', 'tabela' (Parquet) e 'valor' (valores.json).
+# Fontes: 'cubo' (cubo filtrado), 'df' (Dataframe filtrado) ou 'distintos' (cubo com
+# esboços no modo aproximado, senão Dataframe), como nas páginas.
+METRICAS = {
+    'pedidos_por_dia': (at.pedidos_por_dia, 'figura', 'cubo', ()),
+    'pedidos_por_trafego': (at.pedidos_por_trafego, 'figura', 'cubo', ()),
+    'pedidos_cidade_trafego': (at.pedidos_cidade_trafego, 'figura', 'cubo', ()),
+    'pedidos_por_semana': (at.pedidos_por_semana, 'figura', 'cubo', ()),
+    'pedidos_por_ent_semana': (at.pedidos_por_ent_semana, 'figura', 'distintos', ()),
+    'mean_std_tempo_cidade': (at.mean_std_tempo_cidade, 'figura', 'cubo', ()),
+    'tempo_medio_ent_cidade': (at.tempo_medio_ent_cidade, 'figura', 'cubo', ()),
+    'mapa_entregas_html': (at.mapa_entregas_html, 'html', 'df', ()),
+    'avaliacao_por_trafego': (at.avaliacao_media_desvio_padrao, 'tabela', 'cubo', ('Road_traffic_density',)),
+    'avaliacao_por_clima': (at.avaliacao_media_desvio_padrao, 'tabela', 'cubo', ('Weatherconditions',)),
+    'top_entregadores_rapidos': (lambda df: at.top_entregadores_extremos(df)[0], 'tabela', 'df', ()),
+    'top_entregadores_lentos': (lambda df: at.top_entregadores_extremos(df)[1], 'tabela', 'df', ()),
+    'festival': (at.estatisticas_por_dimensao, 'tabela', 'cubo', ('Festival', 'Time_taken(min)')),
+    'tempo_por_cidade_pedido': (
+        lambda cubo: at.mean_std_dataframe(cubo, ['Time_taken(min)', 'City', 'Type_of_order'], ['City', 'Type_of_order']),
+        'tabela', 'cubo', ()
+    ),
+    'tempo_por_cidade_trafego': (
+        lambda cubo: at.mean_std_dataframe(cubo, ['Time_taken(min)', 'City', 'Road_traffic_density'], ['City', 'Road_traffic_density']),
+        'tabela', 'cubo', ()
+    ),
+    'distancia_media': (at.distancia_media, 'valor', 'cubo', ())
+}
+
+def modo_calculo() -> str:
+    """
+    Função para identificar o modo das contagens de entregadores do processo.
+
+    Returns:
+        str: 'aproximado' (esboços HyperLogLog, CURRY_DISTINTOS_APROXIMADOS=1) ou 'exato'
+    """
+
+    return 'aproximado' if DISTINTOS_APROXIMADOS else 'exato'
+
+@dataclass(frozen=True)
+class Preset:
+    """
+    Combinação de filtros da barra lateral calculada em lote.
+
+    Attributes:
+        nome (str): Nome legível (ex.: 'cidade-Urban', 'semana-2022-W07')
+        date_slider (tuple): Datas inicial e final
+        traffic_options (list): Condições de trânsito
+        weather_cond (list): Condições climáticas
+        cities (list): Cidades
+    """
+
+    nome: str
+    date_slider: tuple = PERIODO
+    traffic_options: list = field(default_factory=lambda: list(OPCOES_TRAFEGO))
+    weather_cond: list = field(default_factory=lambda: list(OPCOES_CLIMA))
+    cities: list = field(default_factory=lambda: list(OPCOES_CIDADES))
+
+    @property
+    def chave(self) -> str:
+        return chave_filtros(self.date_slider, self.traffic_options, self.weather_cond, self.cities)
+
+    @property
+    def filtros(self) -> tuple:
+        return (self.date_slider, self.traffic_options, self.weather_cond, self.cities)
+
+def presets_padrao(grupos: list = ('completo', 'cidades', 'semanas')) -> list:
+    """
+    Função para montar os presets padrão a partir das opções da barra lateral.
+
+    Args:
+        grupos (list): 'completo' (seleção padrão da barra lateral), 'cidades'
+            (uma cidade por preset) e/ou 'semanas' (uma semana ISO por preset)
+
+    Returns:
+        list: Lista de Preset
+
+    Example:
+        presets = presets_padrao(['completo', 'cidades'])
+    """
+
+    presets = []
+
+    if 'completo' in grupos:
+        presets.append(Preset('completo'))
+
+    if 'cidades' in grupos:
+        presets += [Preset(f"cidade-{cidade}", cities=[cidade]) for cidade in OPCOES_CIDADES]
+
+    if 'semanas' in grupos:
+        inicio, fim = PERIODO
+        segunda = inicio - timedelta(days=inicio.weekday())
+
+        while segunda <= fim:
+            semana = (max(segunda, inicio), min(segunda + timedelta(days=6), fim))
+            ano, numero, _ = segunda.isocalendar()
+            presets.append(Preset(f"semana-{ano}-W{numero:02d}", date_slider=semana))
+            segunda += timedelta(days=7)
+
+    return presets
+
+def _gravar_metrica(diretorio: str, nome: str, tipo: str, valor) -> dict:
+    # Grava uma métrica no formato do seu tipo e devolve a entrada correspondente do preset.json
+    if tipo == 'figura':
+        with open(os.path.join(diretorio, f"{nome}.plotly.json"), 'w', encoding='utf-8') as arquivo:
+            arquivo.write(valor.spec)
+        return {'tipo': tipo, 'altura': valor.altura, 'bytes': valor.bytes}
+
+    if tipo == 'html':
+        with open(os.path.join(diretorio, f"{nome}.html"), 'w', encoding='utf-8') as arquivo:
+            arquivo.write(valor)
+        return {'tipo': tipo}
+
+    if tipo == 'tabela':
+        valor.to_parquet(os.path.join(diretorio, f"{nome}.parquet"))
+        return {'tipo': tipo, 'linhas': len(valor)}
+
+    return {'tipo': tipo, 'valor': float(valor)}
+
+def calcular_preset(path: str, preset: Preset, diretorio: str) -> dict:
+    """
+    Função para calcular e gravar todas as métricas de METRICAS para um preset.
+
+    Roda em um processo filho: o dataset é carregado uma vez por processo
+    (src.dataset_store) e reaproveitado pelos presets seguintes.
+
+    Args:
+        path (str): Caminho do arquivo de dados
+        preset (Preset): Filtros do preset
+        diretorio (str): Diretório da versão (e do modo) em construção
+
+    Returns:
+        dict: Nome, chave, segundos e métricas gravadas do preset
+    """
+
+    setup_logging()
+    inicio = time.perf_counter()
+
+    dados = obter_dataset(path)
+    if dados is None:
+        raise RuntimeError(f"Não foi possível carregar {path}")
+
+    fontes = {
+        'df': at.filtros(dados.visao(), *preset.filtros, indice=dados.indice),
+        'cubo': at.filtros(dados.cubo, *preset.filtros)
+    }
+    fontes['distintos'] = fontes['cubo'] if fontes['cubo'].esbocos is not None else fontes['df']
+
+    destino = os.path.join(diretorio, preset.chave)
+    os.makedirs(destino, exist_ok=True)
+
+    metricas = {}
+    valores = {}
+    for nome, (func, tipo, fonte, extras) in METRICAS.items():
+        if tipo == 'figura':
+            valor = figura_serializada(func, fontes[fonte], *extras)
+        else:
+            valor = func(fontes[fonte], *extras)
+
+        metricas[nome] = _gravar_metrica(destino, nome, tipo, valor)
+        if tipo == 'valor':
+            valores[nome] = metricas[nome]['valor']
+
+    resumo = {
+        'nome': preset.nome,
+        'chave': preset.chave,
+        'modo': modo_calculo(),
+        'filtros': {campo: valor for campo, valor in asdict(preset).items() if campo != 'nome'},
+        'linhas': len(fontes['df']),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'metricas': metricas
+    }
+
+    with open(os.path.join(destino, 'valores.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(valores, arquivo, indent=2)
+    with open(os.path.join(destino, 'preset.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(resumo, arquivo, indent=2, default=str)
+
+    return resumo
+
+def gerar_relatorios(
+    path: str,
+    presets: list | None = None,
+    saida: str = RELATORIOS_DIR,
+    processos: int | None = None) -> str | None:
+    """
+    Função para calcular os presets em paralelo e publicar o diretório versionado.
+
+    O resultado é montado em um diretório temporário e só substitui a versão
+    anterior no fim, então as páginas nunca leem uma versão pela metade. Um
+    preset que falha é registrado no log e no manifesto, sem interromper os demais.
+
+    Args:
+        path (str): Caminho do arquivo de dados (o mesmo usado pelas páginas)
+        presets (list | None): Presets a calcular (padrão: presets_padrao())
+        saida (str): Diretório raiz dos relatórios
+        processos (int | None): Processos em paralelo (padrão: um por núcleo, limitado aos presets)
+
+    Returns:
+        str | None: Diretório da versão (e do modo) publicada (None se nenhum preset foi calculado)
+
+    Example:
+        gerar_relatorios('data/raw/train.csv', presets_padrao(['completo', 'cidades']))
+    """
+
+    presets = presets if presets is not None else presets_padrao()
+    versao = versao_dados(path)
+    final = os.path.join(saida, versao, modo_calculo())
+    temporario = f"{final}.tmp-{os.getpid()}"
+
+    inicio = time.perf_counter()
+    processos = max(1, min(processos or os.cpu_count() or 1, len(presets)))
+    logger.info(f"Relatórios de {len(presets)} preset(s) para a versão {versao} com {processos} processo(s).")
+
+    os.makedirs(temporario, exist_ok=True)
+    resumos = {}
+    erros = {}
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {executor.submit(calcular_preset, path, preset, temporario): preset for preset in presets}
+
+        for futuro in as_completed(futuros):
+            preset = futuros[futuro]
+            try:
+                resumos[preset.nome] = futuro.result()
+            except Exception as e:
+                logger.error(f"Falha no preset {preset.nome}; ignorado: {e}", exc_info=True)
+                erros[preset.nome] = f"{type(e).__name__}: {e}"
+
+    if not resumos:
+        shutil.rmtree(temporario, ignore_errors=True)
+        logger.error("Nenhum preset calculado; a versão anterior foi mantida.")
+        return None
+
+    manifesto = {
+        'versao': versao,
+        'modo': modo_calculo(),
+        'dados': os.path.abspath(path),
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        # Ordem dos presets pedida, independentemente da ordem de término
+        'presets': [
+            {campo: resumos[p.nome][campo] for campo in ('nome', 'chave', 'linhas', 'segundos')}
+            for p in presets if p.nome in resumos
+        ],
+        'erros': erros
+    }
+    with open(os.path.join(temporario, 'manifest.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, indent=2)
+
+    # Publica: a versão anterior sai só depois que a nova está completa
+    antigo = f"{final}.old-{os.getpid()}"
+    if os.path.exists(final):
+        os.rename(final, antigo)
+    os.rename(temporario, final)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+    logger.info(
+        f"Relatórios publicados em {final} em {manifesto['segundos']:.1f}s "
+        f"({len(resumos)} preset(s), {len(erros)} erro(s))."
+    )
+
+    return final
+
+def ler_precalculado(
+    versao: str,
+    chave: str,
+    nome: str,
+    saida: str = RELATORIOS_DIR,
+    modo: str | None = None) -> FiguraSerializada | str | None:
+    """
+    Função para ler um gráfico ou mapa pré-calculado para uma versão, um modo e uma chave de filtros.
+
+    Args:
+        versao (str): Versão dos dados (EntradaDataset.versao)
+        chave (str): Chave dos filtros (chave_filtros)
+        nome (str): Nome da métrica (o nome da função em METRICAS)
+        saida (str): Diretório raiz dos relatórios
+        modo (str | None): 'exato' ou 'aproximado' (padrão: o do processo, ver modo_calculo)
+
+    Returns:
+        FiguraSerializada | str | None: Figura pronta, HTML do mapa ou None se não houver
+    """
+
+    diretorio = os.path.join(saida, versao, modo or modo_calculo(), chave)
+
+    caminho = os.path.join(diretorio, f"{nome}.html")
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            return arquivo.read()
+
+    caminho = os.path.join(diretorio, f"{nome}.plotly.json")
+    if not os.path.exists(caminho):
+        return None
+
+    with open(os.path.join(diretorio, 'preset.json'), encoding='utf-8') as arquivo:
+        altura = json.load(arquivo)['metricas'][nome]['altura']
+    with open(caminho, encoding='utf-8') as arquivo:
+        spec = arquivo.read()
+
+    return FiguraSerializada(nome=nome, spec=spec, altura=altura, cpu_s=0.0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relatórios pré-calculados do dashboard.")
+    parser.add_argument('--dados', default=caminho_dados(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'raw', 'train.csv')),
+                        help="Arquivo de dados ou dataset incremental (o mesmo usado pelas páginas)")
+    parser.add_argument('--saida', default=RELATORIOS_DIR, help="Diretório raiz dos relatórios")
+    parser.add_argument('--presets', nargs='+', default=['completo', 'cidades', 'semanas'],
+                        choices=['completo', 'cidades', 'semanas'], help="Grupos de presets")
+    parser.add_argument('--processos', type=int, help="Processos em paralelo (padrão: um por núcleo)")
+    args = parser.parse_args()
+
+    setup_logging()
+    publicado = gerar_relatorios(args.dados, presets_padrao(args.presets), args.saida, args.processos)
+    raise SystemExit(0 if publicado else 1)
@@ -0,0 +1,102 @@
+"""
+Docstring para src.secoes
+
+Seções de página calculadas sob demanda.
+
+Com st.tabs, o conteúdo de todas as abas é calculado e enviado ao navegador
+a cada rerun, mesmo que o usuário veja apenas uma. Aqui cada seção registra
+uma função de renderização e um seletor (st.segmented_control) decide qual
+delas roda: as demais não calculam nem serializam nada. Combinado com a
+memoização de src.memo, voltar a uma seção já vista não recalcula os gráficos.
+O tempo de cada seção renderizada é registrado pela telemetria (src.telemetria).
+"""
+
+import logging
+import streamlit as st
+from typing import Callable
+
+from src.telemetria import medir
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+class SecoesPreguicosas:
+    """
+    Registro de seções de uma página; apenas a seção selecionada é renderizada.
+
+    Example:
+        secoes = SecoesPreguicosas('secao_empresarial')
+
+        @secoes.secao('Visão Gerencial')
+        def gerencial():
+            st.plotly_chart(memo(pedidos_por_dia, cubo))
+
+        secoes.renderizar()
+    """
+
+    def __init__(self, chave: str):
+        """
+        Args:
+            chave (str): Chave do seletor no st.session_state (única por página)
+        """
+
+        self.chave = chave
+        self._secoes: dict[str, Callable[[], None]] = {}
+
+    def registrar(self, rotulo: str, renderizar: Callable[[], None]) -> None:
+        """
+        Função para registrar uma seção.
+
+        Args:
+            rotulo (str): Nome exibido no seletor
+            renderizar (Callable[[], None]): Função que calcula e exibe o conteúdo da seção
+        """
+
+        self._secoes[rotulo] = renderizar
+
+    def secao(self, rotulo: str) -> Callable:
+        """
+        Decorador equivalente a registrar(rotulo, funcao).
+
+        Args:
+            rotulo (str): Nome exibido no seletor
+
+        Returns:
+            Callable: Decorador que registra a função e a devolve sem alterações
+        """
+
+        def decorador(renderizar: Callable[[], None]) -> Callable[[], None]:
+            self.registrar(rotulo, renderizar)
+            return renderizar
+
+        return decorador
+
+    def renderizar(self) -> str | None:
+        """
+        Função para exibir o seletor e renderizar somente a seção selecionada.
+
+        Returns:
+            str | None: Rótulo da seção renderizada (None se não houver seções)
+        """
+
+        rotulos = list(self._secoes)
+
+        if not rotulos:
+            return None
+
+        selecionada = st.segmented_control(
+            "Seção",
+            rotulos,
+            default=rotulos[0],
+            key=self.chave,
+            label_visibility='collapsed'
+        )
+
+        # Clicar de novo na seção ativa desmarca o seletor; nesse caso volta para a primeira
+        if selecionada not in self._secoes:
+            selecionada = rotulos[0]
+
+        with medir(f"secao.{self.chave}.{selecionada}"):
+            self._secoes[selecionada]()
+
+        return selecionada
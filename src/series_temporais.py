@@ -0,0 +1,152 @@
+"""
+Docstring para src.series_temporais
+
+Redução de pontos das séries temporais enviadas aos gráficos.
+
+- escolher_resolucao: escolhe dia, semana ou mês conforme o intervalo de datas,
+  de modo que o gráfico nunca tenha mais do que PONTOS_MAXIMOS barras/pontos;
+- reamostrar: soma uma série diária na resolução escolhida (semanas de
+  segunda a domingo, como as semanas ISO, mas distintas entre anos);
+- lttb: seleciona até n pontos de uma linha preservando o seu formato
+  (Largest-Triangle-Three-Buckets, Steinarsson, 2013), para as linhas cuja
+  resolução foi fixada e que passam de PONTOS_MAXIMOS pontos. Gráficos de
+  barras não usam o LTTB (descartaria períodos inteiros): são reamostrados
+  em períodos maiores.
+
+Com isso, o tamanho do gráfico e o tempo de renderização ficam constantes,
+independentemente da largura do intervalo selecionado na barra lateral.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Máximo de pontos por série enviados ao navegador
+PONTOS_MAXIMOS = 400
+
+# Resoluções candidatas, da mais fina para a mais grossa (frequência de período do pandas)
+RESOLUCOES = {'D': 'Dia', 'W': 'Semana', 'M': 'Mês'}
+
+def escolher_resolucao(inicio, fim, pontos_maximos: int = PONTOS_MAXIMOS, minima: str = 'D') -> str:
+    """
+    Função para escolher a resolução mais fina que cabe em pontos_maximos pontos.
+
+    Args:
+        inicio: Primeira data do intervalo (qualquer valor aceito por pd.Timestamp)
+        fim: Última data do intervalo
+        pontos_maximos (int): Máximo de pontos do gráfico
+        minima (str): Resolução mais fina aceita ('D', 'W' ou 'M'; ex.: 'W' em séries semanais)
+
+    Returns:
+        str: 'D' (dia), 'W' (semana) ou 'M' (mês)
+
+    Example:
+        escolher_resolucao('2022-02-11', '2022-04-06')  # 'D'
+        escolher_resolucao('2019-01-01', '2022-12-31')  # 'W'
+    """
+
+    inicio, fim = pd.Timestamp(inicio), pd.Timestamp(fim)
+    candidatas = list(RESOLUCOES)
+
+    for resolucao in candidatas[candidatas.index(minima):]:
+        periodos = len(pd.period_range(inicio, fim, freq=resolucao))
+        if periodos <= pontos_maximos:
+            return resolucao
+
+    return 'M'
+
+def inicio_periodo(datas: pd.Series, resolucao: str) -> pd.Series:
+    """
+    Função para levar cada data ao início do seu período (dia, semana de segunda a domingo ou mês).
+
+    Args:
+        datas (pd.Series): Datas
+        resolucao (str): 'D', 'W' ou 'M'
+
+    Returns:
+        pd.Series: Data de início do período de cada linha
+    """
+
+    if resolucao == 'D':
+        return datas
+
+    return datas.dt.to_period(resolucao).dt.start_time
+
+def reamostrar(df: pd.DataFrame, coluna_data: str, coluna_valor: str, resolucao: str) -> pd.DataFrame:
+    """
+    Função para somar uma série (ex.: pedidos por dia) em uma resolução mais grossa.
+
+    Args:
+        df (pd.DataFrame): Dataframe com uma linha por data
+        coluna_data (str): Coluna de datas
+        coluna_valor (str): Coluna a ser somada
+        resolucao (str): 'D', 'W' ou 'M'
+
+    Returns:
+        pd.DataFrame: Mesmas colunas, com uma linha por período (data = início do período)
+    """
+
+    if resolucao == 'D':
+        return df
+
+    periodo = inicio_periodo(df[coluna_data], resolucao)
+
+    return (
+        df.groupby(periodo.rename(coluna_data))[coluna_valor]
+        .sum()
+        .reset_index()
+    )
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Função para escolher até n pontos de uma linha preservando picos e vales (LTTB).
+
+    O primeiro e o último ponto são mantidos; os demais são divididos em n - 2
+    faixas e, em cada faixa, fica o ponto que forma o maior triângulo com o
+    ponto escolhido na faixa anterior e a média da faixa seguinte.
+
+    Args:
+        x (np.ndarray): Eixo x em ordem crescente (números ou datas)
+        y (np.ndarray): Valores
+        n (int): Máximo de pontos (>= 3)
+
+    Returns:
+        np.ndarray: Posições dos pontos escolhidos, em ordem crescente
+
+    Example:
+        pos = lttb(df_aux['Order_Date'].to_numpy(), df_aux['ID'].to_numpy(), 400)
+        df_aux = df_aux.iloc[pos]
+    """
+
+    total = len(y)
+
+    if n >= total or n < 3:
+        return np.arange(total)
+
+    x = np.asarray(x)
+    x = x.astype('datetime64[ns]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Limites das n - 2 faixas internas (o primeiro e o último ponto ficam de fora)
+    limites = np.linspace(1, total - 1, n - 1).astype(np.int64)
+
+    escolhidos = np.empty(n, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, total - 1
+
+    anterior = 0
+    for faixa in range(n - 2):
+        inicio, fim = limites[faixa], limites[faixa + 1]
+
+        # Média da faixa seguinte (para a última faixa interna, o último ponto)
+        prox_inicio, prox_fim = fim, limites[faixa + 2] if faixa + 2 < len(limites) else total
+        media_x = x[prox_inicio:prox_fim].mean()
+        media_y = y[prox_inicio:prox_fim].mean()
+
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[faixa + 1] = anterior
+
+    return escolhidos
@@ -7,6 +7,12 @@ e uma caixa de seleção múltipla para condições de trânsito.
 from datetime import datetime
 import streamlit as st
 
+# Período e opções da barra lateral. Também usados pelos relatórios pré-calculados
+# (src.relatorios), que precisam reproduzir exatamente as seleções padrão.
+PERIODO = (datetime(2022, 2, 11), datetime(2022, 4, 5))
+OPCOES_TRAFEGO = ["Low", "Medium", "High", "Jam"]
+OPCOES_CLIMA = ['Cloudy', 'Fog', 'Sandstorms', 'Storms', 'Sunny', 'Windy']
+OPCOES_CIDADES = ['Metropolitian', 'Semi-Urban', 'Urban']
 
 def sidebar(image_path: str) -> tuple[tuple[datetime, datetime], list[str], list[str], list[str]]:
     """
@@ -33,9 +39,9 @@ def sidebar(image_path: str) -> tuple[tuple[datetime, datetime], list[str], list
 
     date_slider = st.sidebar.slider(
         "Pesquise por intervalo de datas!",
-        min_value=datetime(2022, 2, 11),
-        max_value=datetime(2022, 4, 5),
-        value=(datetime(2022, 2, 11), datetime(2022, 4, 5)),
+        min_value=PERIODO[0],
+        max_value=PERIODO[1],
+        value=PERIODO,
         format="YYYY-MM-DD"
     )
 
@@ -43,28 +49,26 @@ def sidebar(image_path: str) -> tuple[tuple[datetime, datetime], list[str], list
 
     traffic_options = st.sidebar.multiselect(
         "Condições de Trânsito",
-        ["Low", "Medium", "High", "Jam"],
-        default=["Low", "Medium", "High", "Jam"],
+        OPCOES_TRAFEGO,
+        default=OPCOES_TRAFEGO,
         width='stretch'
     )
 
     st.sidebar.markdown("""---""")
 
-    opcoes_wet_cond = ['Cloudy', 'Fog', 'Sandstorms', 'Storms', 'Sunny', 'Windy']
     wet_cond_options = st.sidebar.multiselect(
         "Cindições Climáticas", 
-        opcoes_wet_cond,
-        default=opcoes_wet_cond, 
+        OPCOES_CLIMA,
+        default=OPCOES_CLIMA, 
         width='stretch'
     )
 
     st.sidebar.markdown("""---""")
 
-    opcoes_city = ['Metropolitian', 'Semi-Urban', 'Urban']
     cities_options = st.sidebar.multiselect(
         "Cidades",
-        opcoes_city,
-        default=opcoes_city,
+        OPCOES_CIDADES,
+        default=OPCOES_CIDADES,
         width='stretch'
     )
 
@@ -0,0 +1,187 @@
+"""
+Docstring para src.snapshot
+
+Cache colunar (Parquet) em disco do dataset já limpo.
+
+O snapshot é identificado pelo tamanho, data de modificação e hash do conteúdo
+do CSV de origem, além da versão do código de limpeza. Se qualquer um desses
+valores mudar, o snapshot é considerado inválido e é reconstruído.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Diretório padrão dos snapshots (raiz do projeto -> data/processed)
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'processed')
+
+def hash_arquivo(path: str, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Função para calcular o hash SHA-256 do conteúdo de um arquivo, lendo em blocos.
+
+    Args:
+        path (str): Caminho do arquivo
+        tamanho_bloco (int): Tamanho de cada bloco de leitura em bytes
+
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+            sha.update(bloco)
+
+    return sha.hexdigest()
+
+def chave_snapshot(path: str, versao: str) -> dict:
+    """
+    Função para montar a chave que identifica o snapshot de um arquivo de origem.
+
+    Args:
+        path (str): Caminho do CSV de origem
+        versao (str): Versão do código de limpeza
+
+    Returns:
+        dict: Tamanho, mtime, hash do conteúdo e versão da limpeza
+
+    Example:
+        chave = chave_snapshot('data/raw/train.csv', VERSAO_LIMPEZA)
+    """
+
+    stat = os.stat(path)
+
+    return {
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hash_arquivo(path),
+        'versao_limpeza': versao
+    }
+
+def caminhos_snapshot(path: str, snapshot_dir: str = SNAPSHOT_DIR) -> tuple[str, str]:
+    """
+    Função para obter os caminhos do arquivo Parquet e dos metadados de um snapshot.
+
+    O nome inclui um hash curto do caminho absoluto de origem para evitar
+    colisões entre arquivos com o mesmo nome em diretórios diferentes.
+
+    Args:
+        path (str): Caminho do CSV de origem
+        snapshot_dir (str): Diretório onde os snapshots são armazenados
+
+    Returns:
+        tuple[str, str]: Caminho do Parquet e caminho do JSON de metadados
+    """
+
+    nome = os.path.splitext(os.path.basename(path))[0]
+    sufixo = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    base = os.path.join(snapshot_dir, f"{nome}-{sufixo}")
+
+    return f"{base}.parquet", f"{base}.meta.json"
+
+def ler_snapshot(path: str, chave: dict, snapshot_dir: str = SNAPSHOT_DIR) -> pd.DataFrame | None:
+    """
+    Função para ler o snapshot de um arquivo caso ele exista e seja válido.
+
+    Args:
+        path (str): Caminho do CSV de origem
+        chave (dict): Chave atual do arquivo de origem (ver chave_snapshot)
+        snapshot_dir (str): Diretório onde os snapshots são armazenados
+
+    Returns:
+        pd.DataFrame | None: Dataset limpo ou None se o snapshot estiver ausente/inválido
+    """
+
+    caminho_parquet, caminho_meta = caminhos_snapshot(path, snapshot_dir)
+
+    if not (os.path.exists(caminho_parquet) and os.path.exists(caminho_meta)):
+        return None
+
+    try:
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+
+        if meta != chave:
+            logger.info(f"Snapshot desatualizado para {path}. Será reconstruído.")
+            return None
+
+        return pd.read_parquet(caminho_parquet)
+
+    except Exception as e:
+        # Snapshot corrompido não deve derrubar o app: basta reconstruir
+        logger.warning(f"Falha ao ler snapshot {caminho_parquet}: {e}")
+        return None
+
+def snapshot_atual(path: str, versao: str, snapshot_dir: str = SNAPSHOT_DIR) -> str | None:
+    """
+    Função para obter o arquivo Parquet do snapshot de um CSV, se ele corresponder ao CSV atual.
+
+    Ao contrário de ler_snapshot, não recalcula o hash do conteúdo: compara o
+    tamanho, a data de modificação e a versão da limpeza gravados nos
+    metadados. Serve para consultar o snapshot direto (ex.: DuckDB, ver
+    src.backends) logo depois de df_cleaning tê-lo lido ou gravado.
+
+    Args:
+        path (str): Caminho do CSV de origem
+        versao (str): Versão do código de limpeza
+        snapshot_dir (str): Diretório onde os snapshots são armazenados
+
+    Returns:
+        str | None: Caminho do Parquet, ou None se o snapshot estiver ausente ou desatualizado
+    """
+
+    caminho_parquet, caminho_meta = caminhos_snapshot(path, snapshot_dir)
+
+    try:
+        stat = os.stat(path)
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+    atual = (meta.get('tamanho'), meta.get('mtime_ns'), meta.get('versao_limpeza')) == (
+        stat.st_size, stat.st_mtime_ns, versao
+    )
+
+    return caminho_parquet if atual and os.path.exists(caminho_parquet) else None
+
+def salvar_snapshot(df: pd.DataFrame, path: str, chave: dict, snapshot_dir: str = SNAPSHOT_DIR) -> bool:
+    """
+    Função para gravar o snapshot do dataset limpo e seus metadados.
+
+    A escrita é feita em arquivos temporários e depois renomeada, para que um
+    leitor concorrente nunca veja um snapshot pela metade.
+
+    Args:
+        df (pd.DataFrame): Dataset limpo
+        path (str): Caminho do CSV de origem
+        chave (dict): Chave do arquivo de origem (ver chave_snapshot)
+        snapshot_dir (str): Diretório onde os snapshots são armazenados
+
+    Returns:
+        bool: True se o snapshot foi gravado com sucesso
+    """
+
+    caminho_parquet, caminho_meta = caminhos_snapshot(path, snapshot_dir)
+
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+
+        df.to_parquet(f"{caminho_parquet}.tmp", index=True)
+        os.replace(f"{caminho_parquet}.tmp", caminho_parquet)
+
+        with open(f"{caminho_meta}.tmp", 'w', encoding='utf-8') as arquivo:
+            json.dump(chave, arquivo)
+        os.replace(f"{caminho_meta}.tmp", caminho_meta)
+
+        return True
+
+    except Exception as e:
+        # Sem snapshot o app continua funcionando, apenas sem o atalho no próximo start
+        logger.warning(f"Não foi possível gravar o snapshot {caminho_parquet}: {e}")
+        return False
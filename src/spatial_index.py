@@ -0,0 +1,202 @@
+"""
+Docstring para src.spatial_index
+
+Índice espacial em grade para as coordenadas de restaurantes e locais de entrega.
+
+Cada pedido cai em uma célula (floor(lat / resolucao), floor(lon / resolucao)),
+identificada por um inteiro de 64 bits com a linha da grade nos 32 bits altos
+e a coluna nos 32 bits baixos. As posições dos pedidos são ordenadas por
+célula (formato CSR: `celulas`, `offsets` e `ordem`), de modo que:
+
+- as células de uma mesma linha da grade são contíguas, e um retângulo vira
+  uma busca binária por linha da grade mais um recorte das posições;
+- contagens e somas por célula saem de uma única redução no momento da carga.
+
+Consultas por retângulo e por raio filtram os candidatos com as coordenadas
+exatas (a do raio com src.geo.haversine_vetorizado), então o resultado é o
+mesmo de uma varredura completa, mas só as células próximas são lidas.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+from src.geo import RAIO_TERRA_KM, coordenadas_validas, haversine_vetorizado
+
+# Inicializa o logger
+logger = logging.getLogger(__name__)
+
+# Resolução padrão da grade em graus (~1,1 km de latitude)
+RESOLUCAO_INDICE = 0.01
+
+# Km por grau de latitude
+KM_POR_GRAU = np.pi * RAIO_TERRA_KM / 180
+
+def _id_celula(linha: np.ndarray, coluna: np.ndarray) -> np.ndarray:
+    # Coluna deslocada para ficar não negativa nos 32 bits baixos
+    return (linha.astype(np.int64) << 32) | (coluna.astype(np.int64) + (1 << 31))
+
+class IndiceEspacial:
+    """
+    Índice em grade (CSR) das coordenadas de um DataFrame limpo.
+
+    Attributes:
+        resolucao (float): Tamanho da célula em graus
+        lat (np.ndarray): Latitudes de todas as linhas do DataFrame (sem cópia)
+        lon (np.ndarray): Longitudes de todas as linhas do DataFrame (sem cópia)
+        celulas (np.ndarray): Ids das células ocupadas, em ordem crescente
+        offsets (np.ndarray): Início de cada célula em `ordem` (len(celulas) + 1 valores)
+        ordem (np.ndarray): Posições das linhas com coordenadas válidas, agrupadas por célula
+        contagem (np.ndarray): Pedidos por célula
+        soma (np.ndarray | None): Soma da medida por célula (se informada)
+
+    Example:
+        indice = IndiceEspacial(df, 'Delivery_location_latitude', 'Delivery_location_longitude', 'Time_taken(min)')
+        posicoes = indice.consulta_raio(22.745, 75.892, 3)
+        df_perto = df.take(posicoes)
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        col_lat: str,
+        col_lon: str,
+        medida: str | None = None,
+        resolucao: float = RESOLUCAO_INDICE):
+        self.resolucao = resolucao
+        self.lat = df[col_lat].to_numpy(dtype=np.float64)
+        self.lon = df[col_lon].to_numpy(dtype=np.float64)
+
+        validas = np.flatnonzero(coordenadas_validas(df[col_lat], df[col_lon]).to_numpy())
+        ids = _id_celula(
+            np.floor(self.lat[validas] / resolucao),
+            np.floor(self.lon[validas] / resolucao)
+        )
+
+        tipo_posicao = np.int32 if len(df) < np.iinfo(np.int32).max else np.int64
+        ordenacao = np.argsort(ids, kind='stable')
+        ids = ids[ordenacao]
+        self.ordem = validas[ordenacao].astype(tipo_posicao)
+
+        inicio_celula = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=np.int64)
+        self.celulas = ids[inicio_celula]
+        self.offsets = np.r_[inicio_celula, len(ids)].astype(np.int64)
+        self.contagem = np.diff(self.offsets)
+
+        self.soma = None
+        if medida is not None and len(ids):
+            valores = df[medida].to_numpy(dtype=np.float64)[self.ordem]
+            self.soma = np.add.reduceat(valores, inicio_celula)
+
+    @property
+    def n_celulas(self) -> int:
+        return len(self.celulas)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memória ocupada pelas estruturas do índice (as coordenadas são do DataFrame).
+        """
+
+        estruturas = [self.celulas, self.offsets, self.ordem, self.contagem]
+        if self.soma is not None:
+            estruturas.append(self.soma)
+
+        return sum(estrutura.nbytes for estrutura in estruturas)
+
+    def _candidatos(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        linhas = np.arange(np.floor(lat_min / self.resolucao), np.floor(lat_max / self.resolucao) + 1)
+        col_min, col_max = np.floor(lon_min / self.resolucao), np.floor(lon_max / self.resolucao)
+
+        # Em cada linha da grade, as células do retângulo são um intervalo contíguo de ids
+        inicio = np.searchsorted(self.celulas, _id_celula(linhas, np.full(len(linhas), col_min)), side='left')
+        fim = np.searchsorted(self.celulas, _id_celula(linhas, np.full(len(linhas), col_max)), side='right')
+
+        partes = [
+            self.ordem[self.offsets[i]:self.offsets[f]]
+            for i, f in zip(inicio, fim) if f > i
+        ]
+
+        return np.concatenate(partes) if partes else np.array([], dtype=self.ordem.dtype)
+
+    def consulta_bbox(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        """
+        Função para listar as linhas com coordenadas dentro de um retângulo.
+
+        Args:
+            lat_min (float): Latitude mínima
+            lat_max (float): Latitude máxima
+            lon_min (float): Longitude mínima
+            lon_max (float): Longitude máxima
+
+        Returns:
+            np.ndarray: Posições (para DataFrame.take) em ordem crescente
+        """
+
+        candidatos = self._candidatos(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self.lat[candidatos], self.lon[candidatos]
+        dentro = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+
+        return np.sort(candidatos[dentro])
+
+    def consulta_raio(self, lat: float, lon: float, raio_km: float) -> np.ndarray:
+        """
+        Função para listar as linhas a até raio_km de um ponto (distância de Haversine).
+
+        Args:
+            lat (float): Latitude do centro
+            lon (float): Longitude do centro
+            raio_km (float): Raio em km
+
+        Returns:
+            np.ndarray: Posições (para DataFrame.take) em ordem crescente
+
+        Example:
+            posicoes = indice.consulta_raio(22.745, 75.892, 3)
+        """
+
+        delta_lat = raio_km / KM_POR_GRAU
+        delta_lon = raio_km / (KM_POR_GRAU * max(np.cos(np.radians(lat)), 1e-6))
+
+        candidatos = self._candidatos(lat - delta_lat, lat + delta_lat, lon - delta_lon, lon + delta_lon)
+        distancias = haversine_vetorizado(
+            np.full(len(candidatos), lat), np.full(len(candidatos), lon),
+            self.lat[candidatos], self.lon[candidatos]
+        )
+
+        return np.sort(candidatos[distancias <= raio_km])
+
+    def estatisticas_celulas(self) -> pd.DataFrame:
+        """
+        Função para listar as células ocupadas com a contagem e a média da medida.
+
+        Returns:
+            pd.DataFrame: Colunas 'Latitude' e 'Longitude' (centro da célula), 'Pedidos'
+                e 'Media' (NaN se o índice foi criado sem medida)
+        """
+
+        linha = (self.celulas >> 32).astype(np.float64)
+        coluna = ((self.celulas & 0xFFFFFFFF) - (1 << 31)).astype(np.float64)
+
+        return pd.DataFrame({
+            'Latitude': (linha + 0.5) * self.resolucao,
+            'Longitude': (coluna + 0.5) * self.resolucao,
+            'Pedidos': self.contagem,
+            'Media': self.soma / self.contagem if self.soma is not None else np.nan
+        })
+
+    def zonas_mais_lentas(self, n: int = 10, min_pedidos: int = 20) -> pd.DataFrame:
+        """
+        Função para listar as células com a maior média da medida (ex.: tempo de entrega).
+
+        Args:
+            n (int): Quantidade de células
+            min_pedidos (int): Mínimo de pedidos para a célula entrar no ranking
+
+        Returns:
+            pd.DataFrame: Mesmas colunas de estatisticas_celulas, da mais lenta para a mais rápida
+        """
+
+        celulas = self.estatisticas_celulas()
+
+        return celulas.loc[celulas['Pedidos'] >= min_pedidos, :].nlargest(n, 'Media').reset_index(drop=True)
@@ -0,0 +1,340 @@
+"""
+Docstring para src.telemetria
+
+Telemetria de latência das funções do caminho crítico (limpeza, filtros,
+análises e seções das páginas).
+
+Cada chamada amostrada gera um registro estruturado (JSON, gravado em
+logs/telemetria.jsonl por src.log_config) com tempo de parede, tempo de CPU,
+linhas de entrada e de saída e, opcionalmente, o pico de memória alocada. Os
+tempos também alimentam um histograma por função, mantido em memória, de onde
+saem os percentis p50/p95/p99 exibidos na página de diagnóstico.
+
+Custo e amostragem (variáveis de ambiente ou definir_amostragem):
+
+- CURRY_TELEMETRIA: fração das chamadas medidas (padrão 0.1; 1 mede todas, 0
+  desliga). Uma chamada medida custa cerca de 30 µs, quase todo na montagem
+  do registro JSON, que só é enfileirado: a gravação em disco roda em outra
+  thread, com rotação do arquivo (ver src.log_config). Uma chamada não
+  sorteada custa menos de 1 µs;
+- CURRY_TELEMETRIA_MEMORIA: fração das chamadas medidas que também registram o
+  pico de memória (padrão 0). Usa o tracemalloc, que deixa as alocações bem
+  mais lentas enquanto está ativo: use apenas para investigação.
+"""
+
+import bisect
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable
+import pandas as pd
+
+# Inicializa o logger (os registros estruturados vão para o logger 'src.telemetria.registros')
+logger = logging.getLogger(__name__)
+logger_registros = logging.getLogger(f"{__name__}.registros")
+
+# Frações das chamadas medidas (tempo e linhas) e com pico de memória
+TAXA_AMOSTRAGEM = float(os.environ.get('CURRY_TELEMETRIA', '0.1'))
+TAXA_MEMORIA = float(os.environ.get('CURRY_TELEMETRIA_MEMORIA', '0.0'))
+
+# Limites dos baldes do histograma (ms): escala logarítmica de 0,01 ms a ~15 min, 10% por balde
+LIMITES_MS = [0.01 * 1.1 ** i for i in range(200)]
+
+class Histograma:
+    """
+    Histograma de latências em baldes logarítmicos (memória constante, erro de até 10% nos percentis).
+
+    Attributes:
+        contagens (list): Chamadas por balde (o último recebe valores acima de LIMITES_MS)
+        total (int): Quantidade de chamadas
+        soma_ms (float): Soma dos tempos (ms)
+        maximo_ms (float): Maior tempo observado (ms)
+    """
+
+    def __init__(self):
+        self.contagens = [0] * (len(LIMITES_MS) + 1)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def adicionar(self, ms: float) -> None:
+        self.contagens[bisect.bisect_left(LIMITES_MS, ms)] += 1
+        self.total += 1
+        self.soma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def percentil(self, p: float) -> float:
+        """
+        Função para estimar um percentil (limite superior do balde que o contém).
+
+        Args:
+            p (float): Percentil entre 0 e 100
+
+        Returns:
+            float: Tempo em ms (0.0 se o histograma estiver vazio)
+        """
+
+        if self.total == 0:
+            return 0.0
+
+        alvo = p / 100 * self.total
+        acumulado = 0
+        for balde, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(LIMITES_MS[balde], self.maximo_ms) if balde < len(LIMITES_MS) else self.maximo_ms
+
+        return self.maximo_ms
+
+class _Estatisticas:
+    # Acumulados de uma função: histograma de parede e somas de CPU, linhas, pico e erros
+    def __init__(self):
+        self.parede = Histograma()
+        self.cpu_ms = 0.0
+        self.linhas_entrada = None
+        self.linhas_saida = None
+        self.pico_mb = None
+        self.erros = 0
+
+ESTATISTICAS: dict[str, _Estatisticas] = {}
+_TRAVA = threading.Lock()
+
+# O tracemalloc é global ao processo: só uma chamada por vez mede memória
+_TRAVA_MEMORIA = threading.Lock()
+
+def definir_amostragem(taxa: float, taxa_memoria: float | None = None) -> None:
+    """
+    Função para ajustar as frações de chamadas medidas em tempo de execução.
+
+    Args:
+        taxa (float): Fração das chamadas medidas (0 desliga a telemetria)
+        taxa_memoria (float | None): Fração das chamadas medidas que registram o pico de memória
+
+    Example:
+        definir_amostragem(0.1)  # mede 10% das chamadas
+    """
+
+    global TAXA_AMOSTRAGEM, TAXA_MEMORIA
+
+    TAXA_AMOSTRAGEM = taxa
+    if taxa_memoria is not None:
+        TAXA_MEMORIA = taxa_memoria
+
+def contar_linhas(valor: Any) -> int | None:
+    """
+    Função para contar as linhas de um argumento ou resultado (Dataframe, Series, Cubo ou tupla deles).
+
+    Args:
+        valor (Any): Valor a ser medido
+
+    Returns:
+        int | None: Quantidade de linhas (None se o valor não for tabular)
+    """
+
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return len(valor)
+
+    # Cubo (src.cube) sem importar o módulo: evita dependência circular
+    dados = getattr(valor, 'dados', None)
+    if isinstance(dados, pd.DataFrame):
+        return len(dados)
+
+    if isinstance(valor, (tuple, list)):
+        linhas = [contar_linhas(item) for item in valor]
+        linhas = [n for n in linhas if n is not None]
+        return sum(linhas) if linhas else None
+
+    return None
+
+def _registrar(nome: str, parede_ms: float, cpu_ms: float, entrada: int | None, saida: int | None,
+               pico_mb: float | None, erro: str | None) -> None:
+    with _TRAVA:
+        estatisticas = ESTATISTICAS.setdefault(nome, _Estatisticas())
+        estatisticas.parede.adicionar(parede_ms)
+        estatisticas.cpu_ms += cpu_ms
+        if entrada is not None:
+            estatisticas.linhas_entrada = (estatisticas.linhas_entrada or 0) + entrada
+        if saida is not None:
+            estatisticas.linhas_saida = (estatisticas.linhas_saida or 0) + saida
+        estatisticas.erros += erro is not None
+        if pico_mb is not None:
+            estatisticas.pico_mb = max(estatisticas.pico_mb or 0.0, pico_mb)
+
+    if logger_registros.isEnabledFor(logging.INFO):
+        logger_registros.info(json.dumps({
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'funcao': nome,
+            'parede_ms': round(parede_ms, 3),
+            'cpu_ms': round(cpu_ms, 3),
+            'linhas_entrada': entrada,
+            'linhas_saida': saida,
+            'pico_mb': round(pico_mb, 3) if pico_mb is not None else None,
+            'erro': erro
+        }, ensure_ascii=False))
+
+class _Medicao:
+    # Estado de uma medição em andamento; `saida` pode ser preenchida pelo bloco medido
+    def __init__(self, entrada: int | None):
+        self.entrada = entrada
+        self.saida = None
+
+def _amostrar() -> bool:
+    return TAXA_AMOSTRAGEM > 0 and (TAXA_AMOSTRAGEM >= 1 or random.random() < TAXA_AMOSTRAGEM)
+
+@contextmanager
+def _medicao(nome: str, entrada: int | None):
+    # Mede o bloco (sem sorteio): parede, CPU da thread e, se sorteado, o pico de memória.
+    # Só uma medição por vez usa o tracemalloc (ele é global ao processo)
+    memoria = (
+        TAXA_MEMORIA > 0
+        and random.random() < TAXA_MEMORIA
+        and not tracemalloc.is_tracing()
+        and _TRAVA_MEMORIA.acquire(blocking=False)
+    )
+
+    medicao = _Medicao(entrada)
+    erro = None
+    pico_mb = None
+
+    if memoria:
+        tracemalloc.start()
+
+    inicio_cpu = time.thread_time()
+    inicio = time.perf_counter()
+
+    # Exceções de controle do Streamlit (rerun, st.stop) não contam como erro
+    try:
+        yield medicao
+    except Exception as e:
+        erro = type(e).__name__
+        raise
+    finally:
+        parede_ms = (time.perf_counter() - inicio) * 1000
+        cpu_ms = (time.thread_time() - inicio_cpu) * 1000
+
+        if memoria:
+            pico_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            _TRAVA_MEMORIA.release()
+
+        _registrar(nome, parede_ms, cpu_ms, medicao.entrada, medicao.saida, pico_mb, erro)
+
+@contextmanager
+def medir(nome: str, entrada: Any = None):
+    """
+    Gerenciador de contexto para medir um bloco de código (ex.: uma seção de página).
+
+    Args:
+        nome (str): Nome do bloco nos registros e no relatório
+        entrada (Any): Valor cujas linhas contam como entrada (opcional)
+
+    Yields:
+        _Medicao | None: Medição em andamento (atribua `saida` para registrar as linhas de saída),
+            ou None se a chamada não foi amostrada
+
+    Example:
+        with st.container(), medir('restaurantes.metricas_gerais'):
+            ...
+    """
+
+    if not _amostrar():
+        yield None
+        return
+
+    with _medicao(nome, contar_linhas(entrada)) as medicao:
+        yield medicao
+
+def instrumentar(func: Callable | None = None, *, nome: str | None = None) -> Callable:
+    """
+    Decorador que mede cada chamada (amostrada) da função.
+
+    As linhas de entrada são as do primeiro argumento tabular; as de saída, as do
+    resultado. O nome, o módulo e a assinatura da função são preservados (a
+    memoização de src.memo continua usando o nome original).
+
+    Args:
+        func (Callable | None): Função decorada (quando usado sem parênteses)
+        nome (str | None): Nome nos registros (padrão: '<módulo>.<função>')
+
+    Returns:
+        Callable: Função instrumentada
+
+    Example:
+        @instrumentar
+        def pedidos_por_dia(df): ...
+
+        @instrumentar(nome='limpeza.df_cleaning')
+        def df_cleaning(path): ...
+    """
+
+    def decorador(f: Callable) -> Callable:
+        rotulo = nome or f"{f.__module__.rsplit('.', 1)[-1]}.{f.__qualname__}"
+
+        @functools.wraps(f)
+        def instrumentada(*args, **kwargs):
+            # Caminho rápido quando a chamada não é amostrada
+            if not _amostrar():
+                return f(*args, **kwargs)
+
+            entrada = next((n for n in map(contar_linhas, args) if n is not None), None)
+
+            with _medicao(rotulo, entrada) as medicao:
+                resultado = f(*args, **kwargs)
+                medicao.saida = contar_linhas(resultado)
+
+            return resultado
+
+        return instrumentada
+
+    return decorador(func) if func is not None else decorador
+
+def relatorio_telemetria() -> pd.DataFrame:
+    """
+    Função para resumir a telemetria acumulada desde o início do processo.
+
+    Returns:
+        pd.DataFrame: Uma linha por função, ordenada pelo p95, com as colunas 'Funcao',
+            'Chamadas', 'p50_ms', 'p95_ms', 'p99_ms', 'Max_ms', 'CPU_ms_medio',
+            'Linhas_entrada_media', 'Linhas_saida_media', 'Pico_MB' e 'Erros'
+    """
+
+    colunas = [
+        'Funcao', 'Chamadas', 'p50_ms', 'p95_ms', 'p99_ms', 'Max_ms', 'CPU_ms_medio',
+        'Linhas_entrada_media', 'Linhas_saida_media', 'Pico_MB', 'Erros'
+    ]
+
+    with _TRAVA:
+        linhas = [
+            {
+                'Funcao': nome,
+                'Chamadas': e.parede.total,
+                'p50_ms': e.parede.percentil(50),
+                'p95_ms': e.parede.percentil(95),
+                'p99_ms': e.parede.percentil(99),
+                'Max_ms': e.parede.maximo_ms,
+                'CPU_ms_medio': e.cpu_ms / e.parede.total,
+                'Linhas_entrada_media': e.linhas_entrada / e.parede.total if e.linhas_entrada is not None else None,
+                'Linhas_saida_media': e.linhas_saida / e.parede.total if e.linhas_saida is not None else None,
+                'Pico_MB': e.pico_mb,
+                'Erros': e.erros
+            }
+            for nome, e in ESTATISTICAS.items()
+            if e.parede.total
+        ]
+
+    return pd.DataFrame(linhas, columns=colunas).sort_values('p95_ms', ascending=False, ignore_index=True)
+
+def limpar_telemetria() -> None:
+    """
+    Função para zerar os histogramas e acumulados (os registros já gravados no log são mantidos).
+    """
+
+    with _TRAVA:
+        ESTATISTICAS.clear()
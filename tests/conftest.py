@@ -0,0 +1,27 @@
+"""
+Fixtures compartilhadas dos testes: arquivos de pedidos sintéticos no formato
+do train.csv (benchmarks.gerar_dados) e os datasets limpos correspondentes.
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.gerar_dados import gerar_csv
+from src.data_cleaning import df_cleaning
+
+# Mesmo modo das páginas do app: as visões rasas do dataset compartilhado
+# (EntradaDataset.visao) só são seguras com copy-on-write
+pd.set_option('mode.copy_on_write', True)
+
+@pytest.fixture(scope='session')
+def arquivo_pedidos(tmp_path_factory) -> str:
+    return gerar_csv(6000, str(tmp_path_factory.mktemp('dados') / 'pedidos.csv'))
+
+@pytest.fixture(scope='session')
+def pedidos(arquivo_pedidos):
+    return df_cleaning(arquivo_pedidos, usar_snapshot=False)
+
+@pytest.fixture(scope='session')
+def pedidos_anos(tmp_path_factory):
+    path = gerar_csv(20000, str(tmp_path_factory.mktemp('dados') / 'anos.csv'), inicio='2016-01-01', fim='2022-12-31')
+    return df_cleaning(path, usar_snapshot=False)
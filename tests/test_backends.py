@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.backends
+from src.analysis_tools import estatisticas_filtradas, filtros
+from src.backends import BackendDuckDB, BackendPandas, BackendPolars
+from src.cube import DIMENSOES_CUBO, MEDIDAS_CUBO, construir_cubo
+from src.snapshot import chave_snapshot, salvar_snapshot, snapshot_atual
+
+MEDIDAS = ['Time_taken(min)', 'Delivery_person_Ratings']
+
+SELECOES = [
+    ((pd.Timestamp('2022-03-01'), pd.Timestamp('2022-03-20')), ['Low', 'Jam'], ['Cloudy', 'Fog', 'Stormy'], ['Urban']),
+    ((pd.Timestamp('2022-02-11'), pd.Timestamp('2022-02-11')), ['Low', 'Medium', 'High', 'Jam'], ['Sunny'], ['Urban', 'Metropolitian']),
+    ((pd.Timestamp('2022-01-01'), pd.Timestamp('2022-12-31')), [], ['Sunny'], ['Urban'])
+]
+
+def _original(df, por, medidas):
+    # Agregação como nas funções originais: groupby do pandas, média e desvio por coluna
+    agrupado = df.groupby(por, observed=True)
+
+    df_aux = agrupado.size().rename('Pedidos').to_frame()
+    for medida in medidas:
+        df_aux[f"{medida}_media"] = agrupado[medida].mean()
+        df_aux[f"{medida}_desvio"] = agrupado[medida].std()
+
+    return df_aux.reset_index()
+
+def _motores():
+    motores = [BackendPandas()]
+    for classe, pacote in ((BackendDuckDB, 'duckdb'), (BackendPolars, 'polars')):
+        try:
+            motores.append(classe())
+        except ImportError:
+            motores.append(pytest.param(None, marks=pytest.mark.skip(reason=f"{pacote} não instalado")))
+    return motores
+
+@pytest.fixture(params=_motores(), ids=lambda motor: getattr(motor, 'nome', 'ausente'))
+def motor(request):
+    return request.param
+
+@pytest.fixture(scope='module')
+def snapshot(pedidos, arquivo_pedidos, tmp_path_factory):
+    # Snapshot Parquet do dataset limpo, gravado como em df_cleaning
+    diretorio = str(tmp_path_factory.mktemp('snapshot'))
+    salvar_snapshot(pedidos, arquivo_pedidos, chave_snapshot(arquivo_pedidos, 'teste'), diretorio)
+    return snapshot_atual(arquivo_pedidos, 'teste', diretorio)
+
+@pytest.fixture(params=['dataframe', 'parquet'])
+def origem(request, snapshot):
+    return snapshot if request.param == 'parquet' else None
+
+def _cubo_original(df):
+    # Agregação do cubo como na versão original: soma e soma dos quadrados no groupby do pandas
+    df_aux = df.loc[:, DIMENSOES_CUBO].copy()
+    for medida in MEDIDAS_CUBO:
+        df_aux[f"{medida}_soma"] = df[medida].astype('float64')
+        df_aux[f"{medida}_soma_q"] = df[medida].astype('float64') ** 2
+
+    agrupado = df_aux.groupby(DIMENSOES_CUBO, observed=True)
+    dados = agrupado.sum()
+    dados.insert(0, 'Pedidos', agrupado.size())
+
+    return dados.reset_index()
+
+@pytest.mark.parametrize('por', [['City'], ['City', 'Road_traffic_density'], ['Order_Date'], ['Festival']])
+def test_estatisticas_iguais_ao_groupby(motor, pedidos, origem, por):
+    resultado = motor.estatisticas(pedidos, por, MEDIDAS, parquet=origem)
+
+    pd.testing.assert_frame_equal(resultado, _original(pedidos, por, MEDIDAS), check_exact=False, rtol=1e-9)
+
+def test_estatisticas_sem_agrupamento(motor, pedidos):
+    resultado = motor.estatisticas(pedidos, [], MEDIDAS)
+
+    assert len(resultado) == 1
+    assert resultado['Pedidos'].iloc[0] == len(pedidos)
+    assert np.isclose(resultado['Time_taken(min)_media'].iloc[0], pedidos['Time_taken(min)'].mean())
+    assert np.isclose(resultado['Time_taken(min)_desvio'].iloc[0], pedidos['Time_taken(min)'].std())
+
+def test_estatisticas_sem_medidas(motor, pedidos):
+    resultado = motor.estatisticas(pedidos, ['City'], [])
+
+    assert list(resultado.columns) == ['City', 'Pedidos']
+    assert resultado['Pedidos'].sum() == pedidos['City'].notna().sum()
+
+@pytest.mark.parametrize('selecao', SELECOES)
+def test_filtro_e_agregacao_iguais_a_filtros_e_groupby(motor, pedidos, origem, selecao):
+    resultado = motor.estatisticas(pedidos, ['City', 'Road_traffic_density'], MEDIDAS, selecao, origem)
+    esperado = _original(filtros(pedidos, *selecao), ['City', 'Road_traffic_density'], MEDIDAS)
+
+    pd.testing.assert_frame_equal(resultado, esperado, check_exact=False, rtol=1e-9)
+
+def test_somas_iguais_ao_cubo_original(motor, pedidos, origem):
+    resultado = motor.somas(pedidos, DIMENSOES_CUBO, MEDIDAS_CUBO, origem)
+
+    pd.testing.assert_frame_equal(resultado, _cubo_original(pedidos), check_exact=False, rtol=1e-9)
+
+def test_cubo_no_motor_configurado(motor, pedidos, snapshot, monkeypatch):
+    esperado = construir_cubo(pedidos, esbocos=False)
+
+    monkeypatch.setattr(src.backends, '_backend', motor)
+    cubo = construir_cubo(pedidos, esbocos=False, parquet=snapshot)
+
+    pd.testing.assert_frame_equal(cubo.dados, esperado.dados, check_exact=False, rtol=1e-9)
+
+@pytest.mark.parametrize('selecao', SELECOES[:2])
+def test_estatisticas_filtradas_no_dataframe_e_no_cubo(pedidos, selecao):
+    por = ['City', 'Weatherconditions']
+
+    pd.testing.assert_frame_equal(
+        estatisticas_filtradas(pedidos, *selecao, por, MEDIDAS),
+        estatisticas_filtradas(construir_cubo(pedidos, esbocos=False), *selecao, por, MEDIDAS),
+        check_exact=False, rtol=1e-9, check_dtype=False
+    )
+
+def test_snapshot_desatualizado(arquivo_pedidos, snapshot, tmp_path):
+    assert snapshot is not None
+    assert snapshot_atual(arquivo_pedidos, 'outra', str(tmp_path)) is None
+    assert snapshot_atual(arquivo_pedidos, 'outra', os.path.dirname(snapshot)) is None
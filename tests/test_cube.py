@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis_tools import filtros
+from src.cube import MEDIDAS_CUBO, agregar_cubo, combinar_cubos, construir_cubo, ler_cubo, salvar_cubo
+from src.sider import OPCOES_CIDADES, OPCOES_CLIMA
+
+POR = [['City'], ['City', 'Road_traffic_density'], ['Festival'], ['Order_Date'], ['Type_of_order', 'City'], []]
+
+def _original(df, por, medidas):
+    # Média e desvio padrão direto nos pedidos, como nas funções originais
+    if not por:
+        return pd.DataFrame({
+            'Pedidos': [len(df)],
+            **{f"{m}_{s}": [getattr(df[m], f)()] for m in medidas for s, f in (('media', 'mean'), ('desvio', 'std'))}
+        })
+
+    agrupado = df.groupby(por, observed=True)
+    df_aux = agrupado.size().rename('Pedidos').to_frame()
+    for medida in medidas:
+        df_aux[f"{medida}_media"] = agrupado[medida].mean()
+        df_aux[f"{medida}_desvio"] = agrupado[medida].std()
+
+    return df_aux.reset_index()
+
+@pytest.fixture(scope='module')
+def cubo(pedidos):
+    return construir_cubo(pedidos, esbocos=False)
+
+def _comparar(resultado, esperado):
+    pd.testing.assert_frame_equal(
+        resultado.reset_index(drop=True), esperado.reset_index(drop=True),
+        check_dtype=False, check_exact=False, rtol=1e-9
+    )
+
+@pytest.mark.parametrize('por', POR)
+def test_media_e_desvio_iguais_ao_groupby(pedidos, cubo, por):
+    _comparar(agregar_cubo(cubo, por, MEDIDAS_CUBO), _original(pedidos, por, MEDIDAS_CUBO))
+
+def test_cubo_filtrado_igual_aos_pedidos_filtrados(pedidos, cubo):
+    selecao = ((pd.Timestamp('2022-03-01'), pd.Timestamp('2022-03-20')), ['Low', 'Jam'], OPCOES_CLIMA, OPCOES_CIDADES[:2])
+
+    _comparar(
+        agregar_cubo(filtros(cubo, *selecao), ['City'], ['Time_taken(min)']),
+        _original(filtros(pedidos, *selecao), ['City'], ['Time_taken(min)'])
+    )
+
+def test_combinar_partes_igual_ao_cubo_inteiro(pedidos, cubo):
+    limites = np.linspace(0, len(pedidos), 4).astype(int)
+    partes = [construir_cubo(pedidos.iloc[i:j], esbocos=False) for i, j in zip(limites[:-1], limites[1:])]
+
+    _comparar(
+        agregar_cubo(combinar_cubos(partes), ['City', 'Festival'], MEDIDAS_CUBO),
+        agregar_cubo(cubo, ['City', 'Festival'], MEDIDAS_CUBO)
+    )
+
+def test_salvar_e_ler(tmp_path, cubo):
+    path = str(tmp_path / 'cubo.parquet')
+    salvar_cubo(cubo, path)
+
+    _comparar(agregar_cubo(ler_cubo(path), ['City'], MEDIDAS_CUBO), agregar_cubo(cubo, ['City'], MEDIDAS_CUBO))
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_cleaning import _parse_datas, por_valor_unico
+
+@pytest.fixture
+def datas():
+    return pd.Series(['11-02-2022', None, '13-03-2022', '11-02-2022', np.nan], index=[10, 11, 12, 13, 14], name='Order_Date')
+
+def test_por_valor_unico_igual_a_conversao_direta(datas):
+    convertidas = por_valor_unico(datas, _parse_datas)
+
+    pd.testing.assert_series_equal(convertidas, pd.to_datetime(datas, format='%d-%m-%Y'))
+
+def test_por_valor_unico_conversor_com_indice_proprio(datas):
+    # isocalendar() devolve uma Series indexada pelas próprias datas, não pela posição
+    convertidas = pd.to_datetime(datas, format='%d-%m-%Y')
+    semanas = por_valor_unico(convertidas, lambda x: x.isocalendar().week)
+
+    assert semanas.index.equals(datas.index)
+    assert semanas.iloc[[0, 2, 3]].astype(int).tolist() == convertidas.dt.isocalendar().week.iloc[[0, 2, 3]].tolist()
+    assert semanas.iloc[[1, 4]].isna().all()
+
+def test_por_valor_unico_apenas_nulos():
+    nulos = pd.Series([None, np.nan], dtype=object)
+
+    assert por_valor_unico(nulos, lambda x: x.str.strip()).isna().all()
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.analysis_tools import filtros
+from src.filter_engine import IndiceFiltros
+from src.sider import OPCOES_CIDADES, OPCOES_CLIMA, OPCOES_TRAFEGO, PERIODO
+
+def _original(df, date_slider, traffic_options, weather_cond, cities):
+    # Filtros como na versão original: um .loc por dimensão
+    df = df.loc[(df['Order_Date'] >= date_slider[0]) & (df['Order_Date'] <= date_slider[1]), :]
+    df = df.loc[df['Road_traffic_density'].isin(traffic_options), :]
+    df = df.loc[df['Weatherconditions'].isin(weather_cond), :]
+    df = df.loc[df['City'].isin(cities), :]
+
+    return df
+
+SELECOES = [
+    (PERIODO, OPCOES_TRAFEGO, OPCOES_CLIMA, OPCOES_CIDADES),
+    ((datetime(2022, 3, 1), datetime(2022, 3, 20)), ['Low', 'Jam'], ['Cloudy', 'Fog', 'Stormy'], ['Urban']),
+    ((datetime(2022, 2, 11), datetime(2022, 2, 11)), OPCOES_TRAFEGO, ['Sunny'], OPCOES_CIDADES),
+    (PERIODO, [], OPCOES_CLIMA, OPCOES_CIDADES),
+    ((datetime(2023, 1, 1), datetime(2023, 1, 31)), OPCOES_TRAFEGO, OPCOES_CLIMA, OPCOES_CIDADES)
+]
+
+@pytest.fixture(scope='module')
+def indice(pedidos):
+    return IndiceFiltros(pedidos)
+
+@pytest.mark.parametrize('selecao', SELECOES)
+def test_filtros_com_indice_igual_ao_original(pedidos, indice, selecao):
+    esperado = _original(pedidos, *selecao)
+
+    pd.testing.assert_frame_equal(filtros(pedidos, *selecao, indice=indice), esperado)
+    pd.testing.assert_frame_equal(filtros(pedidos, *selecao), esperado)
+
+def test_sem_restricao_devolve_o_proprio_dataframe(pedidos, indice):
+    # Todas as datas e todos os valores presentes: nenhuma dimensão restringe as linhas
+    selecao = (
+        (pedidos['Order_Date'].min(), pedidos['Order_Date'].max()),
+        *[list(pedidos[coluna].cat.categories) for coluna in ('Road_traffic_density', 'Weatherconditions', 'City')]
+    )
+
+    assert indice.posicoes(*selecao) is None
+    assert filtros(pedidos, *selecao, indice=indice) is pedidos
+
+def test_indice_de_outro_dataframe_e_ignorado(pedidos, indice):
+    parte = pedidos.iloc[:100]
+    selecao = SELECOES[1]
+
+    pd.testing.assert_frame_equal(filtros(parte, *selecao, indice=indice), _original(parte, *selecao))
+
+def test_indice_de_dataframe_reordenado_e_ignorado(pedidos, indice):
+    # Mesmo número de linhas, outra ordem (inclusive com o índice refeito)
+    reordenado = pedidos.sample(frac=1, random_state=0).reset_index(drop=True)
+    selecao = SELECOES[1]
+
+    assert not indice.pertence(reordenado)
+    assert not indice.pertence(pedidos.iloc[::-1])
+    pd.testing.assert_frame_equal(filtros(reordenado, *selecao, indice=indice), _original(reordenado, *selecao))
+
+def test_visao_rasa_usa_o_indice(pedidos, indice):
+    visao = pedidos.copy(deep=False)
+
+    assert indice.pertence(visao)
+    pd.testing.assert_frame_equal(filtros(visao, *SELECOES[1], indice=indice), _original(pedidos, *SELECOES[1]))
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis_tools import pedidos_por_ent_semana
+from src.cube import construir_cubo
+from src.hyperloglog import (
+    combinar_esbocos,
+    construir_esbocos,
+    distintos_por,
+    estimar_distintos,
+    filtrar_esbocos,
+    ler_esbocos,
+    salvar_esbocos
+)
+
+# Erro padrão com a precisão padrão: 1,04 / sqrt(1024), cerca de 3%
+TOLERANCIA = 0.10
+
+def _exatos(df, por):
+    df = df.loc[df['Delivery_person_ID'].notna()].copy()
+    df['Week_of_Year'] = df['Order_Date'].dt.isocalendar().week
+    return df.groupby(por, observed=True)['Delivery_person_ID'].nunique()
+
+@pytest.mark.parametrize('n', [1, 50, 1000, 100000])
+def test_estimativa_dentro_do_erro(n):
+    valores = pd.Series([f'ID{i}' for i in range(n)])
+    esbocos = construir_esbocos(pd.DataFrame({
+        'Order_Date': pd.Timestamp('2022-03-01'),
+        'City': 'Urban',
+        'Road_traffic_density': 'Low',
+        'Weatherconditions': 'Sunny',
+        'Delivery_person_ID': valores
+    }))
+
+    assert abs(distintos_por(esbocos, [])['Distintos'].iloc[0] - n) <= max(1, TOLERANCIA * n)
+
+def test_distintos_por_grupo(pedidos):
+    esbocos = construir_esbocos(pedidos)
+
+    for por in (['Week_of_Year'], ['City'], ['City', 'Road_traffic_density']):
+        exatos = _exatos(pedidos, por)
+        estimados = distintos_por(esbocos, por).set_index(por)['Distintos']
+
+        assert list(estimados.index) == list(exatos.index)
+        assert (abs(estimados - exatos) <= TOLERANCIA * exatos + 1).all()
+
+    total = pedidos['Delivery_person_ID'].nunique()
+    assert abs(distintos_por(esbocos, [])['Distintos'].iloc[0] - total) <= TOLERANCIA * total
+
+def test_filtrar_esbocos(pedidos):
+    esbocos = construir_esbocos(pedidos)
+    mascara = esbocos.chaves['City'] == 'Urban'
+
+    filtrados = distintos_por(filtrar_esbocos(esbocos, mascara), ['Week_of_Year'])
+    diretos = distintos_por(construir_esbocos(pedidos.loc[pedidos['City'] == 'Urban']), ['Week_of_Year'])
+
+    pd.testing.assert_frame_equal(filtrados.reset_index(drop=True), diretos, check_dtype=False)
+
+def test_combinar_partes_igual_ao_todo(pedidos):
+    meio = len(pedidos) // 2
+    partes = [construir_esbocos(pedidos.iloc[:meio]), construir_esbocos(pedidos.iloc[meio:])]
+
+    combinados = combinar_esbocos(partes)
+    todo = construir_esbocos(pedidos)
+
+    np.testing.assert_array_equal(combinados.registros, todo.registros)
+    pd.testing.assert_frame_equal(combinados.chaves, todo.chaves, check_dtype=False, check_categorical=False)
+
+def test_combinar_precisoes_diferentes(pedidos):
+    with pytest.raises(ValueError):
+        combinar_esbocos([construir_esbocos(pedidos, precisao=10), construir_esbocos(pedidos, precisao=12)])
+
+@pytest.mark.parametrize('precisao', [3, 17])
+def test_precisao_fora_do_intervalo(pedidos, precisao):
+    with pytest.raises(ValueError):
+        construir_esbocos(pedidos, precisao=precisao)
+
+def test_salvar_e_ler(pedidos, tmp_path):
+    esbocos = construir_esbocos(pedidos, precisao=12)
+    path = str(tmp_path / 'esbocos.parquet')
+
+    salvar_esbocos(esbocos, path)
+    lidos = ler_esbocos(path)
+
+    assert lidos.precisao == 12
+    np.testing.assert_array_equal(lidos.registros, esbocos.registros)
+    pd.testing.assert_frame_equal(lidos.chaves, esbocos.chaves, check_dtype=False, check_categorical=False)
+
+def test_esboco_vazio():
+    assert estimar_distintos(np.zeros(1024, dtype=np.uint8))[0] == 0
+
+def test_grafico_aproximado_acompanha_o_exato(pedidos):
+    exato = pedidos_por_ent_semana(pedidos, resolucao='W', pontos_maximos=None).data[0]
+    aproximado = pedidos_por_ent_semana(construir_cubo(pedidos, esbocos=True), resolucao='W', pontos_maximos=None).data[0]
+
+    np.testing.assert_array_equal(aproximado.x, exato.x)
+    np.testing.assert_allclose(aproximado.y, exato.y, rtol=TOLERANCIA)
@@ -0,0 +1,118 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.gerar_dados import gerar_csv
+from src.cube import MEDIDAS_CUBO, agregar_cubo, construir_cubo
+from src.data_cleaning import df_cleaning
+from src.dataset_store import caminho_dados, obter_dataset
+from src.ingestao import (
+    carregar_cubo_incremental,
+    carregar_dataset_incremental,
+    ingerir_incremental,
+    ler_manifesto
+)
+
+POR = ['Order_Date', 'City', 'Road_traffic_density']
+
+@pytest.fixture
+def diretorios(tmp_path):
+    landing = tmp_path / 'landing'
+    landing.mkdir()
+    return str(landing), str(tmp_path / 'dataset')
+
+def _completo(tmp_path, arquivos):
+    # Ingestão completa: um único CSV com todos os arquivos, limpo de uma vez
+    partes = [pd.read_csv(arquivo, dtype=str, keep_default_na=False) for arquivo in arquivos]
+    path = str(tmp_path / 'completo.csv')
+    pd.concat(partes).to_csv(path, index=False)
+    return df_cleaning(path, usar_snapshot=False)
+
+def _comparar_cubos(cubo, df):
+    pd.testing.assert_frame_equal(
+        agregar_cubo(cubo, POR, MEDIDAS_CUBO),
+        agregar_cubo(construir_cubo(df, esbocos=False), POR, MEDIDAS_CUBO),
+        check_dtype=False, check_exact=False, rtol=1e-9
+    )
+
+def test_incremental_igual_a_ingestao_completa(tmp_path, diretorios):
+    landing, dataset = diretorios
+    arquivos = [
+        gerar_csv(3000, os.path.join(landing, 'fevereiro.csv'), semente=1, inicio='2022-02-01', fim='2022-02-28'),
+        gerar_csv(2000, os.path.join(landing, 'marco.csv'), semente=2, inicio='2022-03-01', fim='2022-03-31')
+    ]
+
+    # Um arquivo por vez, em blocos pequenos
+    os.rename(arquivos[1], arquivos[1] + '.pendente')
+    assert ingerir_incremental(landing, dataset, orcamento_mb=0.5) == ['fevereiro.csv']
+    os.rename(arquivos[1] + '.pendente', arquivos[1])
+    assert ingerir_incremental(landing, dataset, orcamento_mb=0.5) == ['marco.csv']
+
+    completo = _completo(tmp_path, arquivos)
+    incremental = carregar_dataset_incremental(dataset)
+
+    pd.testing.assert_frame_equal(incremental, completo, check_dtype=False, check_categorical=False)
+    _comparar_cubos(carregar_cubo_incremental(dataset), completo)
+
+def test_reingestao_nao_duplica(diretorios):
+    landing, dataset = diretorios
+    gerar_csv(1000, os.path.join(landing, 'dia.csv'), semente=3)
+
+    ingerir_incremental(landing, dataset)
+    manifesto = ler_manifesto(dataset)
+
+    assert ingerir_incremental(landing, dataset) == []
+    assert ler_manifesto(dataset) == manifesto
+    assert len(carregar_dataset_incremental(dataset)) == manifesto['arquivos']['dia.csv']['linhas']
+
+def test_arquivo_alterado_substitui_a_particao(tmp_path, diretorios):
+    landing, dataset = diretorios
+    fixo = gerar_csv(1000, os.path.join(landing, 'a.csv'), semente=4)
+    alterado = os.path.join(landing, 'b.csv')
+    gerar_csv(1000, alterado, semente=5)
+    ingerir_incremental(landing, dataset)
+
+    gerar_csv(1500, alterado, semente=6)
+    assert ingerir_incremental(landing, dataset) == ['b.csv']
+
+    completo = _completo(tmp_path, [fixo, alterado])
+
+    assert len(carregar_dataset_incremental(dataset)) == len(completo)
+    _comparar_cubos(carregar_cubo_incremental(dataset), completo)
+
+def test_paginas_leem_o_dataset_ingerido(diretorios):
+    landing, dataset = diretorios
+    assert caminho_dados('train.csv', dataset) == 'train.csv'
+
+    gerar_csv(1000, os.path.join(landing, 'dia.csv'), semente=7)
+    ingerir_incremental(landing, dataset)
+    assert caminho_dados('train.csv', dataset) == dataset
+
+    dados = obter_dataset(dataset)
+    assert '-incremental' in dados.versao
+    assert len(dados.df) == len(carregar_dataset_incremental(dataset))
+
+    # Uma nova ingestão muda a versão e o armazenamento recarrega
+    gerar_csv(500, os.path.join(landing, 'dia2.csv'), semente=8)
+    ingerir_incremental(landing, dataset)
+    novos = obter_dataset(dataset)
+
+    assert novos.versao != dados.versao
+    assert len(novos.df) == len(dados.df) + ler_manifesto(dataset)['arquivos']['dia2.csv']['linhas']
+
+@pytest.mark.parametrize('copy_on_write', [True, False])
+def test_visao_nao_altera_dataset_compartilhado(diretorios, copy_on_write):
+    landing, dataset = diretorios
+    gerar_csv(500, os.path.join(landing, 'dia.csv'), semente=9)
+    ingerir_incremental(landing, dataset)
+    dados = obter_dataset(dataset)
+    original = dados.df['Delivery_person_Age'].copy()
+
+    # Sem copy-on-write a visão é uma cópia completa; com ele, uma cópia rasa
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        visao = dados.visao()
+        visao.loc[visao.index[0], 'Delivery_person_Age'] = -1
+        visao['Delivery_person_Age'] += 1
+
+    pd.testing.assert_series_equal(dados.df['Delivery_person_Age'], original)
@@ -0,0 +1,114 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+import src.relatorios
+from src.analysis_tools import filtros, pedidos_por_dia, pedidos_por_trafego
+from src.cube import construir_cubo
+from src.figuras import FiguraSerializada, figura_serializada
+from src.memo import CacheLRU, MemoVisao, chave_filtros, registrar_quadro, tamanho_bytes
+
+FILTROS = ((datetime(2022, 2, 11), datetime(2022, 3, 20)), ['Low', 'Jam'], ['Sunny', 'Fog'], ['Urban'])
+
+@pytest.fixture
+def memo():
+    return MemoVisao('v1', *FILTROS, cache=CacheLRU(64 * 1024 ** 2))
+
+@pytest.fixture
+def cubo(pedidos):
+    return registrar_quadro(construir_cubo(pedidos, esbocos=False), ('v1', 'cubo'))
+
+def test_chave_filtros_normalizada():
+    datas, trafego, clima, cidades = FILTROS
+
+    assert chave_filtros(datas, trafego, clima, cidades) == chave_filtros(
+        (pd.Timestamp('2022-02-11'), date(2022, 3, 20)), trafego[::-1], clima[::-1], cidades
+    )
+    assert chave_filtros(datas, trafego, clima, cidades) != chave_filtros(datas, trafego, clima, ['Metropolitian'])
+    assert chave_filtros(datas, trafego, clima, cidades) != chave_filtros(
+        (datas[0], datetime(2022, 3, 21)), trafego, clima, cidades
+    )
+
+def test_lru_limitado_por_bytes():
+    valor = lambda: 'x' * 80
+    cache = CacheLRU(limite_bytes=3 * tamanho_bytes(valor()))
+
+    for chave in 'abc':
+        cache.obter_ou_calcular(chave, valor)
+    cache.obter_ou_calcular('a', valor)
+    cache.obter_ou_calcular('d', valor)
+
+    # 'b' era o menos usado recentemente quando 'd' entrou
+    assert cache.bytes <= cache.limite_bytes
+    assert list(cache._entradas) == ['c', 'a', 'd']
+    assert cache.estatisticas()['acertos'] == 1
+    assert cache.remocoes == 1
+
+def test_resultado_maior_que_o_limite_nao_entra():
+    cache = CacheLRU(limite_bytes=10)
+
+    assert cache.obter_ou_calcular('a', lambda: 'x' * 100) == 'x' * 100
+    assert len(cache) == 0 and cache.bytes == 0
+
+def test_quadro_sem_chave_e_um_erro(memo, pedidos):
+    with pytest.raises(TypeError):
+        memo(filtros, pedidos.copy(deep=False), *FILTROS)
+
+def test_visoes_do_mesmo_conteudo_compartilham_o_resultado(memo, pedidos):
+    primeira = registrar_quadro(pedidos.copy(deep=False), ('v1', 'df'))
+    segunda = registrar_quadro(pedidos.copy(deep=False), ('v1', 'df'))
+
+    filtrado = memo(filtros, primeira, *FILTROS)
+
+    assert memo(filtros, segunda, *FILTROS) is filtrado
+    pd.testing.assert_frame_equal(filtrado, filtros(pedidos, *FILTROS))
+
+    # Outra versão dos dados não reaproveita o resultado
+    outra = MemoVisao('v2', *FILTROS, cache=memo.cache)
+    assert outra(filtros, registrar_quadro(pedidos.copy(deep=False), ('v2', 'df')), *FILTROS) is not filtrado
+
+def test_resultado_memoizado_pode_ser_passado_adiante(memo, cubo):
+    filtrado = memo(filtros, cubo, *FILTROS)
+    figura = memo.figura(pedidos_por_trafego, filtrado)
+
+    assert memo.figura(pedidos_por_trafego, memo(filtros, cubo, *FILTROS)) is figura
+    assert figura.spec == figura_serializada(pedidos_por_trafego, filtros(cubo, *FILTROS)).spec
+
+def test_selecao_sem_restricao_repetida(pedidos, cubo):
+    datas = (pedidos['Order_Date'].min(), pedidos['Order_Date'].max())
+    selecao = (
+        datas,
+        list(pedidos['Road_traffic_density'].unique()),
+        list(pedidos['Weatherconditions'].unique()),
+        list(pedidos['City'].unique())
+    )
+    memo = MemoVisao('v1', *selecao, cache=CacheLRU(64 * 1024 ** 2))
+
+    for _ in range(4):
+        # filtros devolve o próprio cubo: a chave dele não muda e só a primeira chamada calcula
+        assert memo(filtros, cubo, *selecao) is cubo
+
+    assert memo.cache.falhas == 1
+    assert memo.cache.acertos == 3
+    assert len(memo.cache) == 1
+
+def test_relatorio_precalculado(memo, cubo, monkeypatch):
+    pronto = FiguraSerializada(nome='pedidos_por_dia', spec='{}', altura=None, cpu_s=0.0)
+    lidos = []
+
+    def ler_precalculado(versao, chave, nome):
+        lidos.append((versao, chave, nome))
+        return pronto if nome == 'pedidos_por_dia' else None
+
+    monkeypatch.setattr(src.relatorios, 'ler_precalculado', ler_precalculado)
+    filtrado = memo(filtros, cubo, *FILTROS)
+
+    assert memo.figura(pedidos_por_dia, filtrado) is pronto
+    assert lidos == [('v1', chave_filtros(*FILTROS), 'pedidos_por_dia')]
+
+    # Sem relatório gravado, o gráfico é calculado
+    assert memo.figura(pedidos_por_trafego, filtrado).spec != '{}'
+
+    # O cubo sem os filtros da memoização não corresponde ao relatório
+    assert memo.figura(pedidos_por_dia, cubo) is not pronto
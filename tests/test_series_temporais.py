@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import analysis_tools as at
+from src.cube import construir_cubo
+from src.series_temporais import PONTOS_MAXIMOS, escolher_resolucao, lttb
+
+def test_escolher_resolucao():
+    assert escolher_resolucao('2022-02-11', '2022-04-06') == 'D'
+    assert escolher_resolucao('2019-01-01', '2022-12-31') == 'W'
+    assert escolher_resolucao('2022-02-11', '2022-04-06', minima='W') == 'W'
+    assert escolher_resolucao('2000-01-01', '2022-12-31', minima='W') == 'M'
+
+def test_lttb_mantem_extremos_e_picos():
+    x = np.arange(5000)
+    y = np.sin(x / 50.0)
+    y[1234] = 10
+
+    pos = lttb(x, y, 100)
+
+    assert len(pos) == 100
+    assert pos[0] == 0 and pos[-1] == 4999
+    assert np.all(np.diff(pos) > 0)
+    assert 1234 in pos
+
+def test_lttb_serie_menor_que_o_limite():
+    assert np.array_equal(lttb(np.arange(10), np.arange(10), 400), np.arange(10))
+
+@pytest.mark.parametrize('func', [at.pedidos_por_dia, at.pedidos_por_semana, at.pedidos_por_ent_semana])
+@pytest.mark.parametrize('resolucao', [None, 'D', 'W'])
+def test_limite_de_pontos_em_varios_anos(pedidos_anos, func, resolucao):
+    for dados in (pedidos_anos, construir_cubo(pedidos_anos, esbocos=True)):
+        fig = func(dados, resolucao=resolucao)
+        assert len(fig.data[0].x) <= PONTOS_MAXIMOS
+
+@pytest.mark.parametrize('resolucao, pontos_maximos, esperada', [('D', 400, 'Semana'), ('W', 100, 'Mês')])
+def test_barras_somadas_em_periodos_maiores(pedidos_anos, resolucao, pontos_maximos, esperada):
+    # Sete anos na resolução fixada passam do limite: os pedidos são somados, nenhum período é descartado
+    fig = at.pedidos_por_dia(construir_cubo(pedidos_anos), resolucao=resolucao, pontos_maximos=pontos_maximos)
+
+    assert len(fig.data[0].x) <= pontos_maximos
+    assert sum(fig.data[0].y) == len(pedidos_anos)
+    assert fig.layout.xaxis.title.text == f'Order_Date ({esperada})'
+
+def test_semanas_nao_se_misturam_entre_anos(pedidos_anos):
+    fig = at.pedidos_por_semana(pedidos_anos)
+    semanas = pd.to_datetime(pd.Series(fig.data[0].x))
+
+    # Uma linha por semana de 2016 a 2022, não uma por número de semana ISO (até 53)
+    assert len(semanas) == len(pd.period_range('2016-01-01', '2022-12-31', freq='W'))
+    assert semanas.is_unique
+    assert sum(fig.data[0].y) == pedidos_anos['ID'].count()
+
+def test_pedidos_por_semana_igual_ao_groupby_original(pedidos):
+    fig = at.pedidos_por_semana(construir_cubo(pedidos))
+    original = pedidos.groupby('Week_of_Year')['ID'].count()
+
+    assert list(fig.data[0].y) == list(original)
+    assert list(pd.to_datetime(pd.Series(fig.data[0].x)).dt.isocalendar().week) == list(original.index)
+
+def test_pedidos_por_ent_semana_igual_ao_groupby_original(pedidos):
+    fig = at.pedidos_por_ent_semana(pedidos)
+    original = pedidos.groupby('Week_of_Year').agg(ID=('ID', 'count'), Ent=('Delivery_person_ID', 'nunique'))
+
+    assert np.allclose(fig.data[0].y, original['ID'] / original['Ent'])
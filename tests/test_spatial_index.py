@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.geo import agregar_grade, coordenadas_validas, haversine_vetorizado
+from src.spatial_index import IndiceEspacial
+
+COLUNAS = {
+    'entregas': ('Delivery_location_latitude', 'Delivery_location_longitude'),
+    'restaurantes': ('Restaurant_latitude', 'Restaurant_longitude')
+}
+
+@pytest.fixture(params=list(COLUNAS))
+def colunas(request):
+    return COLUNAS[request.param]
+
+def _validas(df, col_lat, col_lon):
+    return coordenadas_validas(df[col_lat], df[col_lon]).to_numpy()
+
+@pytest.mark.parametrize('retangulo', [
+    (12, 31, 72, 89),
+    (19.0, 19.3, 72.7, 73.0),
+    (-31, -20, 70, 80),
+    (40, 50, 0, 10)
+])
+def test_bbox_igual_a_varredura(pedidos, colunas, retangulo):
+    col_lat, col_lon = colunas
+    lat_min, lat_max, lon_min, lon_max = retangulo
+    indice = IndiceEspacial(pedidos, col_lat, col_lon)
+
+    lat, lon = pedidos[col_lat], pedidos[col_lon]
+    mascara = _validas(pedidos, col_lat, col_lon) & lat.between(lat_min, lat_max) & lon.between(lon_min, lon_max)
+
+    np.testing.assert_array_equal(indice.consulta_bbox(*retangulo), np.flatnonzero(mascara))
+
+@pytest.mark.parametrize('raio_km', [0.5, 3, 25, 400])
+def test_raio_igual_a_haversine(pedidos, colunas, raio_km):
+    col_lat, col_lon = colunas
+    indice = IndiceEspacial(pedidos, col_lat, col_lon)
+    validas = _validas(pedidos, col_lat, col_lon)
+
+    # Centros em pontos do próprio dataset: o raio sempre encontra alguém
+    for posicao in np.flatnonzero(validas)[:5]:
+        lat, lon = pedidos[col_lat].iloc[posicao], pedidos[col_lon].iloc[posicao]
+        distancias = haversine_vetorizado(
+            np.full(len(pedidos), lat), np.full(len(pedidos), lon), pedidos[col_lat], pedidos[col_lon]
+        )
+        esperado = np.flatnonzero(validas & (distancias <= raio_km))
+
+        np.testing.assert_array_equal(indice.consulta_raio(lat, lon, raio_km), esperado)
+
+def test_estatisticas_iguais_a_grade(pedidos, colunas):
+    col_lat, col_lon = colunas
+    indice = IndiceEspacial(pedidos, col_lat, col_lon, 'Time_taken(min)')
+    validos = pedidos.loc[_validas(pedidos, col_lat, col_lon)]
+
+    ordem = ['Latitude', 'Longitude']
+    esperado = agregar_grade(validos, col_lat, col_lon, 'Time_taken(min)').sort_values(ordem, ignore_index=True)
+    obtido = indice.estatisticas_celulas().sort_values(ordem, ignore_index=True)
+
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
+    assert indice.contagem.sum() == len(validos)
+
+def test_zonas_mais_lentas(pedidos):
+    col_lat, col_lon = COLUNAS['entregas']
+    indice = IndiceEspacial(pedidos, col_lat, col_lon, 'Time_taken(min)', resolucao=0.1)
+    validos = pedidos.loc[_validas(pedidos, col_lat, col_lon)]
+
+    grade = agregar_grade(validos, col_lat, col_lon, 'Time_taken(min)', resolucao=0.1)
+    esperado = grade.loc[grade['Pedidos'] >= 5].nlargest(5, 'Media')
+
+    obtido = indice.zonas_mais_lentas(n=5, min_pedidos=5)
+
+    np.testing.assert_allclose(obtido['Media'], esperado['Media'])
+    assert (obtido['Pedidos'] >= 5).all()
+
+def test_sem_medida_e_sem_pontos(pedidos):
+    col_lat, col_lon = COLUNAS['entregas']
+
+    assert IndiceEspacial(pedidos, col_lat, col_lon).estatisticas_celulas()['Media'].isna().all()
+
+    vazio = IndiceEspacial(pedidos.iloc[:0], col_lat, col_lon, 'Time_taken(min)')
+    assert vazio.n_celulas == 0
+    assert len(vazio.consulta_raio(22.7, 75.9, 10)) == 0
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from src.analysis_tools import filtros, top_entregadores_extremos, top_n_por_grupo
+
+def _original(df, ascending_order):
+    # Implementação anterior: uma ordenação e um recorte por cidade
+    df_result = (
+        df.loc[:, ['Delivery_person_ID', 'City', 'Time_taken(min)']]
+        .groupby(['City', 'Delivery_person_ID'], observed=True)
+        .mean()
+        .reset_index()
+        .sort_values(by=['City', 'Time_taken(min)'], ascending=[True, ascending_order])
+    )
+
+    df_metro = df_result.loc[df_result['City'] == 'Metropolitian', :].head(10)
+    df_urban = df_result.loc[df_result['City'] == 'Urban', :].head(10)
+    df_semi = df_result.loc[df_result['City'] == 'Semi-Urban', :].head(10)
+
+    return pd.concat([df_metro, df_urban, df_semi]).reset_index(drop=True)
+
+def _comparar(obtido, esperado):
+    pd.testing.assert_frame_equal(
+        obtido.astype({'City': str}), esperado.astype({'City': str}).loc[:, obtido.columns], check_dtype=False
+    )
+
+@pytest.mark.parametrize('selecao', [
+    None,
+    ((pd.Timestamp('2022-02-11'), pd.Timestamp('2022-04-06')), ['Low', 'Jam'], ['Cloudy', 'Fog', 'Stormy'], ['Urban'])
+])
+def test_igual_a_implementacao_original(pedidos, selecao):
+    df = pedidos if selecao is None else filtros(pedidos, *selecao)
+
+    rapidos, lentos = top_entregadores_extremos(df)
+
+    _comparar(rapidos, _original(df, True))
+    _comparar(lentos, _original(df, False))
+
+def test_empates_e_ordem_dos_grupos():
+    df = pd.DataFrame({
+        'City': ['Semi-Urban', 'Urban', 'Urban', 'Urban', 'Metropolitian', 'Semi-Urban'],
+        'Delivery_person_ID': ['S1', 'U1', 'U2', 'U3', 'M1', 'S2'],
+        'Time_taken(min)': [30, 20, 20, 10, 15, 30]
+    })
+
+    rapidos, lentos = top_entregadores_extremos(df, n=2)
+
+    assert list(rapidos['City']) == ['Metropolitian', 'Urban', 'Urban', 'Semi-Urban', 'Semi-Urban']
+    assert list(rapidos['Delivery_person_ID']) == ['M1', 'U3', 'U1', 'S1', 'S2']
+    # Empatados mantêm a ordem das chaves também no extremo mais lento
+    assert list(lentos['Delivery_person_ID']) == ['M1', 'U1', 'U2', 'S1', 'S2']
+
+    # No corte, o empate também é decidido pela ordem das chaves
+    assert list(top_entregadores_extremos(df, n=1)[1]['Delivery_person_ID']) == ['M1', 'U1', 'S1']
+
+    _comparar(rapidos, _original(df, True).groupby('City', sort=False).head(2).reset_index(drop=True))
+    _comparar(lentos, _original(df, False).groupby('City', sort=False).head(2).reset_index(drop=True))
+
+def test_quantidade_qualquer_de_grupos(pedidos):
+    menores, maiores = top_n_por_grupo(pedidos, 'Weatherconditions', 'Delivery_person_ID', 'Time_taken(min)', n=3)
+
+    medias = pedidos.groupby(['Weatherconditions', 'Delivery_person_ID'], observed=True)['Time_taken(min)'].mean()
+    for clima, grupo in medias.groupby(level=0, observed=True):
+        assert list(menores.loc[menores['Weatherconditions'] == clima, 'Time_taken(min)']) == list(grupo.nsmallest(3))
+        assert list(maiores.loc[maiores['Weatherconditions'] == clima, 'Time_taken(min)']) == list(grupo.nlargest(3))
+
+    assert list(menores['Weatherconditions'].unique()) == list(medias.index.unique(level=0))